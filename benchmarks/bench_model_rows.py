@@ -0,0 +1,112 @@
+"""Микробенчмарк представления строк моделей
+
+Сравнивает прежний путь чтения (строка-словарь RealDictCursor + объект с
+__dict__, заполняемый именованными аргументами) с текущим (строка-кортеж +
+объект со __slots__, заполняемый позиционно) на синтетическом результате
+запроса к bookings.flights. База данных не нужна.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_model_rows --rows 1000000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from src.Models.FlightsModel import Flight
+
+
+class DictFlight:
+    """Рейс в прежнем виде: поля в словаре экземпляра"""
+
+    def __init__(self, flight_id, flight_no, scheduled_departure, scheduled_arrival,
+                 departure_airport, arrival_airport, status, aircraft_code,
+                 actual_departure=None, actual_arrival=None):
+        self.flight_id = flight_id
+        self.flight_no = flight_no
+        self.scheduled_departure = scheduled_departure
+        self.scheduled_arrival = scheduled_arrival
+        self.departure_airport = departure_airport
+        self.arrival_airport = arrival_airport
+        self.status = status
+        self.aircraft_code = aircraft_code
+        self.actual_departure = actual_departure
+        self.actual_arrival = actual_arrival
+
+
+def make_tuple_rows(count):
+    """Строки так, как их возвращает обычный курсор psycopg2"""
+    base = datetime(2017, 8, 15, 10, 0)
+    rows = []
+    for i in range(count):
+        departure = base + timedelta(minutes=i)
+        rows.append((i, 'PG0001', departure, departure + timedelta(hours=2), 'SVO', 'LED',
+                     'Scheduled', '321', None, None))
+    return rows
+
+
+def make_dict_rows(count):
+    """Строки так, как их возвращает RealDictCursor (словарь на строку)"""
+    return [dict(zip(Flight.COLUMNS, row)) for row in make_tuple_rows(count)]
+
+
+def build_dict_objects(rows):
+    flights = []
+    for row in rows:
+        flight = DictFlight(
+            flight_id=row['flight_id'],
+            flight_no=row['flight_no'],
+            scheduled_departure=row['scheduled_departure'],
+            scheduled_arrival=row['scheduled_arrival'],
+            departure_airport=row['departure_airport'],
+            arrival_airport=row['arrival_airport'],
+            status=row['status'],
+            aircraft_code=row['aircraft_code'],
+            actual_departure=row['actual_departure'],
+            actual_arrival=row['actual_arrival']
+        )
+        flights.append(flight)
+    return flights
+
+
+def build_slot_objects(rows):
+    return Flight.MAPPER.map_rows(rows)
+
+
+def measure(name, make_rows, build, count):
+    """Время построения объектов и пик памяти (строки результата + объекты)"""
+    gc.collect()
+    tracemalloc.start()
+    rows = make_rows(count)
+    rows_memory, _ = tracemalloc.get_traced_memory()
+
+    started = time.perf_counter()
+    objects = build(rows)
+    elapsed = time.perf_counter() - started
+
+    _, peak = tracemalloc.get_traced_memory()
+    del rows
+    gc.collect()
+    objects_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<28} построение: {elapsed:7.3f} с   строки: {rows_memory / 2 ** 20:8.1f} МБ   "
+          f"объекты: {objects_memory / 2 ** 20:8.1f} МБ   пик: {peak / 2 ** 20:8.1f} МБ")
+    del objects
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение представлений строк моделей")
+    parser.add_argument('--rows', type=int, default=1000000, help="Количество строк (по умолчанию 1 000 000)")
+    args = parser.parse_args()
+
+    print(f"Строк: {args.rows}")
+    dict_time, dict_peak = measure("dict + __dict__", make_dict_rows, build_dict_objects, args.rows)
+    slot_time, slot_peak = measure("tuple + __slots__", make_tuple_rows, build_slot_objects, args.rows)
+    print(f"Ускорение построения: x{dict_time / slot_time:.2f}, снижение пика памяти: x{dict_peak / slot_peak:.2f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
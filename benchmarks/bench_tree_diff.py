@@ -0,0 +1,145 @@
+"""Микробенчмарк обновления строк Treeview
+
+Сравнивает прежнее обновление страницы (удаление всех строк и вставка каждой
+заново) с применением разницы через KeyedRows при разном числе измененных
+строк. Считаются вызовы виджета (каждый - обращение к Tcl) и время.
+
+С дисплеем используется настоящий ttk.Treeview, без дисплея - модель таблицы
+в памяти с тем же набором операций (тогда показательно только число вызовов).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_tree_diff --page-size 200 --repeat 50
+"""
+import argparse
+import time
+
+from src.View.tree_diff import KeyedRows
+
+
+class MemoryTree:
+    """Модель Treeview в памяти: операции, которые использует KeyedRows"""
+
+    def __init__(self):
+        self.order = []
+        self.items = {}
+        self.counter = 0
+
+    def insert(self, parent, index, iid=None, values=()):
+        if iid is None:
+            self.counter += 1
+            iid = f"I{self.counter:03X}"
+        self.items[iid] = values
+        if index == 'end':
+            self.order.append(iid)
+        else:
+            self.order.insert(index, iid)
+        return iid
+
+    def item(self, iid, values=None):
+        self.items[iid] = values
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+            self.order.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def get_children(self, item=''):
+        return tuple(self.order)
+
+
+class CountingTree:
+    """Обертка таблицы, считающая вызовы виджета"""
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.calls = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.tree, name)
+
+        def call(*args, **kwargs):
+            # delete(*items) - один вызов Tcl независимо от числа строк
+            self.calls += 1
+            return method(*args, **kwargs)
+
+        return call
+
+
+def make_tree():
+    """Настоящий Treeview, если есть дисплей, иначе модель в памяти"""
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        root.withdraw()
+        tree = ttk.Treeview(root, columns=('a', 'b', 'c', 'd'), show='headings')
+        return tree, "ttk.Treeview"
+    except Exception:
+        return MemoryTree(), "модель в памяти (нет дисплея)"
+
+
+def make_page(page_size, changed, version):
+    """Строки страницы; первые changed строк отличаются между версиями"""
+    rows = []
+    for i in range(page_size):
+        status = f"v{version}" if i < changed else "Scheduled"
+        rows.append((str(i), (i, f"PG{i:04d}", "2017-08-15 10:00", status)))
+    return rows
+
+
+def rebuild(tree, rows):
+    """Прежний способ: удалить все строки и вставить каждую заново"""
+    for item in tree.get_children():
+        tree.delete(item)
+    for _, values in rows:
+        tree.insert('', 'end', values=values)
+
+
+def measure(page_size, changed, repeat):
+    base_tree, _ = make_tree()
+
+    counting = CountingTree(base_tree)
+    pages = [make_page(page_size, changed, version) for version in range(repeat + 1)]
+    rebuild(counting, pages[0])
+    counting.calls = 0
+    started = time.perf_counter()
+    for page in pages[1:]:
+        rebuild(counting, page)
+    rebuild_time = (time.perf_counter() - started) / repeat
+    rebuild_calls = counting.calls / repeat
+
+    diff_tree, _ = make_tree()
+    counting = CountingTree(diff_tree)
+    rows = KeyedRows(counting)
+    rows.apply(pages[0])
+    counting.calls = 0
+    started = time.perf_counter()
+    for page in pages[1:]:
+        rows.apply(page)
+    diff_time = (time.perf_counter() - started) / repeat
+    diff_calls = counting.calls / repeat
+
+    return rebuild_calls, rebuild_time, diff_calls, diff_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение обновления строк Treeview")
+    parser.add_argument('--page-size', type=int, default=200, help="Строк на странице (по умолчанию 200)")
+    parser.add_argument('--repeat', type=int, default=50, help="Количество обновлений (по умолчанию 50)")
+    args = parser.parse_args()
+
+    _, tree_kind = make_tree()
+    print(f"Таблица: {tree_kind}, строк на странице: {args.page_size}")
+    print(f"{'изменено':>9} | {'пересоздание: вызовы':>21} {'мс':>8} | {'разница: вызовы':>16} {'мс':>8}")
+    for changed in sorted({0, 1, 10, args.page_size // 4, args.page_size}):
+        rebuild_calls, rebuild_time, diff_calls, diff_time = measure(args.page_size, changed, args.repeat)
+        print(f"{changed:>9} | {rebuild_calls:>21.0f} {rebuild_time * 1000:>8.2f} | "
+              f"{diff_calls:>16.0f} {diff_time * 1000:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""Нагрузочная проверка выдачи номеров посадки
+
+Несколько потоков одновременно регистрируют пассажиров одного рейса: получают
+номер посадки и вставляют посадочный талон. С распределителем
+(db.boarding_numbers) вставки не должны конфликтовать по номеру посадки;
+с --legacy номер вычисляется прежним способом (MAX(boarding_no) + 1), и
+параллельные стойки получают одинаковые номера.
+
+Нужна локальная база PostgreSQL с демонстрационной схемой bookings. Берутся
+билеты рейса без посадочных талонов и свободные места; созданные талоны
+удаляются после проверки (кроме запуска с --keep).
+
+Запуск из корня репозитория:
+    python -m benchmarks.stress_boarding_numbers --threads 16 --checkins 200 --block-size 10
+"""
+import argparse
+import threading
+import time
+
+from psycopg2 import errors
+
+from src.Models.database import PostgreSQLDatabase
+from src.Models.schema import SchemaManager
+
+
+def pick_flight(db, flight_id, checkins):
+    """Рейс с билетами без посадочных талонов: (ID рейса, [(билет, место), ...])"""
+    cursor = db.get_cursor()
+    if flight_id is None:
+        cursor.execute("""
+            SELECT tf.flight_id
+            FROM bookings.ticket_flights tf
+            LEFT JOIN bookings.boarding_passes bp
+                   ON bp.ticket_no = tf.ticket_no AND bp.flight_id = tf.flight_id
+            WHERE bp.ticket_no IS NULL
+            GROUP BY tf.flight_id
+            ORDER BY count(*) DESC
+            LIMIT 1
+        """)
+        row = cursor.fetchone()
+        if row is None:
+            return None, []
+        flight_id = row['flight_id']
+
+    cursor.execute("""
+        SELECT tf.ticket_no
+        FROM bookings.ticket_flights tf
+        LEFT JOIN bookings.boarding_passes bp
+               ON bp.ticket_no = tf.ticket_no AND bp.flight_id = tf.flight_id
+        WHERE tf.flight_id = %s AND bp.ticket_no IS NULL
+        ORDER BY tf.ticket_no
+        LIMIT %s
+    """, (flight_id, checkins))
+    tickets = [row['ticket_no'] for row in cursor.fetchall()]
+    cursor.close()
+
+    # Каждому билету заранее назначается свое место: проверяются только номера посадки
+    seats = db.seat_maps.free_seats(flight_id)
+    return flight_id, list(zip(tickets, seats))
+
+
+def legacy_next_boarding_no(db, flight_id):
+    """Прежний способ: номер по MAX(boarding_no) рейса"""
+    cursor = db.get_cursor()
+    cursor.execute("""
+        SELECT COALESCE(MAX(boarding_no), 0) + 1 AS next_boarding_no
+        FROM bookings.boarding_passes
+        WHERE flight_id = %s
+    """, (flight_id,))
+    boarding_no = cursor.fetchone()['next_boarding_no']
+    cursor.close()
+    return boarding_no
+
+
+def run(db, flight_id, assignments, threads, legacy):
+    """Параллельная регистрация; возвращает (время, вставлено, конфликтов номера, прочих ошибок)"""
+    queue = list(assignments)
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+    counts = {'inserted': 0, 'conflicts': 0, 'errors': 0}
+
+    def worker():
+        barrier.wait()
+        while True:
+            with lock:
+                if not queue:
+                    return
+                ticket_no, seat_no = queue.pop()
+            try:
+                if legacy:
+                    boarding_no = legacy_next_boarding_no(db, flight_id)
+                else:
+                    boarding_no = db.boarding_numbers.allocate(flight_id)
+                cursor = db.get_cursor()
+                try:
+                    cursor.execute("""
+                        INSERT INTO bookings.boarding_passes (ticket_no, flight_id, boarding_no, seat_no)
+                        VALUES (%s, %s, %s, %s)
+                    """, (ticket_no, flight_id, boarding_no, seat_no))
+                finally:
+                    cursor.close()
+                key = 'inserted'
+            except errors.UniqueViolation:
+                key = 'conflicts'
+            except Exception as e:
+                print(f"Ошибка регистрации билета {ticket_no}: {e}")
+                key = 'errors'
+            with lock:
+                counts[key] += 1
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, counts['inserted'], counts['conflicts'], counts['errors']
+
+
+def cleanup(db, flight_id, assignments):
+    cursor = db.get_cursor()
+    cursor.execute("""
+        DELETE FROM bookings.boarding_passes
+        WHERE flight_id = %s AND ticket_no = ANY(%s)
+    """, (flight_id, [ticket_no for ticket_no, _ in assignments]))
+    deleted = cursor.rowcount
+    cursor.close()
+    db.seat_maps.invalidate_flights((flight_id,))
+    return deleted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Параллельная выдача номеров посадки")
+    parser.add_argument('--database', default='demo')
+    parser.add_argument('--user', default='postgres')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', default='5432')
+    parser.add_argument('--threads', type=int, default=16, help="Параллельных стоек (по умолчанию 16)")
+    parser.add_argument('--checkins', type=int, default=200, help="Регистраций (по умолчанию 200)")
+    parser.add_argument('--flight-id', type=int, default=None, help="Рейс (по умолчанию - с наибольшим числом билетов без талонов)")
+    parser.add_argument('--block-size', type=int, default=1, help="Номеров, резервируемых за одно обращение")
+    parser.add_argument('--legacy', action='store_true', help="Номера по MAX(boarding_no) + 1, как раньше")
+    parser.add_argument('--keep', action='store_true', help="Не удалять созданные посадочные талоны")
+    args = parser.parse_args()
+
+    db = PostgreSQLDatabase(args.database, args.user, args.password, args.host, args.port,
+                            pool_min_size=1, pool_max_size=args.threads + 1)
+    if not db.connect():
+        return
+    try:
+        if not SchemaManager(db).ensure():
+            print("Схема базы данных не обновлена")
+            return
+        db.boarding_numbers.block_size = args.block_size
+
+        flight_id, assignments = pick_flight(db, args.flight_id, args.checkins)
+        if not assignments:
+            print("Нет билетов без посадочных талонов или свободных мест")
+            return
+        mode = "MAX(boarding_no) + 1" if args.legacy else f"счетчик рейса, блок {args.block_size}"
+        print(f"Рейс {flight_id}: регистраций {len(assignments)}, потоков {args.threads}, номера: {mode}")
+
+        elapsed, inserted, conflicts, failed = run(db, flight_id, assignments, args.threads, args.legacy)
+        print(f"Время: {elapsed:.2f} с, регистраций в секунду: {inserted / elapsed:.0f}")
+        print(f"Вставлено: {inserted}, конфликтов номера или места: {conflicts}, прочих ошибок: {failed}")
+        print(f"Статистика пула: {db.get_pool_stats()}")
+
+        if not args.keep:
+            print(f"Удалено созданных талонов: {cleanup(db, flight_id, assignments)}")
+    finally:
+        db.disconnect()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
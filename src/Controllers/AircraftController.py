@@ -6,8 +6,6 @@ from src.Models.AircraftModel import Aircraft
 class AircraftController:
     def __init__(self, db):
         self.db = db
-        # Создание таблицы при инициализации
-        Aircraft.create_table(self.db)
 
     def get_all_aircrafts(self):
         """Получение всех самолетов"""
@@ -31,4 +29,10 @@ class AircraftController:
 
     def get_all_aircrafts_paginated(self, offset, limit):
         """Получение самолетов с пагинацией"""
-        return Aircraft.read_all_paginated(self.db, offset, limit)
\ No newline at end of file
+        return Aircraft.read_all_paginated(self.db, offset, limit)
+
+    def get_aircrafts_page(self, limit, token=None, backward=False, summary=False):
+        """Получение страницы самолетов с пагинацией по ключу"""
+        # summary - только колонки, которые показывает список (усеченный JSON)
+        columns = Aircraft.SUMMARY_COLUMNS if summary else None
+        return Aircraft.read_page(self.db, limit, token, backward, columns)
\ No newline at end of file
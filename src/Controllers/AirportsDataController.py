@@ -5,8 +5,6 @@ from src.Models.AirportsDataModel import Airport
 class AirportController:
     def __init__(self, db):
         self.db = db
-        # Создание таблицы при инициализации
-        Airport.create_table(self.db)
 
     def get_all_airports(self):
         """Получение всех аэропортов"""
@@ -34,4 +32,10 @@ class AirportController:
 
     def get_all_airports_paginated(self, offset, limit):
         """Получение аэропортов с пагинацией"""
-        return Airport.read_all_paginated(self.db, offset, limit)
\ No newline at end of file
+        return Airport.read_all_paginated(self.db, offset, limit)
+
+    def get_airports_page(self, limit, token=None, backward=False, summary=False):
+        """Получение страницы аэропортов с пагинацией по ключу"""
+        # summary - только колонки, которые показывает список (усеченный JSON)
+        columns = Airport.SUMMARY_COLUMNS if summary else None
+        return Airport.read_page(self.db, limit, token, backward, columns)
\ No newline at end of file
@@ -1,10 +1,11 @@
 from src.Models.BoardingPassesModel import BoardingPass
+from src.Models.TicketFlightsModel import TicketFlight
+from src.Models.bulk import DEFAULT_CHUNK_SIZE
+
 
 class BoardingPassController:
     def __init__(self, db):
         self.db = db
-        # Создание таблицы при инициализации
-        BoardingPass.create_table(self.db)
 
     # ... существующие методы ...
 
@@ -21,6 +22,14 @@ class BoardingPassController:
         """Создание нового посадочного талона"""
         return BoardingPass.create(self.db, ticket_no, flight_id, boarding_no, seat_no)
 
+    def create_boarding_passes(self, records, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Пакетное создание посадочных талонов"""
+        return BoardingPass.create_many(self.db, records, chunk_size)
+
+    def check_in_flight(self, flight_id, ticket_nos=None):
+        """Регистрация пассажиров рейса одной транзакцией (ticket_nos=None - все без талона)"""
+        return BoardingPass.check_in_flight(self.db, flight_id, ticket_nos)
+
     def find_boarding_pass(self, ticket_no, flight_id):
         """Поиск посадочного талона по номеру билета и рейсу"""
         return BoardingPass.read_by_ticket_and_flight(self.db, ticket_no, flight_id)
@@ -45,10 +54,36 @@ class BoardingPassController:
         """Получение занятых мест для рейса"""
         return BoardingPass.get_available_seats(self.db, flight_id)
 
+    def get_seat_status(self, flight_id, seat_no):
+        """Состояние места рейса по карте мест (SEAT_FREE, SEAT_OCCUPIED, SEAT_UNKNOWN или None)"""
+        return BoardingPass.get_seat_status(self.db, flight_id, seat_no)
+
+    def get_free_seats(self, flight_id, fare_conditions=None):
+        """Свободные места рейса (всего или в классе обслуживания)"""
+        return BoardingPass.get_free_seats(self.db, flight_id, fare_conditions)
+
+    def find_free_seat(self, ticket_no, flight_id):
+        """Первое свободное место рейса в классе обслуживания билета"""
+        ticket_flight = TicketFlight.read_by_ticket_and_flight(self.db, ticket_no, flight_id)
+        fare_conditions = ticket_flight.fare_conditions if ticket_flight else None
+        return BoardingPass.find_free_seat(self.db, flight_id, fare_conditions)
+
     def get_next_boarding_no(self, flight_id):
         """Получение следующего номера посадки для рейса"""
         return BoardingPass.get_next_boarding_no(self.db, flight_id)
 
     def get_all_boarding_passes_paginated(self, offset, limit):
         """Получение посадочных талонов с пагинацией"""
-        return BoardingPass.read_all_paginated(self.db, offset, limit)
\ No newline at end of file
+        return BoardingPass.read_all_paginated(self.db, offset, limit)
+
+    def get_boarding_passes_page(self, limit, token=None, backward=False):
+        """Получение страницы посадочных талонов с пагинацией по ключу"""
+        return BoardingPass.read_page(self.db, limit, token, backward)
+
+    def get_boarding_passes_chunk(self, limit, token=None, offset=0, flight_id=None, keys_only=False):
+        """Получение порции посадочных талонов для виртуального списка
+
+        keys_only - только колонки ключа: сдвиг может читаться одним индексом, без строк таблицы.
+        """
+        columns = BoardingPass.PAGE_KEY if keys_only else None
+        return BoardingPass.read_chunk(self.db, limit, token, offset, flight_id, columns)
\ No newline at end of file
@@ -1,11 +1,10 @@
 from datetime import datetime
 from src.Models.BookingModel import Booking
 
+
 class BookingController:
     def __init__(self, db):
         self.db = db
-        # Создание таблицы при инициализации
-        Booking.create_table(self.db)
 
     def get_all_bookings(self):
         """Получение всех бронирований"""
@@ -30,4 +29,8 @@ class BookingController:
 
     def get_all_bookings_paginated(self, offset, limit):
         """Получение бронирований с пагинацией"""
-        return Booking.read_all_paginated(self.db, offset, limit)
\ No newline at end of file
+        return Booking.read_all_paginated(self.db, offset, limit)
+
+    def get_bookings_page(self, limit, token=None, backward=False):
+        """Получение страницы бронирований с пагинацией по ключу"""
+        return Booking.read_page(self.db, limit, token, backward)
\ No newline at end of file
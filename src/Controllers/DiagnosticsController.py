@@ -0,0 +1,49 @@
+# DiagnosticsController.py
+class DiagnosticsController:
+    def __init__(self, db):
+        self.db = db
+
+    @property
+    def stats(self):
+        return self.db.query_stats
+
+    def get_method_stats(self):
+        """Статистика запросов по методам моделей"""
+        return self.stats.methods()
+
+    def get_slow_queries(self):
+        """Журнал медленных запросов"""
+        return self.stats.slow_queries()
+
+    def get_pool_stats(self):
+        """Статистика пула соединений (None - пул не используется)"""
+        return self.db.get_pool_stats()
+
+    def get_prepared_stats(self):
+        """Статистика подготовленных запросов"""
+        return self.db.prepared_statements.stats()
+
+    def get_slow_threshold(self):
+        return self.stats.slow_threshold_ms
+
+    def set_slow_threshold(self, threshold_ms):
+        """Порог медленного запроса, мс"""
+        try:
+            threshold_ms = float(threshold_ms)
+        except (TypeError, ValueError):
+            return False
+        if threshold_ms < 0:
+            return False
+        self.stats.slow_threshold_ms = threshold_ms
+        return True
+
+    def is_enabled(self):
+        return self.stats.enabled
+
+    def set_enabled(self, enabled):
+        """Включение сбора статистики (действует для новых курсоров)"""
+        self.stats.enabled = bool(enabled)
+
+    def reset(self):
+        """Сброс накопленной статистики и журнала"""
+        self.stats.reset()
\ No newline at end of file
@@ -0,0 +1,22 @@
+# ExportController.py
+from src.Models.export import EXPORT_SPECS, FORMATS, export_table
+
+
+class ExportController:
+    def __init__(self, db):
+        self.db = db
+
+    def get_formats(self):
+        """Доступные форматы экспорта"""
+        return FORMATS
+
+    def get_filters(self, table):
+        """Фильтры, доступные для экспорта таблицы: список (имя, подпись)"""
+        spec = EXPORT_SPECS.get(table)
+        if spec is None:
+            return []
+        return [(name, export_filter.label) for name, export_filter in spec.filters.items()]
+
+    def export(self, table, path, fmt, filters=None, progress=None, cancel_event=None):
+        """Потоковый экспорт таблицы в файл"""
+        return export_table(self.db, table, path, fmt, filters, progress, cancel_event)
\ No newline at end of file
@@ -1,12 +1,15 @@
 # FlightsController.py
 from src.Models.FlightsModel import Flight
+from src.Models.load_factor import LoadFactorEngine
+from src.Models.notifications import FLIGHT_CHANNEL
 
 
 class FlightController:
-    def __init__(self, db):
+    def __init__(self, db, listener=None):
         self.db = db
-        # Создание таблицы при инициализации
-        Flight.create_table(self.db)
+        self.listener = listener  # NotificationListener или None, если уведомления не принимаются
+        # Количество мест самолетов кэшируется между запросами загрузки
+        self.load_factors = LoadFactorEngine(db)
 
     def get_all_flights(self):
         """Получение всех рейсов"""
@@ -26,6 +29,31 @@ class FlightController:
         """Поиск рейса по ID"""
         return Flight.read_by_id(self.db, flight_id)
 
+    def find_flights(self, flight_ids):
+        """Поиск рейсов по списку ID"""
+        return Flight.read_by_ids(self.db, flight_ids)
+
+    def subscribe_changes(self, callback):
+        """Подписка на изменения статуса и фактического времени рейсов
+
+        callback(change) вызывается в потоке слушателя; change=None - уведомления
+        могли быть потеряны и данные нужно перечитать. Возвращает False, если
+        уведомления не принимаются.
+        """
+        if self.listener is None:
+            return False
+
+        def on_notification(payload):
+            if payload is None:
+                callback(None)
+                return
+            change = Flight.parse_change(payload)
+            if change:
+                callback(change)
+
+        self.listener.subscribe(FLIGHT_CHANNEL, on_notification)
+        return True
+
     def update_flight(self, flight_id, flight_no=None, scheduled_departure=None, scheduled_arrival=None,
                       departure_airport=None, arrival_airport=None, status=None, aircraft_code=None,
                       actual_departure=None, actual_arrival=None):
@@ -61,6 +89,20 @@ class FlightController:
         """Получение рейсов с пагинацией"""
         return Flight.read_all_paginated(self.db, offset, limit)
 
+    def get_flights_page(self, limit, token=None, backward=False, with_load=False):
+        """Получение страницы рейсов с пагинацией по ключу
+
+        with_load=True - page.loads содержит загрузку рейсов страницы (один запрос на страницу).
+        """
+        page = Flight.read_page(self.db, limit, token, backward)
+        if with_load:
+            page.loads = self.load_factors.get_loads(flight.flight_id for flight in page.items)
+        return page
+
+    def get_flight_loads(self, flight_ids):
+        """Загрузка рейсов: словарь ID рейса -> FlightLoad"""
+        return self.load_factors.get_loads(flight_ids)
+
     def get_available_statuses(self):
         """Получение списка доступных статусов"""
         return Flight.get_available_statuses()
\ No newline at end of file
@@ -1,10 +1,9 @@
 from src.Models.SeatsModel import Seat
 
+
 class SeatController:
     def __init__(self, db):
         self.db = db
-        # Создание таблицы при инициализации
-        Seat.create_table(self.db)
 
     def get_all_seats(self):
         """Получение всех мест"""
@@ -32,4 +31,8 @@ class SeatController:
 
     def get_all_seats_paginated(self, offset, limit):
         """Получение мест с пагинацией"""
-        return Seat.read_all_paginated(self.db, offset, limit)
\ No newline at end of file
+        return Seat.read_all_paginated(self.db, offset, limit)
+
+    def get_seats_page(self, limit, token=None, backward=False):
+        """Получение страницы мест с пагинацией по ключу"""
+        return Seat.read_page(self.db, limit, token, backward)
\ No newline at end of file
@@ -1,12 +1,11 @@
 # TicketFlightsController.py
 from src.Models.TicketFlightsModel import TicketFlight
+from src.Models.bulk import DEFAULT_CHUNK_SIZE
 
 
 class TicketFlightsController:
     def __init__(self, db):
         self.db = db
-        # Создание таблицы при инициализации
-        TicketFlight.create_table(self.db)
 
     def get_all_ticket_flights(self):
         """Получение всех билетов на рейсы"""
@@ -16,6 +15,10 @@ class TicketFlightsController:
         """Создание нового билета на рейс"""
         return TicketFlight.create(self.db, ticket_no, flight_id, fare_conditions, amount)
 
+    def create_ticket_flights(self, records, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Пакетное создание билетов на рейсы"""
+        return TicketFlight.create_many(self.db, records, chunk_size)
+
     def find_ticket_flight(self, ticket_no, flight_id):
         """Поиск билета на рейс по номеру билета и рейсу"""
         return TicketFlight.read_by_ticket_and_flight(self.db, ticket_no, flight_id)
@@ -38,4 +41,8 @@ class TicketFlightsController:
 
     def get_all_ticket_flights_paginated(self, offset, limit):
         """Получение билетов на рейсы с пагинацией"""
-        return TicketFlight.read_all_paginated(self.db, offset, limit)
\ No newline at end of file
+        return TicketFlight.read_all_paginated(self.db, offset, limit)
+
+    def get_ticket_flights_page(self, limit, token=None, backward=False):
+        """Получение страницы билетов на рейсы с пагинацией по ключу"""
+        return TicketFlight.read_page(self.db, limit, token, backward)
\ No newline at end of file
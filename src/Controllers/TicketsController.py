@@ -1,21 +1,35 @@
 # TicketsController.py
 from src.Models.TicketsModel import Ticket
+from src.Models.bulk import DEFAULT_CHUNK_SIZE
 
 
 class TicketsController:
     def __init__(self, db):
         self.db = db
-        # Создание таблицы при инициализации
-        Ticket.create_table(self.db)
 
     def get_all_tickets_paginated(self, offset, limit):
         """Получение всех билетов с пагинацией"""
         return Ticket.read_all_paginated(self.db, offset, limit)
 
+    def get_tickets_page(self, limit, token=None, backward=False, summary=False):
+        """Получение страницы билетов с пагинацией по ключу"""
+        # summary - только колонки, которые показывает список (усеченный JSON)
+        columns = Ticket.SUMMARY_COLUMNS if summary else None
+        return Ticket.read_page(self.db, limit, token, backward, columns)
+
+    def search_tickets_page(self, passenger_name, limit, token=None, backward=False, summary=False):
+        """Поиск билетов по имени пассажира: страница результатов по убыванию сходства"""
+        columns = Ticket.SUMMARY_COLUMNS if summary else None
+        return Ticket.search_page_by_passenger_name(self.db, passenger_name, limit, token, backward, columns)
+
     def create_ticket(self, ticket_no, book_ref, passenger_id, passenger_name, contact_data=None):
         """Создание нового билета"""
         return Ticket.create(self.db, ticket_no, book_ref, passenger_id, passenger_name, contact_data)
 
+    def create_tickets(self, records, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Пакетное создание билетов"""
+        return Ticket.create_many(self.db, records, chunk_size)
+
     def find_ticket(self, ticket_no):
         """Поиск билета по номеру"""
         return Ticket.read_by_ticket_no(self.db, ticket_no)
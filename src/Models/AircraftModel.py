@@ -1,14 +1,51 @@
-import json
+from src.Models.pagination import KeysetPage, fetch_keyset_rows, build_keyset_page
+from src.Models.mapper import Column, RowMapper
+from src.Models.reference_cache import register_reference
+from src.Models.json_fields import to_json, json_column, display_column, display_value
 
 
 class Aircraft:
+    TABLE = 'bookings.aircrafts_data'
+
+    # Уникальный ключ сортировки для пагинации по ключу
+    PAGE_KEY = ('aircraft_code',)
+
+    # Поля хранятся в слотах без словаря экземпляра
+    __slots__ = ('aircraft_code', 'model', 'range')
+
+    # Колонки выборки в порядке аргументов конструктора (см. MAPPER в конце модуля)
+    COLUMNS = (
+        'aircraft_code',
+        json_column('model'),
+        'range',
+    )
+
+    # Колонки списка в представлении: модель извлекается на сервере на языке отображения
+    SUMMARY_COLUMNS = (
+        'aircraft_code',
+        display_column('model'),
+        'range',
+    )
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.aircrafts_data
+    (
+        aircraft_code character(3) COLLATE pg_catalog."default" NOT NULL,
+        model jsonb NOT NULL,
+        range integer NOT NULL,
+        CONSTRAINT aircrafts_pkey PRIMARY KEY (aircraft_code),
+        CONSTRAINT aircrafts_range_check CHECK (range > 0)
+    );
+    """
+
     def __init__(self, aircraft_code, model, range):
         self.aircraft_code = aircraft_code
         self.model = model  # JSONB данные
         self.range = range
 
     def __str__(self):
-        model_str = json.dumps(self.model, ensure_ascii=False)
+        model_str = to_json(self.model)
         return f"Aircraft {self.aircraft_code}: {model_str}, range: {self.range} km"
 
     @staticmethod
@@ -16,17 +53,7 @@ class Aircraft:
         """Создание таблицы aircrafts_data"""
         try:
             cursor = db.get_cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS bookings.aircrafts_data
-            (
-                aircraft_code character(3) COLLATE pg_catalog."default" NOT NULL,
-                model jsonb NOT NULL,
-                range integer NOT NULL,
-                CONSTRAINT aircrafts_pkey PRIMARY KEY (aircraft_code),
-                CONSTRAINT aircrafts_range_check CHECK (range > 0)
-            );
-            """
-            cursor.execute(create_table_query)
+            cursor.execute(Aircraft.CREATE_TABLE_QUERY)
             db.connection.commit()
             print("Таблица aircrafts_data создана или уже существует")
         except Exception as e:
@@ -41,8 +68,9 @@ class Aircraft:
             INSERT INTO bookings.aircrafts_data (aircraft_code, model, range)
             VALUES (%s, %s, %s)
             """
-            cursor.execute(insert_query, (aircraft_code, json.dumps(model), range))
+            cursor.execute(insert_query, (aircraft_code, to_json(model), range))
             db.connection.commit()
+            db.table_changed(Aircraft.TABLE)
             print(f"Самолет {aircraft_code} успешно создан")
             return True
         except Exception as e:
@@ -50,21 +78,22 @@ class Aircraft:
             return False
 
     @staticmethod
-    def read_all(db):
+    def read_all(db, columns=None):
         """Чтение всех записей самолетов"""
+        # Полная выборка отдается из кэша справочников (см. src/Models/reference_cache.py)
+        if columns is None:
+            cached = db.reference_cache.get_all(Aircraft.TABLE)
+            if cached is not None:
+                return cached
+
         try:
-            cursor = db.get_cursor()
-            cursor.execute("SELECT * FROM bookings.aircrafts_data ORDER BY aircraft_code")
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Aircraft.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"SELECT {mapper.select_list} FROM bookings.aircrafts_data ORDER BY aircraft_code")
             results = cursor.fetchall()
 
-            aircrafts = []
-            for row in results:
-                aircraft = Aircraft(
-                    aircraft_code=row['aircraft_code'],
-                    model=row['model'],
-                    range=row['range']
-                )
-                aircrafts.append(aircraft)
+            aircrafts = mapper.map_rows(results)
 
             return aircrafts
         except Exception as e:
@@ -74,17 +103,17 @@ class Aircraft:
     @staticmethod
     def read_by_code(db, aircraft_code):
         """Чтение самолета по коду"""
+        found, cached = db.reference_cache.get(Aircraft.TABLE, aircraft_code)
+        if found:
+            return cached
+
         try:
-            cursor = db.get_cursor()
-            cursor.execute("SELECT * FROM bookings.aircrafts_data WHERE aircraft_code = %s", (aircraft_code,))
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"SELECT {Aircraft.MAPPER.select_list} FROM bookings.aircrafts_data WHERE aircraft_code = %s", (aircraft_code,))
             result = cursor.fetchone()
 
             if result:
-                return Aircraft(
-                    aircraft_code=result['aircraft_code'],
-                    model=result['model'],
-                    range=result['range']
-                )
+                return Aircraft.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске самолета: {e}")
@@ -100,7 +129,7 @@ class Aircraft:
 
             if model is not None:
                 update_fields.append("model = %s")
-                params.append(json.dumps(model))
+                params.append(to_json(model))
 
             if range is not None:
                 update_fields.append("range = %s")
@@ -119,6 +148,7 @@ class Aircraft:
 
             cursor.execute(update_query, params)
             db.connection.commit()
+            db.table_changed(Aircraft.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Самолет {aircraft_code} успешно обновлен")
@@ -138,6 +168,7 @@ class Aircraft:
             delete_query = "DELETE FROM bookings.aircrafts_data WHERE aircraft_code = %s"
             cursor.execute(delete_query, (aircraft_code,))
             db.connection.commit()
+            db.table_changed(Aircraft.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Самолет {aircraft_code} успешно удален")
@@ -150,33 +181,85 @@ class Aircraft:
             return False
 
     @staticmethod
-    def read_all_paginated(db, offset, limit):
+    def _cacheable(columns):
+        """Можно ли отдать выборку из кэша справочников: все колонки или колонки списка"""
+        return columns is None or tuple(columns) == Aircraft.SUMMARY_COLUMNS
+
+    @staticmethod
+    def _summary(aircraft):
+        """Объект с колонками списка (SUMMARY_COLUMNS) по объекту кэша"""
+        return Aircraft(aircraft.aircraft_code, display_value(aircraft.model), aircraft.range)
+
+    @staticmethod
+    def read_all_paginated(db, offset, limit, columns=None):
         """Чтение записей самолетов с пагинацией"""
+        # Справочник целиком в памяти (см. src/Models/reference_cache.py): страница - срез кэша
+        if Aircraft._cacheable(columns):
+            cached = db.reference_cache.get_slice(Aircraft.TABLE, offset, limit)
+            if cached is not None:
+                items, total = cached
+                if columns is not None:
+                    items = [Aircraft._summary(aircraft) for aircraft in items]
+                return items, total
+
         try:
-            cursor = db.get_cursor()
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Aircraft.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
 
             # Получаем данные
-            cursor.execute("""
-                   SELECT * FROM bookings.aircrafts_data 
+            cursor.execute(f"""
+                   SELECT {mapper.select_list} FROM bookings.aircrafts_data 
                    ORDER BY aircraft_code 
                    LIMIT %s OFFSET %s
                """, (limit, offset))
             results = cursor.fetchall()
 
-            aircrafts = []
-            for row in results:
-                aircraft = Aircraft(
-                    aircraft_code=row['aircraft_code'],
-                    model=row['model'],
-                    range=row['range']
-                )
-                aircrafts.append(aircraft)
+            aircrafts = mapper.map_rows(results)
 
-            # Получаем общее количество
-            cursor.execute("SELECT COUNT(*) FROM bookings.aircrafts_data")
-            total = cursor.fetchone()['count']
+            # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+            total = db.row_counts.count(Aircraft.TABLE)
 
             return aircrafts, total
         except Exception as e:
             print(f"Ошибка при чтении самолетов: {e}")
-            return [], 0
\ No newline at end of file
+            return [], 0
+
+    @staticmethod
+    def read_page(db, limit, token=None, backward=False, columns=None):
+        """Чтение страницы самолетов с пагинацией по ключу (aircraft_code)"""
+        # Справочник целиком в памяти (см. src/Models/reference_cache.py): страница строится без запросов
+        if Aircraft._cacheable(columns):
+            page = db.reference_cache.get_page(Aircraft.TABLE, limit, token, backward)
+            if page is not None:
+                if columns is not None:
+                    page.items = [Aircraft._summary(aircraft) for aircraft in page.items]
+                return page
+
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = Aircraft.MAPPER.project(columns, Aircraft.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Получаем данные после (или до) ключа из токена
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"SELECT {mapper.select_list} FROM bookings.aircrafts_data",
+                    Aircraft.PAGE_KEY, limit, token, backward
+                )
+
+                aircrafts = mapper.map_rows(rows)
+
+                # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+                total = db.row_counts.count(Aircraft.TABLE)
+
+                return build_keyset_page(aircrafts, rows, Aircraft.PAGE_KEY, total, has_next, has_prev,
+                                         db.row_counts.is_estimate(Aircraft.TABLE), mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении страницы самолетов: {e}")
+            return KeysetPage([], 0)
+
+
+# Отображение строк запросов на объекты Aircraft, общее для всех методов чтения
+Aircraft.MAPPER = RowMapper(Aircraft, Aircraft.COLUMNS)
+
+# Таблица целиком кэшируется в памяти процесса (db.reference_cache)
+register_reference(Aircraft)
\ No newline at end of file
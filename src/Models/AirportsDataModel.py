@@ -1,7 +1,54 @@
-import json
+from src.Models.pagination import KeysetPage, fetch_keyset_rows, build_keyset_page
+from src.Models.mapper import Column, RowMapper
+from src.Models.reference_cache import register_reference
+from src.Models.json_fields import to_json, json_column, display_column, display_value
+
+
+def _point_wkt(point):
+    """Координаты [долгота, широта] в виде WKT-точки"""
+    return f"POINT({point[0]} {point[1]})"
 
 
 class Airport:
+    TABLE = 'bookings.airports_data'
+
+    # Уникальный ключ сортировки для пагинации по ключу
+    PAGE_KEY = ('airport_code',)
+
+    # Поля хранятся в слотах без словаря экземпляра
+    __slots__ = ('airport_code', 'airport_name', 'city', 'coordinates', 'timezone')
+
+    # Колонки выборки в порядке аргументов конструктора (см. MAPPER в конце модуля)
+    COLUMNS = (
+        'airport_code',
+        json_column('airport_name'),
+        json_column('city'),
+        Column('coordinates', "ARRAY[ST_X(coordinates), ST_Y(coordinates)]", _point_wkt),
+        'timezone',
+    )
+
+    # Колонки списка в представлении: названия извлекаются на сервере на языке отображения
+    SUMMARY_COLUMNS = (
+        'airport_code',
+        display_column('airport_name'),
+        display_column('city'),
+        'coordinates',
+        'timezone',
+    )
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.airports_data
+    (
+        airport_code character(3) COLLATE pg_catalog."default" NOT NULL,
+        airport_name jsonb NOT NULL,
+        city jsonb NOT NULL,
+        coordinates geometry(Point,4326) NOT NULL,
+        timezone text COLLATE pg_catalog."default" NOT NULL,
+        CONSTRAINT airports_data_pkey PRIMARY KEY (airport_code)
+    );
+    """
+
     def __init__(self, airport_code, airport_name, city, coordinates, timezone):
         self.airport_code = airport_code
         self.airport_name = airport_name  # JSONB данные
@@ -10,8 +57,8 @@ class Airport:
         self.timezone = timezone
 
     def __str__(self):
-        airport_name_str = json.dumps(self.airport_name, ensure_ascii=False)
-        city_str = json.dumps(self.city, ensure_ascii=False)
+        airport_name_str = to_json(self.airport_name)
+        city_str = to_json(self.city)
         return f"Airport {self.airport_code}: {airport_name_str}, {city_str}, Timezone: {self.timezone}"
 
     @staticmethod
@@ -19,18 +66,7 @@ class Airport:
         """Создание таблицы airports_data"""
         try:
             cursor = db.get_cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS bookings.airports_data
-            (
-                airport_code character(3) COLLATE pg_catalog."default" NOT NULL,
-                airport_name jsonb NOT NULL,
-                city jsonb NOT NULL,
-                coordinates geometry(Point,4326) NOT NULL,
-                timezone text COLLATE pg_catalog."default" NOT NULL,
-                CONSTRAINT airports_data_pkey PRIMARY KEY (airport_code)
-            );
-            """
-            cursor.execute(create_table_query)
+            cursor.execute(Airport.CREATE_TABLE_QUERY)
             db.connection.commit()
             print("Таблица airports_data создана или уже существует")
         except Exception as e:
@@ -47,13 +83,14 @@ class Airport:
             """
             cursor.execute(insert_query, (
                 airport_code,
-                json.dumps(airport_name),
-                json.dumps(city),
+                to_json(airport_name),
+                to_json(city),
                 longitude,
                 latitude,
                 timezone
             ))
             db.connection.commit()
+            db.table_changed(Airport.TABLE)
             print(f"Аэропорт {airport_code} успешно создан")
             return True
         except Exception as e:
@@ -61,29 +98,26 @@ class Airport:
             return False
 
     @staticmethod
-    def read_all(db):
+    def read_all(db, columns=None):
         """Чтение всех записей аэропортов"""
+        # Полная выборка отдается из кэша справочников (см. src/Models/reference_cache.py)
+        if columns is None:
+            cached = db.reference_cache.get_all(Airport.TABLE)
+            if cached is not None:
+                return cached
+
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT airport_code, airport_name, city, timezone,
-                       ST_X(coordinates) as longitude, 
-                       ST_Y(coordinates) as latitude
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Airport.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {mapper.select_list}
                 FROM bookings.airports_data 
                 ORDER BY airport_code
             """)
             results = cursor.fetchall()
 
-            airports = []
-            for row in results:
-                airport = Airport(
-                    airport_code=row['airport_code'],
-                    airport_name=row['airport_name'],
-                    city=row['city'],
-                    coordinates=f"POINT({row['longitude']} {row['latitude']})",
-                    timezone=row['timezone']
-                )
-                airports.append(airport)
+            airports = mapper.map_rows(results)
 
             return airports
         except Exception as e:
@@ -93,25 +127,21 @@ class Airport:
     @staticmethod
     def read_by_code(db, airport_code):
         """Чтение аэропорта по коду"""
+        found, cached = db.reference_cache.get(Airport.TABLE, airport_code)
+        if found:
+            return cached
+
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT airport_code, airport_name, city, timezone,
-                       ST_X(coordinates) as longitude, 
-                       ST_Y(coordinates) as latitude
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Airport.MAPPER.select_list}
                 FROM bookings.airports_data 
                 WHERE airport_code = %s
             """, (airport_code,))
             result = cursor.fetchone()
 
             if result:
-                return Airport(
-                    airport_code=result['airport_code'],
-                    airport_name=result['airport_name'],
-                    city=result['city'],
-                    coordinates=f"POINT({result['longitude']} {result['latitude']})",
-                    timezone=result['timezone']
-                )
+                return Airport.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске аэропорта: {e}")
@@ -127,11 +157,11 @@ class Airport:
 
             if airport_name is not None:
                 update_fields.append("airport_name = %s")
-                params.append(json.dumps(airport_name))
+                params.append(to_json(airport_name))
 
             if city is not None:
                 update_fields.append("city = %s")
-                params.append(json.dumps(city))
+                params.append(to_json(city))
 
             if longitude is not None and latitude is not None:
                 update_fields.append("coordinates = ST_SetSRID(ST_MakePoint(%s, %s), 4326)")
@@ -154,6 +184,7 @@ class Airport:
 
             cursor.execute(update_query, params)
             db.connection.commit()
+            db.table_changed(Airport.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Аэропорт {airport_code} успешно обновлен")
@@ -173,6 +204,7 @@ class Airport:
             delete_query = "DELETE FROM bookings.airports_data WHERE airport_code = %s"
             cursor.execute(delete_query, (airport_code,))
             db.connection.commit()
+            db.table_changed(Airport.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Аэропорт {airport_code} успешно удален")
@@ -188,11 +220,9 @@ class Airport:
     def find_nearby_airports(db, longitude, latitude, radius_km=100):
         """Поиск аэропортов в радиусе от заданной точки"""
         try:
-            cursor = db.get_cursor()
-            query = """
-            SELECT airport_code, airport_name, city, timezone,
-                   ST_X(coordinates) as longitude, 
-                   ST_Y(coordinates) as latitude,
+            cursor = db.get_cursor(tuple_rows=True)
+            query = f"""
+            SELECT {Airport.MAPPER.select_list},
                    ST_Distance(coordinates::geography, ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography) / 1000 as distance_km
             FROM bookings.airports_data 
             WHERE ST_DWithin(coordinates::geography, ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography, %s * 1000)
@@ -201,16 +231,8 @@ class Airport:
             cursor.execute(query, (longitude, latitude, longitude, latitude, radius_km))
             results = cursor.fetchall()
 
-            airports = []
-            for row in results:
-                airport = Airport(
-                    airport_code=row['airport_code'],
-                    airport_name=row['airport_name'],
-                    city=row['city'],
-                    coordinates=f"POINT({row['longitude']} {row['latitude']})",
-                    timezone=row['timezone']
-                )
-                airports.append((airport, row['distance_km']))
+            # Расстояние выбирается последней колонкой, после колонок модели
+            airports = [(Airport.MAPPER.from_row(row), row[-1]) for row in results]
 
             return airports
         except Exception as e:
@@ -218,38 +240,90 @@ class Airport:
             return []
 
     @staticmethod
-    def read_all_paginated(db, offset, limit):
+    def _cacheable(columns):
+        """Можно ли отдать выборку из кэша справочников: все колонки или колонки списка"""
+        return columns is None or tuple(columns) == Airport.SUMMARY_COLUMNS
+
+    @staticmethod
+    def _summary(airport):
+        """Объект с колонками списка (SUMMARY_COLUMNS) по объекту кэша"""
+        return Airport(airport.airport_code, display_value(airport.airport_name), display_value(airport.city),
+                       airport.coordinates, airport.timezone)
+
+    @staticmethod
+    def read_all_paginated(db, offset, limit, columns=None):
         """Чтение записей аэропортов с пагинацией"""
+        # Справочник целиком в памяти (см. src/Models/reference_cache.py): страница - срез кэша
+        if Airport._cacheable(columns):
+            cached = db.reference_cache.get_slice(Airport.TABLE, offset, limit)
+            if cached is not None:
+                items, total = cached
+                if columns is not None:
+                    items = [Airport._summary(airport) for airport in items]
+                return items, total
+
         try:
-            cursor = db.get_cursor()
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Airport.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
 
             # Получаем данные
-            cursor.execute("""
-                   SELECT airport_code, airport_name, city, timezone,
-                          ST_X(coordinates) as longitude, 
-                          ST_Y(coordinates) as latitude
+            cursor.execute(f"""
+                   SELECT {mapper.select_list}
                    FROM bookings.airports_data 
                    ORDER BY airport_code 
                    LIMIT %s OFFSET %s
                """, (limit, offset))
             results = cursor.fetchall()
 
-            airports = []
-            for row in results:
-                airport = Airport(
-                    airport_code=row['airport_code'],
-                    airport_name=row['airport_name'],
-                    city=row['city'],
-                    coordinates=f"POINT({row['longitude']} {row['latitude']})",
-                    timezone=row['timezone']
-                )
-                airports.append(airport)
+            airports = mapper.map_rows(results)
 
-            # Получаем общее количество
-            cursor.execute("SELECT COUNT(*) FROM bookings.airports_data")
-            total = cursor.fetchone()['count']
+            # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+            total = db.row_counts.count(Airport.TABLE)
 
             return airports, total
         except Exception as e:
             print(f"Ошибка при чтении аэропортов: {e}")
-            return [], 0
\ No newline at end of file
+            return [], 0
+
+    @staticmethod
+    def read_page(db, limit, token=None, backward=False, columns=None):
+        """Чтение страницы аэропортов с пагинацией по ключу (airport_code)"""
+        # Справочник целиком в памяти (см. src/Models/reference_cache.py): страница строится без запросов
+        if Airport._cacheable(columns):
+            page = db.reference_cache.get_page(Airport.TABLE, limit, token, backward)
+            if page is not None:
+                if columns is not None:
+                    page.items = [Airport._summary(airport) for airport in page.items]
+                return page
+
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = Airport.MAPPER.project(columns, Airport.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Получаем данные после (или до) ключа из токена
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"""
+                        SELECT {mapper.select_list}
+                        FROM bookings.airports_data
+                    """,
+                    Airport.PAGE_KEY, limit, token, backward
+                )
+
+                airports = mapper.map_rows(rows)
+
+                # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+                total = db.row_counts.count(Airport.TABLE)
+
+                return build_keyset_page(airports, rows, Airport.PAGE_KEY, total, has_next, has_prev,
+                                         db.row_counts.is_estimate(Airport.TABLE), mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении страницы аэропортов: {e}")
+            return KeysetPage([], 0)
+
+
+# Отображение строк запросов на объекты Airport, общее для всех методов чтения
+Airport.MAPPER = RowMapper(Airport, Airport.COLUMNS)
+
+# Таблица целиком кэшируется в памяти процесса (db.reference_cache)
+register_reference(Airport)
\ No newline at end of file
@@ -1,4 +1,61 @@
+from src.Models.pagination import KeysetPage, fetch_keyset_rows, build_keyset_page
+from src.Models.mapper import RowMapper
+from src.Models.prepared import PreparedStatement
+from src.Models.streaming import iter_models
+from src.Models.database import DEFAULT_ITERSIZE
+from src.Models.bulk import bulk_insert, DEFAULT_CHUNK_SIZE, VALUES
+from src.Models.seat_map import SEAT_OCCUPIED, SEAT_UNKNOWN, SeatLayout, SeatOccupancy
+
+
+class CheckInResult:
+    """Итог регистрации пассажиров рейса"""
+
+    def __init__(self, flight_id):
+        self.flight_id = flight_id
+        self.boarding_passes = []  # Созданные посадочные талоны
+        self.skipped = []  # (номер билета, причина) для билетов, оставшихся без талона
+        self.error = None  # Ошибка, из-за которой откатана вся регистрация
+
+    @property
+    def checked_in(self):
+        return len(self.boarding_passes)
+
+    @property
+    def ok(self):
+        return self.error is None and not self.skipped
+
+    def __str__(self):
+        if self.error:
+            return f"Регистрация отменена: {self.error}"
+        return f"Зарегистрировано пассажиров: {self.checked_in}, без посадочного талона: {len(self.skipped)}"
+
+
 class BoardingPass:
+    TABLE = 'bookings.boarding_passes'
+
+    # Уникальный ключ сортировки для пагинации по ключу
+    PAGE_KEY = ('flight_id', 'boarding_no')
+
+    # Поля хранятся в слотах без словаря экземпляра
+    __slots__ = ('ticket_no', 'flight_id', 'boarding_no', 'seat_no')
+
+    # Колонки выборки в порядке аргументов конструктора (см. MAPPER в конце модуля)
+    COLUMNS = __slots__
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.boarding_passes
+    (
+        ticket_no character(13) COLLATE pg_catalog."default" NOT NULL,
+        flight_id integer NOT NULL,
+        boarding_no integer NOT NULL,
+        seat_no character varying(4) COLLATE pg_catalog."default" NOT NULL,
+        CONSTRAINT boarding_passes_pkey PRIMARY KEY (ticket_no, flight_id),
+        CONSTRAINT boarding_passes_flight_id_boarding_no_key UNIQUE (flight_id, boarding_no),
+        CONSTRAINT boarding_passes_flight_id_seat_no_key UNIQUE (flight_id, seat_no)
+    );
+    """
+
     def __init__(self, ticket_no, flight_id, boarding_no, seat_no):
         self.ticket_no = ticket_no
         self.flight_id = flight_id
@@ -13,19 +70,7 @@ class BoardingPass:
         """Создание таблицы boarding_passes"""
         try:
             cursor = db.get_cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS bookings.boarding_passes
-            (
-                ticket_no character(13) COLLATE pg_catalog."default" NOT NULL,
-                flight_id integer NOT NULL,
-                boarding_no integer NOT NULL,
-                seat_no character varying(4) COLLATE pg_catalog."default" NOT NULL,
-                CONSTRAINT boarding_passes_pkey PRIMARY KEY (ticket_no, flight_id),
-                CONSTRAINT boarding_passes_flight_id_boarding_no_key UNIQUE (flight_id, boarding_no),
-                CONSTRAINT boarding_passes_flight_id_seat_no_key UNIQUE (flight_id, seat_no)
-            );
-            """
-            cursor.execute(create_table_query)
+            cursor.execute(BoardingPass.CREATE_TABLE_QUERY)
             db.connection.commit()
             print("Таблица boarding_passes создана или уже существует")
         except Exception as e:
@@ -34,7 +79,19 @@ class BoardingPass:
     @staticmethod
     def create(db, ticket_no, flight_id, boarding_no, seat_no):
         """Создание новой записи посадочного талона"""
+        if boarding_no is None:
+            print(f"Ошибка: не выдан номер посадки для билета {ticket_no} рейса {flight_id}")
+            return False
         try:
+            # Место проверяется по карте мест рейса, без запроса к базе
+            status = db.seat_maps.seat_status(flight_id, seat_no)
+            if status == SEAT_OCCUPIED:
+                print(f"Ошибка: место {seat_no} на рейсе {flight_id} уже занято")
+                return False
+            if status == SEAT_UNKNOWN:
+                print(f"Ошибка: в самолете рейса {flight_id} нет места {seat_no}")
+                return False
+
             cursor = db.get_cursor()
             insert_query = """
             INSERT INTO bookings.boarding_passes (ticket_no, flight_id, boarding_no, seat_no)
@@ -42,29 +99,179 @@ class BoardingPass:
             """
             cursor.execute(insert_query, (ticket_no, flight_id, boarding_no, seat_no))
             db.connection.commit()
+            db.seat_maps.occupy(flight_id, seat_no)
+            db.table_changed(BoardingPass.TABLE)
             print(f"Посадочный талон для билета {ticket_no} рейса {flight_id} успешно создан")
             return True
         except Exception as e:
+            # Место могли занять другие клиенты - карта рейса перечитывается
+            db.seat_maps.invalidate_flights((flight_id,))
             print(f"Ошибка при создании посадочного талона: {e}")
             return False
 
     @staticmethod
-    def read_all(db):
+    def _prepare_bulk_row(record):
+        """Преобразование записи пакета в кортеж значений"""
+        return (record['ticket_no'], record['flight_id'], record['boarding_no'], record['seat_no'])
+
+    @staticmethod
+    def create_many(db, records, chunk_size=DEFAULT_CHUNK_SIZE, method=VALUES):
+        """Пакетное создание посадочных талонов в одной транзакции
+
+        records - итерируемый набор словарей с ключами ticket_no, flight_id,
+        boarding_no и seat_no.
+        Возвращает BulkResult с количеством вставленных записей и ошибками по строкам.
+        """
+        # Карты мест затронутых рейсов перечитываются после вставки
+        flight_ids = set()
+
+        def prepare_row(record):
+            flight_ids.add(record['flight_id'])
+            return BoardingPass._prepare_bulk_row(record)
+
+        result = bulk_insert(
+            db, BoardingPass.TABLE,
+            ('ticket_no', 'flight_id', 'boarding_no', 'seat_no'),
+            records, prepare_row, chunk_size, method
+        )
+        db.seat_maps.invalidate_flights(flight_ids)
+        if result.inserted:
+            try:
+                # Номера посадки пакета заданы явно - счетчики рейсов сдвигаются за них
+                db.boarding_numbers.resync(flight_ids)
+            except Exception as e:
+                print(f"Ошибка при обновлении счетчиков номеров посадки: {e}")
+        if result.error:
+            print(f"Ошибка при пакетном создании посадочных талонов: {result.error}")
+        else:
+            print(f"Пакетное создание посадочных талонов: {result}")
+        return result
+
+    @staticmethod
+    def check_in_flight(db, flight_id, ticket_nos=None, method=VALUES):
+        """Регистрация пассажиров рейса в одной транзакции
+
+        ticket_nos - номера билетов (None - все билеты рейса без посадочного талона).
+        Каждому билету назначается первое свободное место его класса обслуживания
+        по схеме мест самолета, номера посадки резервируются счетчиком рейса одним
+        обращением, талоны вставляются одним пакетом. Строка рейса блокируется до
+        конца транзакции, поэтому параллельные регистрации рейса не получат одни
+        и те же места.
+        Возвращает CheckInResult.
+        """
+        result = CheckInResult(flight_id)
+        if ticket_nos is not None:
+            ticket_nos = list(dict.fromkeys(ticket_nos))
+            if not ticket_nos:
+                return result
+
+        try:
+            with db.transaction(), db.get_cursor(tuple_rows=True) as cursor:
+                cursor.execute("""
+                    SELECT aircraft_code FROM bookings.flights
+                    WHERE flight_id = %s
+                    FOR NO KEY UPDATE
+                """, (flight_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    raise ValueError(f"рейс {flight_id} не найден")
+                aircraft_code = row[0]
+
+                # Перелеты рейса без посадочного талона и их классы обслуживания
+                query = """
+                    SELECT tf.ticket_no, tf.fare_conditions
+                    FROM bookings.ticket_flights tf
+                    WHERE tf.flight_id = %s
+                      AND NOT EXISTS (
+                          SELECT 1 FROM bookings.boarding_passes bp
+                          WHERE bp.ticket_no = tf.ticket_no AND bp.flight_id = tf.flight_id
+                      )
+                """
+                params = [flight_id]
+                if ticket_nos is not None:
+                    query += " AND tf.ticket_no = ANY(%s::bpchar[])"
+                    params.append(ticket_nos)
+                cursor.execute(query + " ORDER BY tf.ticket_no", params)
+                tickets = cursor.fetchall()
+
+                if ticket_nos is not None:
+                    found = {ticket_no for ticket_no, _ in tickets}
+                    for ticket_no in ticket_nos:
+                        if ticket_no not in found:
+                            result.skipped.append((ticket_no, "нет перелета на рейсе или талон уже выдан"))
+                if not tickets:
+                    return result
+
+                # Схема мест и занятость рейса читаются одним запросом внутри транзакции
+                cursor.execute("""
+                    SELECT s.seat_no, s.fare_conditions, bp.seat_no IS NOT NULL AS occupied
+                    FROM bookings.seats s
+                    LEFT JOIN bookings.boarding_passes bp
+                           ON bp.flight_id = %s AND bp.seat_no = s.seat_no
+                    WHERE s.aircraft_code = %s
+                """, (flight_id, aircraft_code))
+                seats = cursor.fetchall()
+                layout = SeatLayout(aircraft_code, [(seat_no, fare) for seat_no, fare, _ in seats])
+                occupancy = SeatOccupancy(flight_id, layout, [seat_no for seat_no, _, occupied in seats if occupied])
+
+                assigned = []
+                for ticket_no, fare_conditions in tickets:
+                    seat_no = occupancy.first_free(fare_conditions)
+                    if seat_no is None:
+                        result.skipped.append((ticket_no, f"нет свободных мест класса {fare_conditions}"))
+                        continue
+                    occupancy.occupy(seat_no)
+                    assigned.append((ticket_no, seat_no))
+                if not assigned:
+                    return result
+
+                # Строка счетчика рейса остается заблокированной до конца транзакции
+                numbers = db.boarding_numbers.allocate_many(flight_id, len(assigned))
+                records = [
+                    {'ticket_no': ticket_no, 'flight_id': flight_id, 'boarding_no': boarding_no, 'seat_no': seat_no}
+                    for (ticket_no, seat_no), boarding_no in zip(assigned, numbers)
+                ]
+
+                bulk = bulk_insert(
+                    db, BoardingPass.TABLE,
+                    ('ticket_no', 'flight_id', 'boarding_no', 'seat_no'),
+                    records, BoardingPass._prepare_bulk_row, len(records), method
+                )
+                if bulk.error:
+                    raise RuntimeError(bulk.error)
+
+                rejected = {error.index for error in bulk.errors}
+                for error in bulk.errors:
+                    result.skipped.append((error.record['ticket_no'], error.message))
+                result.boarding_passes = [
+                    BoardingPass(**record) for index, record in enumerate(records) if index not in rejected
+                ]
+        except Exception as e:
+            db.seat_maps.invalidate_flights((flight_id,))
+            result.boarding_passes = []
+            result.error = str(e).strip()
+            print(f"Ошибка при регистрации пассажиров рейса {flight_id}: {result.error}")
+            return result
+
+        if result.boarding_passes:
+            for boarding_pass in result.boarding_passes:
+                db.seat_maps.occupy(flight_id, boarding_pass.seat_no)
+            # Повторное уведомление после фиксации: подписчики могли перечитать таблицу до нее
+            db.table_changed(BoardingPass.TABLE)
+        print(f"Регистрация пассажиров рейса {flight_id}: {result}")
+        return result
+
+    @staticmethod
+    def read_all(db, columns=None):
         """Чтение всех записей посадочных талонов"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("SELECT * FROM bookings.boarding_passes ORDER BY flight_id, boarding_no")
+            # Проекция: выбираются только запрошенные колонки
+            mapper = BoardingPass.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"SELECT {mapper.select_list} FROM bookings.boarding_passes ORDER BY flight_id, boarding_no")
             results = cursor.fetchall()
 
-            boarding_passes = []
-            for row in results:
-                boarding_pass = BoardingPass(
-                    ticket_no=row['ticket_no'],
-                    flight_id=row['flight_id'],
-                    boarding_no=row['boarding_no'],
-                    seat_no=row['seat_no']
-                )
-                boarding_passes.append(boarding_pass)
+            boarding_passes = mapper.map_rows(results)
 
             return boarding_passes
         except Exception as e:
@@ -75,20 +282,12 @@ class BoardingPass:
     def read_by_ticket_and_flight(db, ticket_no, flight_id):
         """Чтение посадочного талона по номеру билета и рейсу"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.boarding_passes 
-                WHERE ticket_no = %s AND flight_id = %s
-            """, (ticket_no, flight_id))
+            cursor = db.get_cursor(tuple_rows=True)
+            db.execute_prepared(cursor, BoardingPass.BY_TICKET_AND_FLIGHT, (ticket_no, flight_id))
             result = cursor.fetchone()
 
             if result:
-                return BoardingPass(
-                    ticket_no=result['ticket_no'],
-                    flight_id=result['flight_id'],
-                    boarding_no=result['boarding_no'],
-                    seat_no=result['seat_no']
-                )
+                return BoardingPass.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске посадочного талона: {e}")
@@ -98,23 +297,15 @@ class BoardingPass:
     def read_by_flight(db, flight_id):
         """Чтение всех посадочных талонов для рейса"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.boarding_passes 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {BoardingPass.MAPPER.select_list} FROM bookings.boarding_passes 
                 WHERE flight_id = %s 
                 ORDER BY boarding_no
             """, (flight_id,))
             results = cursor.fetchall()
 
-            boarding_passes = []
-            for row in results:
-                boarding_pass = BoardingPass(
-                    ticket_no=row['ticket_no'],
-                    flight_id=row['flight_id'],
-                    boarding_no=row['boarding_no'],
-                    seat_no=row['seat_no']
-                )
-                boarding_passes.append(boarding_pass)
+            boarding_passes = BoardingPass.MAPPER.map_rows(results)
 
             return boarding_passes
         except Exception as e:
@@ -125,20 +316,15 @@ class BoardingPass:
     def read_by_boarding_no(db, flight_id, boarding_no):
         """Чтение посадочного талона по номеру посадки"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.boarding_passes 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {BoardingPass.MAPPER.select_list} FROM bookings.boarding_passes 
                 WHERE flight_id = %s AND boarding_no = %s
             """, (flight_id, boarding_no))
             result = cursor.fetchone()
 
             if result:
-                return BoardingPass(
-                    ticket_no=result['ticket_no'],
-                    flight_id=result['flight_id'],
-                    boarding_no=result['boarding_no'],
-                    seat_no=result['seat_no']
-                )
+                return BoardingPass.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске посадочного талона по номеру посадки: {e}")
@@ -148,16 +334,37 @@ class BoardingPass:
     def update_seat(db, ticket_no, flight_id, seat_no):
         """Обновление места в посадочном талоне"""
         try:
+            status = db.seat_maps.seat_status(flight_id, seat_no)
+            if status == SEAT_UNKNOWN:
+                print(f"Ошибка: в самолете рейса {flight_id} нет места {seat_no}")
+                return False
+            if status == SEAT_OCCUPIED:
+                # Занятое место допустимо, только если его уже занимает этот же билет
+                current = BoardingPass.read_by_ticket_and_flight(db, ticket_no, flight_id)
+                if current is None or current.seat_no != seat_no:
+                    print(f"Ошибка: место {seat_no} на рейсе {flight_id} уже занято")
+                    return False
+
             cursor = db.get_cursor()
+            # Прежнее место возвращается из строки до обновления (самосоединение)
             update_query = """
-            UPDATE bookings.boarding_passes 
+            UPDATE bookings.boarding_passes bp
             SET seat_no = %s 
-            WHERE ticket_no = %s AND flight_id = %s
+            FROM bookings.boarding_passes old
+            WHERE old.ticket_no = bp.ticket_no AND old.flight_id = bp.flight_id
+              AND bp.ticket_no = %s AND bp.flight_id = %s
+            RETURNING old.seat_no
             """
 
             cursor.execute(update_query, (seat_no, ticket_no, flight_id))
+            old = cursor.fetchone()
             db.connection.commit()
 
+            if old:
+                db.seat_maps.release(flight_id, old['seat_no'])
+                db.seat_maps.occupy(flight_id, seat_no)
+            db.table_changed(BoardingPass.TABLE)
+
             if cursor.rowcount > 0:
                 print(f"Место в посадочном талоне обновлено: {seat_no}")
                 return True
@@ -165,6 +372,7 @@ class BoardingPass:
                 print("Посадочный талон не найден")
                 return False
         except Exception as e:
+            db.seat_maps.invalidate_flights((flight_id,))
             print(f"Ошибка при обновлении места: {e}")
             return False
 
@@ -181,6 +389,9 @@ class BoardingPass:
 
             cursor.execute(update_query, (boarding_no, ticket_no, flight_id))
             db.connection.commit()
+            # Номер задан вручную - счетчик рейса не должен выдать его повторно
+            db.boarding_numbers.resync((flight_id,))
+            db.table_changed(BoardingPass.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Номер посадки обновлен: {boarding_no}")
@@ -200,9 +411,14 @@ class BoardingPass:
             delete_query = """
             DELETE FROM bookings.boarding_passes 
             WHERE ticket_no = %s AND flight_id = %s
+            RETURNING seat_no
             """
             cursor.execute(delete_query, (ticket_no, flight_id))
+            deleted = cursor.fetchone()
             db.connection.commit()
+            if deleted:
+                db.seat_maps.release(flight_id, deleted['seat_no'])
+            db.table_changed(BoardingPass.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Посадочный талон для билета {ticket_no} рейса {flight_id} успешно удален")
@@ -217,6 +433,10 @@ class BoardingPass:
     @staticmethod
     def get_available_seats(db, flight_id):
         """Получение списка занятых мест для рейса"""
+        # Из карты мест рейса; запрос к базе - только если карта недоступна
+        occupied_seats = db.seat_maps.occupied_seats(flight_id)
+        if occupied_seats is not None:
+            return sorted(occupied_seats)
         try:
             cursor = db.get_cursor()
             cursor.execute("""
@@ -232,52 +452,157 @@ class BoardingPass:
             print(f"Ошибка при получении списка занятых мест: {e}")
             return []
 
+    @staticmethod
+    def get_free_seats(db, flight_id, fare_conditions=None):
+        """Свободные места рейса по порядку в салоне (всего или в классе обслуживания)"""
+        return db.seat_maps.free_seats(flight_id, fare_conditions)
+
+    @staticmethod
+    def get_free_seat_count(db, flight_id, fare_conditions=None):
+        """Количество свободных мест рейса (None - карта мест недоступна)"""
+        return db.seat_maps.free_count(flight_id, fare_conditions)
+
+    @staticmethod
+    def find_free_seat(db, flight_id, fare_conditions=None):
+        """Первое свободное место рейса по порядку в салоне или None"""
+        return db.seat_maps.first_free(flight_id, fare_conditions)
+
+    @staticmethod
+    def get_seat_status(db, flight_id, seat_no):
+        """Состояние места рейса: SEAT_FREE, SEAT_OCCUPIED, SEAT_UNKNOWN (None - карта недоступна)"""
+        return db.seat_maps.seat_status(flight_id, seat_no)
+
     @staticmethod
     def get_next_boarding_no(db, flight_id):
-        """Получение следующего номера посадки для рейса"""
-        try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT COALESCE(MAX(boarding_no), 0) + 1 as next_boarding_no
-                FROM bookings.boarding_passes 
-                WHERE flight_id = %s
-            """, (flight_id,))
-            result = cursor.fetchone()
+        """Получение следующего номера посадки для рейса
 
-            return result['next_boarding_no'] if result else 1
+        Номер выдается атомарно счетчиком рейса (db.boarding_numbers) и не будет
+        выдан повторно другой стойке регистрации. None - счетчик недоступен
+        (например, миграция схемы не применена): номер по MAX(boarding_no) не
+        вычисляется, так как параллельные стойки получили бы одинаковые номера.
+        """
+        try:
+            return db.boarding_numbers.allocate(flight_id)
         except Exception as e:
             print(f"Ошибка при получении следующего номера посадки: {e}")
-            return 1
+            return None
+
+    @staticmethod
+    def iter_all(db, itersize=DEFAULT_ITERSIZE, columns=None):
+        """Ленивый обход всех посадочных талонов через серверный курсор"""
+        # Проекция: выбираются только запрошенные колонки
+        mapper = BoardingPass.MAPPER.project(columns)
+        return iter_models(db, f"""
+            SELECT {mapper.select_list} FROM bookings.boarding_passes 
+            ORDER BY flight_id, boarding_no
+        """, None, mapper.from_row, itersize, "Ошибка при чтении посадочных талонов")
+
+    @staticmethod
+    def iter_by_flight(db, flight_id, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход посадочных талонов рейса"""
+        return iter_models(db, f"""
+            SELECT {BoardingPass.MAPPER.select_list} FROM bookings.boarding_passes 
+            WHERE flight_id = %s 
+            ORDER BY boarding_no
+        """, (flight_id,), BoardingPass.MAPPER.from_row, itersize, "Ошибка при чтении посадочных талонов рейса")
 
     @staticmethod
-    def read_all_paginated(db, offset, limit):
+    def read_all_paginated(db, offset, limit, columns=None):
         """Чтение записей посадочных талонов с пагинацией"""
         try:
-            cursor = db.get_cursor()
+            # Проекция: выбираются только запрошенные колонки
+            mapper = BoardingPass.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
 
             # Получаем данные
-            cursor.execute("""
-                    SELECT * FROM bookings.boarding_passes 
+            cursor.execute(f"""
+                    SELECT {mapper.select_list} FROM bookings.boarding_passes 
                     ORDER BY flight_id, boarding_no 
                     LIMIT %s OFFSET %s
                 """, (limit, offset))
             results = cursor.fetchall()
 
-            boarding_passes = []
-            for row in results:
-                boarding_pass = BoardingPass(
-                    ticket_no=row['ticket_no'],
-                    flight_id=row['flight_id'],
-                    boarding_no=row['boarding_no'],
-                    seat_no=row['seat_no']
-                )
-                boarding_passes.append(boarding_pass)
+            boarding_passes = mapper.map_rows(results)
 
-            # Получаем общее количество
-            cursor.execute("SELECT COUNT(*) FROM bookings.boarding_passes")
-            total = cursor.fetchone()['count']
+            # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+            total = db.row_counts.count(BoardingPass.TABLE)
 
             return boarding_passes, total
         except Exception as e:
             print(f"Ошибка при чтении посадочных талонов: {e}")
-            return [], 0
\ No newline at end of file
+            return [], 0
+
+    @staticmethod
+    def read_page(db, limit, token=None, backward=False, columns=None):
+        """Чтение страницы посадочных талонов с пагинацией по ключу (flight_id, boarding_no)"""
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = BoardingPass.MAPPER.project(columns, BoardingPass.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Получаем данные после (или до) ключа из токена
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"SELECT {mapper.select_list} FROM bookings.boarding_passes",
+                    BoardingPass.PAGE_KEY, limit, token, backward
+                )
+
+                boarding_passes = mapper.map_rows(rows)
+
+                # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+                total = db.row_counts.count(BoardingPass.TABLE)
+
+                return build_keyset_page(boarding_passes, rows, BoardingPass.PAGE_KEY, total, has_next, has_prev,
+                                         db.row_counts.is_estimate(BoardingPass.TABLE), mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении страницы посадочных талонов: {e}")
+            return KeysetPage([], 0)
+
+    @staticmethod
+    def read_chunk(db, limit, token=None, offset=0, flight_id=None, columns=None):
+        """Чтение порции посадочных талонов для виртуального списка
+
+        Порция начинается после ключа из токена со сдвигом offset строк;
+        flight_id ограничивает выборку одним рейсом. При ошибке возвращает None:
+        пустая порция означала бы конец таблицы.
+        """
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = BoardingPass.MAPPER.project(columns, BoardingPass.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                conditions = []
+                params = []
+                if flight_id is not None:
+                    conditions.append("flight_id = %s")
+                    params.append(flight_id)
+
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"SELECT {mapper.select_list} FROM bookings.boarding_passes",
+                    BoardingPass.PAGE_KEY, limit, token, conditions=conditions, params=params, offset=offset
+                )
+
+                boarding_passes = mapper.map_rows(rows)
+
+                if flight_id is None:
+                    total = db.row_counts.count(BoardingPass.TABLE)
+                    estimated = db.row_counts.is_estimate(BoardingPass.TABLE)
+                else:
+                    # Талоны одного рейса считаются точно по индексу (flight_id, boarding_no)
+                    cursor.execute("SELECT COUNT(*) FROM bookings.boarding_passes WHERE flight_id = %s", (flight_id,))
+                    total = cursor.fetchone()[0]
+                    estimated = False
+
+                return build_keyset_page(boarding_passes, rows, BoardingPass.PAGE_KEY, total, has_next, has_prev,
+                                         estimated, mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении порции посадочных талонов: {e}")
+            return None
+
+
+# Отображение строк запросов на объекты BoardingPass, общее для всех методов чтения
+BoardingPass.MAPPER = RowMapper(BoardingPass, BoardingPass.COLUMNS)
+
+# Точечный поиск подготавливается на сервере один раз на соединение
+BoardingPass.BY_TICKET_AND_FLIGHT = PreparedStatement(
+    'boarding_pass_by_ticket_and_flight',
+    f"SELECT {BoardingPass.MAPPER.select_list} FROM bookings.boarding_passes "
+    f"WHERE ticket_no = %s AND flight_id = %s"
+)
\ No newline at end of file
@@ -1,7 +1,33 @@
 from datetime import datetime
+from src.Models.pagination import KeysetPage, fetch_keyset_rows, build_keyset_page
+from src.Models.mapper import RowMapper
+from src.Models.streaming import iter_models
+from src.Models.database import DEFAULT_ITERSIZE
 
 
 class Booking:
+    TABLE = 'bookings.bookings'
+
+    # Уникальный ключ сортировки для пагинации по ключу
+    PAGE_KEY = ('book_date', 'book_ref')
+
+    # Поля хранятся в слотах без словаря экземпляра
+    __slots__ = ('book_ref', 'book_date', 'total_amount')
+
+    # Колонки выборки в порядке аргументов конструктора (см. MAPPER в конце модуля)
+    COLUMNS = __slots__
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.bookings
+    (
+        book_ref character(6) COLLATE pg_catalog."default" NOT NULL,
+        book_date timestamp with time zone NOT NULL,
+        total_amount numeric(10,2) NOT NULL,
+        CONSTRAINT bookings_pkey PRIMARY KEY (book_ref)
+    );
+    """
+
     def __init__(self, book_ref, book_date, total_amount):
         self.book_ref = book_ref
         self.book_date = book_date
@@ -15,16 +41,7 @@ class Booking:
         """Создание таблицы bookings"""
         try:
             cursor = db.get_cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS bookings.bookings
-            (
-                book_ref character(6) COLLATE pg_catalog."default" NOT NULL,
-                book_date timestamp with time zone NOT NULL,
-                total_amount numeric(10,2) NOT NULL,
-                CONSTRAINT bookings_pkey PRIMARY KEY (book_ref)
-            );
-            """
-            cursor.execute(create_table_query)
+            cursor.execute(Booking.CREATE_TABLE_QUERY)
             db.connection.commit()
             print("Таблица bookings создана или уже существует")
         except Exception as e:
@@ -41,6 +58,7 @@ class Booking:
             """
             cursor.execute(insert_query, (book_ref, book_date, total_amount))
             db.connection.commit()
+            db.table_changed(Booking.TABLE)
             print(f"Бронирование {book_ref} успешно создано")
             return True
         except Exception as e:
@@ -48,21 +66,16 @@ class Booking:
             return False
 
     @staticmethod
-    def read_all(db):
+    def read_all(db, columns=None):
         """Чтение всех записей бронирований"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("SELECT * FROM bookings.bookings ORDER BY book_date")
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Booking.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"SELECT {mapper.select_list} FROM bookings.bookings ORDER BY book_date")
             results = cursor.fetchall()
 
-            bookings = []
-            for row in results:
-                booking = Booking(
-                    book_ref=row['book_ref'],
-                    book_date=row['book_date'],
-                    total_amount=row['total_amount']
-                )
-                bookings.append(booking)
+            bookings = mapper.map_rows(results)
 
             return bookings
         except Exception as e:
@@ -73,16 +86,12 @@ class Booking:
     def read_by_ref(db, book_ref):
         """Чтение бронирования по номеру"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("SELECT * FROM bookings.bookings WHERE book_ref = %s", (book_ref,))
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"SELECT {Booking.MAPPER.select_list} FROM bookings.bookings WHERE book_ref = %s", (book_ref,))
             result = cursor.fetchone()
 
             if result:
-                return Booking(
-                    book_ref=result['book_ref'],
-                    book_date=result['book_date'],
-                    total_amount=result['total_amount']
-                )
+                return Booking.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске бронирования: {e}")
@@ -117,6 +126,7 @@ class Booking:
 
             cursor.execute(update_query, params)
             db.connection.commit()
+            db.table_changed(Booking.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Бронирование {book_ref} успешно обновлено")
@@ -136,6 +146,7 @@ class Booking:
             delete_query = "DELETE FROM bookings.bookings WHERE book_ref = %s"
             cursor.execute(delete_query, (book_ref,))
             db.connection.commit()
+            db.table_changed(Booking.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Бронирование {book_ref} успешно удалено")
@@ -148,33 +159,65 @@ class Booking:
             return False
 
     @staticmethod
-    def read_all_paginated(db, offset, limit):
+    def iter_all(db, itersize=DEFAULT_ITERSIZE, columns=None):
+        """Ленивый обход всех бронирований через серверный курсор"""
+        # Проекция: выбираются только запрошенные колонки
+        mapper = Booking.MAPPER.project(columns)
+        return iter_models(db, f"""
+            SELECT {mapper.select_list} FROM bookings.bookings 
+            ORDER BY book_date
+        """, None, mapper.from_row, itersize, "Ошибка при чтении бронирований")
+
+    @staticmethod
+    def read_all_paginated(db, offset, limit, columns=None):
         """Чтение записей бронирований с пагинацией"""
         try:
-            cursor = db.get_cursor()
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Booking.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
 
             # Получаем данные
-            cursor.execute("""
-                SELECT * FROM bookings.bookings 
+            cursor.execute(f"""
+                SELECT {mapper.select_list} FROM bookings.bookings 
                 ORDER BY book_date 
                 LIMIT %s OFFSET %s
             """, (limit, offset))
             results = cursor.fetchall()
 
-            bookings = []
-            for row in results:
-                booking = Booking(
-                    book_ref=row['book_ref'],
-                    book_date=row['book_date'],
-                    total_amount=row['total_amount']
-                )
-                bookings.append(booking)
+            bookings = mapper.map_rows(results)
 
-            # Получаем общее количество
-            cursor.execute("SELECT COUNT(*) FROM bookings.bookings")
-            total = cursor.fetchone()['count']
+            # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+            total = db.row_counts.count(Booking.TABLE)
 
             return bookings, total
         except Exception as e:
             print(f"Ошибка при чтении бронирований: {e}")
-            return [], 0
\ No newline at end of file
+            return [], 0
+
+    @staticmethod
+    def read_page(db, limit, token=None, backward=False, columns=None):
+        """Чтение страницы бронирований с пагинацией по ключу (book_date, book_ref)"""
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = Booking.MAPPER.project(columns, Booking.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Получаем данные после (или до) ключа из токена
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"SELECT {mapper.select_list} FROM bookings.bookings",
+                    Booking.PAGE_KEY, limit, token, backward
+                )
+
+                bookings = mapper.map_rows(rows)
+
+                # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+                total = db.row_counts.count(Booking.TABLE)
+
+                return build_keyset_page(bookings, rows, Booking.PAGE_KEY, total, has_next, has_prev,
+                                         db.row_counts.is_estimate(Booking.TABLE), mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении страницы бронирований: {e}")
+            return KeysetPage([], 0)
+
+
+# Отображение строк запросов на объекты Booking, общее для всех методов чтения
+Booking.MAPPER = RowMapper(Booking, Booking.COLUMNS)
\ No newline at end of file
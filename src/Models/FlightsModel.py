@@ -1,7 +1,52 @@
+import json
 from datetime import datetime
+from src.Models.pagination import KeysetPage, fetch_keyset_rows, build_keyset_page
+from src.Models.mapper import RowMapper
+from src.Models.prepared import PreparedStatement
+from src.Models.streaming import iter_models
+from src.Models.database import DEFAULT_ITERSIZE
 
 
 class Flight:
+    TABLE = 'bookings.flights'
+
+    # Уникальный ключ сортировки для пагинации по ключу
+    PAGE_KEY = ('scheduled_departure', 'flight_id')
+
+    # Поля хранятся в слотах без словаря экземпляра
+    __slots__ = ('flight_id', 'flight_no', 'scheduled_departure', 'scheduled_arrival',
+                 'departure_airport', 'arrival_airport', 'status', 'aircraft_code',
+                 'actual_departure', 'actual_arrival')
+
+    # Колонки выборки в порядке аргументов конструктора (см. MAPPER в конце модуля)
+    COLUMNS = __slots__
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.flights
+    (
+        flight_id integer NOT NULL DEFAULT nextval('flights_flight_id_seq'::regclass),
+        flight_no character(6) COLLATE pg_catalog."default" NOT NULL,
+        scheduled_departure timestamp with time zone NOT NULL,
+        scheduled_arrival timestamp with time zone NOT NULL,
+        departure_airport character(3) COLLATE pg_catalog."default" NOT NULL,
+        arrival_airport character(3) COLLATE pg_catalog."default" NOT NULL,
+        status character varying(20) COLLATE pg_catalog."default" NOT NULL,
+        aircraft_code character(3) COLLATE pg_catalog."default" NOT NULL,
+        actual_departure timestamp with time zone,
+        actual_arrival timestamp with time zone,
+        CONSTRAINT flights_pkey PRIMARY KEY (flight_id),
+        CONSTRAINT flights_flight_no_scheduled_departure_key UNIQUE (flight_no, scheduled_departure),
+        CONSTRAINT flights_check CHECK (scheduled_arrival > scheduled_departure),
+        CONSTRAINT flights_check1 CHECK (actual_arrival IS NULL OR 
+            (actual_departure IS NOT NULL AND actual_arrival IS NOT NULL AND actual_arrival > actual_departure)),
+        CONSTRAINT flights_status_check CHECK (status::text = ANY (ARRAY['On Time'::character varying::text, 
+            'Delayed'::character varying::text, 'Departed'::character varying::text, 
+            'Arrived'::character varying::text, 'Scheduled'::character varying::text, 
+            'Cancelled'::character varying::text]))
+    );
+    """
+
     def __init__(self, flight_id, flight_no, scheduled_departure, scheduled_arrival,
                  departure_airport, arrival_airport, status, aircraft_code,
                  actual_departure=None, actual_arrival=None):
@@ -25,31 +70,7 @@ class Flight:
         """Создание таблицы flights"""
         try:
             cursor = db.get_cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS bookings.flights
-            (
-                flight_id integer NOT NULL DEFAULT nextval('flights_flight_id_seq'::regclass),
-                flight_no character(6) COLLATE pg_catalog."default" NOT NULL,
-                scheduled_departure timestamp with time zone NOT NULL,
-                scheduled_arrival timestamp with time zone NOT NULL,
-                departure_airport character(3) COLLATE pg_catalog."default" NOT NULL,
-                arrival_airport character(3) COLLATE pg_catalog."default" NOT NULL,
-                status character varying(20) COLLATE pg_catalog."default" NOT NULL,
-                aircraft_code character(3) COLLATE pg_catalog."default" NOT NULL,
-                actual_departure timestamp with time zone,
-                actual_arrival timestamp with time zone,
-                CONSTRAINT flights_pkey PRIMARY KEY (flight_id),
-                CONSTRAINT flights_flight_no_scheduled_departure_key UNIQUE (flight_no, scheduled_departure),
-                CONSTRAINT flights_check CHECK (scheduled_arrival > scheduled_departure),
-                CONSTRAINT flights_check1 CHECK (actual_arrival IS NULL OR 
-                    (actual_departure IS NOT NULL AND actual_arrival IS NOT NULL AND actual_arrival > actual_departure)),
-                CONSTRAINT flights_status_check CHECK (status::text = ANY (ARRAY['On Time'::character varying::text, 
-                    'Delayed'::character varying::text, 'Departed'::character varying::text, 
-                    'Arrived'::character varying::text, 'Scheduled'::character varying::text, 
-                    'Cancelled'::character varying::text]))
-            );
-            """
-            cursor.execute(create_table_query)
+            cursor.execute(Flight.CREATE_TABLE_QUERY)
             db.connection.commit()
             print("Таблица flights создана или уже существует")
         except Exception as e:
@@ -79,6 +100,7 @@ class Flight:
             flight_id = result['flight_id']
 
             db.connection.commit()
+            db.table_changed(Flight.TABLE)
             print(f"Рейс {flight_no} (ID: {flight_id}) успешно создан")
             return flight_id
         except Exception as e:
@@ -86,31 +108,19 @@ class Flight:
             return None
 
     @staticmethod
-    def read_all(db):
+    def read_all(db, columns=None):
         """Чтение всех записей рейсов"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.flights 
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Flight.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {mapper.select_list} FROM bookings.flights 
                 ORDER BY scheduled_departure DESC
             """)
             results = cursor.fetchall()
 
-            flights = []
-            for row in results:
-                flight = Flight(
-                    flight_id=row['flight_id'],
-                    flight_no=row['flight_no'],
-                    scheduled_departure=row['scheduled_departure'],
-                    scheduled_arrival=row['scheduled_arrival'],
-                    departure_airport=row['departure_airport'],
-                    arrival_airport=row['arrival_airport'],
-                    status=row['status'],
-                    aircraft_code=row['aircraft_code'],
-                    actual_departure=row['actual_departure'],
-                    actual_arrival=row['actual_arrival']
-                )
-                flights.append(flight)
+            flights = mapper.map_rows(results)
 
             return flights
         except Exception as e:
@@ -121,55 +131,44 @@ class Flight:
     def read_by_id(db, flight_id):
         """Чтение рейса по ID"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("SELECT * FROM bookings.flights WHERE flight_id = %s", (flight_id,))
+            cursor = db.get_cursor(tuple_rows=True)
+            db.execute_prepared(cursor, Flight.BY_ID, (flight_id,))
             result = cursor.fetchone()
 
             if result:
-                return Flight(
-                    flight_id=result['flight_id'],
-                    flight_no=result['flight_no'],
-                    scheduled_departure=result['scheduled_departure'],
-                    scheduled_arrival=result['scheduled_arrival'],
-                    departure_airport=result['departure_airport'],
-                    arrival_airport=result['arrival_airport'],
-                    status=result['status'],
-                    aircraft_code=result['aircraft_code'],
-                    actual_departure=result['actual_departure'],
-                    actual_arrival=result['actual_arrival']
-                )
+                return Flight.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске рейса: {e}")
             return None
 
+    @staticmethod
+    def read_by_ids(db, flight_ids):
+        """Чтение рейсов по списку ID (один запрос)"""
+        try:
+            with db.get_cursor(tuple_rows=True) as cursor:
+                cursor.execute(f"SELECT {Flight.MAPPER.select_list} FROM bookings.flights WHERE flight_id = ANY(%s)",
+                               (list(flight_ids),))
+                results = cursor.fetchall()
+
+                return Flight.MAPPER.map_rows(results)
+        except Exception as e:
+            print(f"Ошибка при поиске рейсов: {e}")
+            return []
+
     @staticmethod
     def read_by_flight_no(db, flight_no):
         """Чтение рейсов по номеру рейса"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.flights 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Flight.MAPPER.select_list} FROM bookings.flights 
                 WHERE flight_no = %s 
                 ORDER BY scheduled_departure DESC
             """, (flight_no,))
             results = cursor.fetchall()
 
-            flights = []
-            for row in results:
-                flight = Flight(
-                    flight_id=row['flight_id'],
-                    flight_no=row['flight_no'],
-                    scheduled_departure=row['scheduled_departure'],
-                    scheduled_arrival=row['scheduled_arrival'],
-                    departure_airport=row['departure_airport'],
-                    arrival_airport=row['arrival_airport'],
-                    status=row['status'],
-                    aircraft_code=row['aircraft_code'],
-                    actual_departure=row['actual_departure'],
-                    actual_arrival=row['actual_arrival']
-                )
-                flights.append(flight)
+            flights = Flight.MAPPER.map_rows(results)
 
             return flights
         except Exception as e:
@@ -180,29 +179,15 @@ class Flight:
     def read_by_airport(db, airport_code):
         """Чтение рейсов по аэропорту (вылет или прилет)"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.flights 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Flight.MAPPER.select_list} FROM bookings.flights 
                 WHERE departure_airport = %s OR arrival_airport = %s 
                 ORDER BY scheduled_departure DESC
             """, (airport_code, airport_code))
             results = cursor.fetchall()
 
-            flights = []
-            for row in results:
-                flight = Flight(
-                    flight_id=row['flight_id'],
-                    flight_no=row['flight_no'],
-                    scheduled_departure=row['scheduled_departure'],
-                    scheduled_arrival=row['scheduled_arrival'],
-                    departure_airport=row['departure_airport'],
-                    arrival_airport=row['arrival_airport'],
-                    status=row['status'],
-                    aircraft_code=row['aircraft_code'],
-                    actual_departure=row['actual_departure'],
-                    actual_arrival=row['actual_arrival']
-                )
-                flights.append(flight)
+            flights = Flight.MAPPER.map_rows(results)
 
             return flights
         except Exception as e:
@@ -213,29 +198,15 @@ class Flight:
     def read_by_status(db, status):
         """Чтение рейсов по статусу"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.flights 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Flight.MAPPER.select_list} FROM bookings.flights 
                 WHERE status = %s 
                 ORDER BY scheduled_departure DESC
             """, (status,))
             results = cursor.fetchall()
 
-            flights = []
-            for row in results:
-                flight = Flight(
-                    flight_id=row['flight_id'],
-                    flight_no=row['flight_no'],
-                    scheduled_departure=row['scheduled_departure'],
-                    scheduled_arrival=row['scheduled_arrival'],
-                    departure_airport=row['departure_airport'],
-                    arrival_airport=row['arrival_airport'],
-                    status=row['status'],
-                    aircraft_code=row['aircraft_code'],
-                    actual_departure=row['actual_departure'],
-                    actual_arrival=row['actual_arrival']
-                )
-                flights.append(flight)
+            flights = Flight.MAPPER.map_rows(results)
 
             return flights
         except Exception as e:
@@ -246,29 +217,15 @@ class Flight:
     def read_by_date_range(db, start_date, end_date):
         """Чтение рейсов по диапазону дат"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.flights 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Flight.MAPPER.select_list} FROM bookings.flights 
                 WHERE scheduled_departure BETWEEN %s AND %s 
                 ORDER BY scheduled_departure
             """, (start_date, end_date))
             results = cursor.fetchall()
 
-            flights = []
-            for row in results:
-                flight = Flight(
-                    flight_id=row['flight_id'],
-                    flight_no=row['flight_no'],
-                    scheduled_departure=row['scheduled_departure'],
-                    scheduled_arrival=row['scheduled_arrival'],
-                    departure_airport=row['departure_airport'],
-                    arrival_airport=row['arrival_airport'],
-                    status=row['status'],
-                    aircraft_code=row['aircraft_code'],
-                    actual_departure=row['actual_departure'],
-                    actual_arrival=row['actual_arrival']
-                )
-                flights.append(flight)
+            flights = Flight.MAPPER.map_rows(results)
 
             return flights
         except Exception as e:
@@ -289,6 +246,7 @@ class Flight:
 
             cursor.execute(update_query, (status, flight_id))
             db.connection.commit()
+            db.table_changed(Flight.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Статус рейса {flight_id} обновлен: {status}")
@@ -325,6 +283,7 @@ class Flight:
 
             cursor.execute(update_query, params)
             db.connection.commit()
+            db.table_changed(Flight.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Фактическое время рейса {flight_id} обновлено")
@@ -361,6 +320,7 @@ class Flight:
 
             cursor.execute(update_query, params)
             db.connection.commit()
+            db.table_changed(Flight.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Плановое время рейса {flight_id} обновлено")
@@ -380,6 +340,8 @@ class Flight:
             delete_query = "DELETE FROM bookings.flights WHERE flight_id = %s"
             cursor.execute(delete_query, (flight_id,))
             db.connection.commit()
+            db.seat_maps.invalidate_flights((flight_id,))
+            db.table_changed(Flight.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Рейс {flight_id} успешно удален")
@@ -391,46 +353,131 @@ class Flight:
             print(f"Ошибка при удалении рейса: {e}")
             return False
 
+    @staticmethod
+    def parse_change(payload):
+        """Разбор уведомления об изменении рейса (канал FLIGHT_CHANNEL)
+
+        Возвращает словарь с flight_id, status и times_changed или None, если
+        уведомление не удалось разобрать.
+        """
+        try:
+            change = json.loads(payload)
+            return {
+                'flight_id': int(change['flight_id']),
+                'status': change['status'],
+                'times_changed': bool(change.get('times_changed'))
+            }
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"Ошибка при разборе уведомления об изменении рейса: {e}")
+            return None
+
     @staticmethod
     def get_available_statuses():
         """Получение списка доступных статусов"""
         return ['Scheduled', 'On Time', 'Delayed', 'Departed', 'Arrived', 'Cancelled']
 
     @staticmethod
-    def read_all_paginated(db, offset, limit):
+    def iter_all(db, itersize=DEFAULT_ITERSIZE, columns=None):
+        """Ленивый обход всех рейсов через серверный курсор"""
+        # Проекция: выбираются только запрошенные колонки
+        mapper = Flight.MAPPER.project(columns)
+        return iter_models(db, f"""
+            SELECT {mapper.select_list} FROM bookings.flights 
+            ORDER BY scheduled_departure DESC
+        """, None, mapper.from_row, itersize, "Ошибка при чтении рейсов")
+
+    @staticmethod
+    def iter_by_flight_no(db, flight_no, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход рейсов по номеру рейса"""
+        return iter_models(db, f"""
+            SELECT {Flight.MAPPER.select_list} FROM bookings.flights 
+            WHERE flight_no = %s 
+            ORDER BY scheduled_departure DESC
+        """, (flight_no,), Flight.MAPPER.from_row, itersize, "Ошибка при поиске рейсов")
+
+    @staticmethod
+    def iter_by_airport(db, airport_code, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход рейсов по аэропорту (вылет или прилет)"""
+        return iter_models(db, f"""
+            SELECT {Flight.MAPPER.select_list} FROM bookings.flights 
+            WHERE departure_airport = %s OR arrival_airport = %s 
+            ORDER BY scheduled_departure DESC
+        """, (airport_code, airport_code), Flight.MAPPER.from_row, itersize, "Ошибка при поиске рейсов по аэропорту")
+
+    @staticmethod
+    def iter_by_status(db, status, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход рейсов по статусу"""
+        return iter_models(db, f"""
+            SELECT {Flight.MAPPER.select_list} FROM bookings.flights 
+            WHERE status = %s 
+            ORDER BY scheduled_departure DESC
+        """, (status,), Flight.MAPPER.from_row, itersize, "Ошибка при поиске рейсов по статусу")
+
+    @staticmethod
+    def iter_by_date_range(db, start_date, end_date, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход рейсов в диапазоне дат"""
+        return iter_models(db, f"""
+            SELECT {Flight.MAPPER.select_list} FROM bookings.flights 
+            WHERE scheduled_departure BETWEEN %s AND %s 
+            ORDER BY scheduled_departure
+        """, (start_date, end_date), Flight.MAPPER.from_row, itersize, "Ошибка при поиске рейсов по дате")
+
+    @staticmethod
+    def read_all_paginated(db, offset, limit, columns=None):
         """Чтение записей рейсов с пагинацией"""
         try:
-            cursor = db.get_cursor()
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Flight.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
 
             # Получаем данные
-            cursor.execute("""
-                    SELECT * FROM bookings.flights 
+            cursor.execute(f"""
+                    SELECT {mapper.select_list} FROM bookings.flights 
                     ORDER BY scheduled_departure DESC
                     LIMIT %s OFFSET %s
                 """, (limit, offset))
             results = cursor.fetchall()
 
-            flights = []
-            for row in results:
-                flight = Flight(
-                    flight_id=row['flight_id'],
-                    flight_no=row['flight_no'],
-                    scheduled_departure=row['scheduled_departure'],
-                    scheduled_arrival=row['scheduled_arrival'],
-                    departure_airport=row['departure_airport'],
-                    arrival_airport=row['arrival_airport'],
-                    status=row['status'],
-                    aircraft_code=row['aircraft_code'],
-                    actual_departure=row['actual_departure'],
-                    actual_arrival=row['actual_arrival']
-                )
-                flights.append(flight)
+            flights = mapper.map_rows(results)
 
-            # Получаем общее количество
-            cursor.execute("SELECT COUNT(*) FROM bookings.flights")
-            total = cursor.fetchone()['count']
+            # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+            total = db.row_counts.count(Flight.TABLE)
 
             return flights, total
         except Exception as e:
             print(f"Ошибка при чтении рейсов: {e}")
-            return [], 0
\ No newline at end of file
+            return [], 0
+
+    @staticmethod
+    def read_page(db, limit, token=None, backward=False, columns=None):
+        """Чтение страницы рейсов с пагинацией по ключу (scheduled_departure, flight_id)"""
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = Flight.MAPPER.project(columns, Flight.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Получаем данные после (или до) ключа из токена
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"SELECT {mapper.select_list} FROM bookings.flights",
+                    Flight.PAGE_KEY, limit, token, backward, descending=True
+                )
+
+                flights = mapper.map_rows(rows)
+
+                # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+                total = db.row_counts.count(Flight.TABLE)
+
+                return build_keyset_page(flights, rows, Flight.PAGE_KEY, total, has_next, has_prev,
+                                         db.row_counts.is_estimate(Flight.TABLE), mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении страницы рейсов: {e}")
+            return KeysetPage([], 0)
+
+
+# Отображение строк запросов на объекты Flight, общее для всех методов чтения
+Flight.MAPPER = RowMapper(Flight, Flight.COLUMNS)
+
+# Точечный поиск подготавливается на сервере один раз на соединение
+Flight.BY_ID = PreparedStatement(
+    'flight_by_id',
+    f"SELECT {Flight.MAPPER.select_list} FROM bookings.flights WHERE flight_id = %s"
+)
\ No newline at end of file
@@ -1,6 +1,37 @@
 from datetime import datetime
+from src.Models.pagination import KeysetPage, fetch_keyset_rows, build_keyset_page
+from src.Models.mapper import RowMapper
+from src.Models.prepared import PreparedStatement
+from src.Models.streaming import iter_models
+from src.Models.database import DEFAULT_ITERSIZE
+
 
 class Seat:
+    TABLE = 'bookings.seats'
+
+    # Уникальный ключ сортировки для пагинации по ключу
+    PAGE_KEY = ('aircraft_code', 'seat_no')
+
+    # Поля хранятся в слотах без словаря экземпляра
+    __slots__ = ('aircraft_code', 'seat_no', 'fare_conditions')
+
+    # Колонки выборки в порядке аргументов конструктора (см. MAPPER в конце модуля)
+    COLUMNS = __slots__
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.seats
+    (
+        aircraft_code character(3) NOT NULL,
+        seat_no character varying(4) NOT NULL,
+        fare_conditions character varying(10) NOT NULL,
+        CONSTRAINT seats_pkey PRIMARY KEY (aircraft_code, seat_no),
+        CONSTRAINT seats_aircraft_code_fkey FOREIGN KEY (aircraft_code)
+            REFERENCES bookings.aircrafts (aircraft_code) 
+            ON DELETE CASCADE
+    );
+    """
+
     def __init__(self, aircraft_code, seat_no, fare_conditions):
         self.aircraft_code = aircraft_code
         self.seat_no = seat_no
@@ -14,19 +45,7 @@ class Seat:
         """Создание таблицы seats"""
         try:
             cursor = db.get_cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS bookings.seats
-            (
-                aircraft_code character(3) NOT NULL,
-                seat_no character varying(4) NOT NULL,
-                fare_conditions character varying(10) NOT NULL,
-                CONSTRAINT seats_pkey PRIMARY KEY (aircraft_code, seat_no),
-                CONSTRAINT seats_aircraft_code_fkey FOREIGN KEY (aircraft_code)
-                    REFERENCES bookings.aircrafts (aircraft_code) 
-                    ON DELETE CASCADE
-            );
-            """
-            cursor.execute(create_table_query)
+            cursor.execute(Seat.CREATE_TABLE_QUERY)
             db.connection.commit()
             print("Таблица seats создана или уже существует")
         except Exception as e:
@@ -43,6 +62,7 @@ class Seat:
             """
             cursor.execute(insert_query, (aircraft_code, seat_no, fare_conditions))
             db.connection.commit()
+            db.table_changed(Seat.TABLE)
             print(f"Место {seat_no} для самолета {aircraft_code} успешно создано")
             return True
         except Exception as e:
@@ -50,21 +70,16 @@ class Seat:
             return False
 
     @staticmethod
-    def read_all(db):
+    def read_all(db, columns=None):
         """Чтение всех записей мест"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("SELECT * FROM bookings.seats ORDER BY aircraft_code, seat_no")
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Seat.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"SELECT {mapper.select_list} FROM bookings.seats ORDER BY aircraft_code, seat_no")
             results = cursor.fetchall()
 
-            seats = []
-            for row in results:
-                seat = Seat(
-                    aircraft_code=row['aircraft_code'],
-                    seat_no=row['seat_no'],
-                    fare_conditions=row['fare_conditions']
-                )
-                seats.append(seat)
+            seats = mapper.map_rows(results)
 
             return seats
         except Exception as e:
@@ -75,22 +90,15 @@ class Seat:
     def read_by_aircraft(db, aircraft_code):
         """Чтение мест по коду самолета"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.seats 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Seat.MAPPER.select_list} FROM bookings.seats 
                 WHERE aircraft_code = %s 
                 ORDER BY seat_no
             """, (aircraft_code,))
             results = cursor.fetchall()
 
-            seats = []
-            for row in results:
-                seat = Seat(
-                    aircraft_code=row['aircraft_code'],
-                    seat_no=row['seat_no'],
-                    fare_conditions=row['fare_conditions']
-                )
-                seats.append(seat)
+            seats = Seat.MAPPER.map_rows(results)
 
             return seats
         except Exception as e:
@@ -101,19 +109,12 @@ class Seat:
     def read_by_primary_key(db, aircraft_code, seat_no):
         """Чтение места по первичному ключу"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.seats 
-                WHERE aircraft_code = %s AND seat_no = %s
-            """, (aircraft_code, seat_no))
+            cursor = db.get_cursor(tuple_rows=True)
+            db.execute_prepared(cursor, Seat.BY_PRIMARY_KEY, (aircraft_code, seat_no))
             result = cursor.fetchone()
 
             if result:
-                return Seat(
-                    aircraft_code=result['aircraft_code'],
-                    seat_no=result['seat_no'],
-                    fare_conditions=result['fare_conditions']
-                )
+                return Seat.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске места: {e}")
@@ -144,6 +145,7 @@ class Seat:
 
             cursor.execute(update_query, params)
             db.connection.commit()
+            db.table_changed(Seat.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Место {seat_no} для самолета {aircraft_code} успешно обновлено")
@@ -166,6 +168,7 @@ class Seat:
             """
             cursor.execute(delete_query, (aircraft_code, seat_no))
             db.connection.commit()
+            db.table_changed(Seat.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Место {seat_no} для самолета {aircraft_code} успешно удалено")
@@ -178,33 +181,81 @@ class Seat:
             return False
 
     @staticmethod
-    def read_all_paginated(db, offset, limit):
+    def iter_all(db, itersize=DEFAULT_ITERSIZE, columns=None):
+        """Ленивый обход всех мест через серверный курсор"""
+        # Проекция: выбираются только запрошенные колонки
+        mapper = Seat.MAPPER.project(columns)
+        return iter_models(db, f"""
+            SELECT {mapper.select_list} FROM bookings.seats 
+            ORDER BY aircraft_code, seat_no
+        """, None, mapper.from_row, itersize, "Ошибка при чтении мест")
+
+    @staticmethod
+    def iter_by_aircraft(db, aircraft_code, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход мест самолета"""
+        return iter_models(db, f"""
+            SELECT {Seat.MAPPER.select_list} FROM bookings.seats 
+            WHERE aircraft_code = %s 
+            ORDER BY seat_no
+        """, (aircraft_code,), Seat.MAPPER.from_row, itersize, "Ошибка при чтении мест самолета")
+
+    @staticmethod
+    def read_all_paginated(db, offset, limit, columns=None):
         """Чтение записей мест с пагинацией"""
         try:
-            cursor = db.get_cursor()
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Seat.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
 
             # Получаем данные
-            cursor.execute("""
-                SELECT * FROM bookings.seats 
+            cursor.execute(f"""
+                SELECT {mapper.select_list} FROM bookings.seats 
                 ORDER BY aircraft_code, seat_no
                 LIMIT %s OFFSET %s
             """, (limit, offset))
             results = cursor.fetchall()
 
-            seats = []
-            for row in results:
-                seat = Seat(
-                    aircraft_code=row['aircraft_code'],
-                    seat_no=row['seat_no'],
-                    fare_conditions=row['fare_conditions']
-                )
-                seats.append(seat)
+            seats = mapper.map_rows(results)
 
-            # Получаем общее количество
-            cursor.execute("SELECT COUNT(*) FROM bookings.seats")
-            total = cursor.fetchone()['count']
+            # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+            total = db.row_counts.count(Seat.TABLE)
 
             return seats, total
         except Exception as e:
             print(f"Ошибка при чтении мест: {e}")
-            return [], 0
\ No newline at end of file
+            return [], 0
+
+    @staticmethod
+    def read_page(db, limit, token=None, backward=False, columns=None):
+        """Чтение страницы мест с пагинацией по ключу (aircraft_code, seat_no)"""
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = Seat.MAPPER.project(columns, Seat.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Получаем данные после (или до) ключа из токена
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"SELECT {mapper.select_list} FROM bookings.seats",
+                    Seat.PAGE_KEY, limit, token, backward
+                )
+
+                seats = mapper.map_rows(rows)
+
+                # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+                total = db.row_counts.count(Seat.TABLE)
+
+                return build_keyset_page(seats, rows, Seat.PAGE_KEY, total, has_next, has_prev,
+                                         db.row_counts.is_estimate(Seat.TABLE), mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении страницы мест: {e}")
+            return KeysetPage([], 0)
+
+
+# Отображение строк запросов на объекты Seat, общее для всех методов чтения
+Seat.MAPPER = RowMapper(Seat, Seat.COLUMNS)
+
+# Точечный поиск подготавливается на сервере один раз на соединение
+Seat.BY_PRIMARY_KEY = PreparedStatement(
+    'seat_by_primary_key',
+    f"SELECT {Seat.MAPPER.select_list} FROM bookings.seats "
+    f"WHERE aircraft_code = %s AND seat_no = %s"
+)
\ No newline at end of file
@@ -1,4 +1,38 @@
+from src.Models.pagination import KeysetPage, fetch_keyset_rows, build_keyset_page
+from src.Models.mapper import RowMapper
+from src.Models.streaming import iter_models
+from src.Models.database import DEFAULT_ITERSIZE
+from src.Models.bulk import bulk_insert, DEFAULT_CHUNK_SIZE, VALUES
+
+
 class TicketFlight:
+    TABLE = 'bookings.ticket_flights'
+
+    # Уникальный ключ сортировки для пагинации по ключу
+    PAGE_KEY = ('flight_id', 'ticket_no')
+
+    # Поля хранятся в слотах без словаря экземпляра
+    __slots__ = ('ticket_no', 'flight_id', 'fare_conditions', 'amount')
+
+    # Колонки выборки в порядке аргументов конструктора (см. MAPPER в конце модуля)
+    COLUMNS = __slots__
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.ticket_flights
+    (
+        ticket_no character(13) COLLATE pg_catalog."default" NOT NULL,
+        flight_id integer NOT NULL,
+        fare_conditions character varying(10) COLLATE pg_catalog."default" NOT NULL,
+        amount numeric(10,2) NOT NULL,
+        CONSTRAINT ticket_flights_pkey PRIMARY KEY (ticket_no, flight_id),
+        CONSTRAINT ticket_flights_amount_check CHECK (amount >= 0::numeric),
+        CONSTRAINT ticket_flights_fare_conditions_check CHECK (fare_conditions::text = ANY (
+            ARRAY['Economy'::character varying::text, 'Comfort'::character varying::text, 'Business'::character varying::text]
+        ))
+    );
+    """
+
     def __init__(self, ticket_no, flight_id, fare_conditions, amount):
         self.ticket_no = ticket_no
         self.flight_id = flight_id
@@ -13,21 +47,7 @@ class TicketFlight:
         """Создание таблицы ticket_flights"""
         try:
             cursor = db.get_cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS bookings.ticket_flights
-            (
-                ticket_no character(13) COLLATE pg_catalog."default" NOT NULL,
-                flight_id integer NOT NULL,
-                fare_conditions character varying(10) COLLATE pg_catalog."default" NOT NULL,
-                amount numeric(10,2) NOT NULL,
-                CONSTRAINT ticket_flights_pkey PRIMARY KEY (ticket_no, flight_id),
-                CONSTRAINT ticket_flights_amount_check CHECK (amount >= 0::numeric),
-                CONSTRAINT ticket_flights_fare_conditions_check CHECK (fare_conditions::text = ANY (
-                    ARRAY['Economy'::character varying::text, 'Comfort'::character varying::text, 'Business'::character varying::text]
-                ))
-            );
-            """
-            cursor.execute(create_table_query)
+            cursor.execute(TicketFlight.CREATE_TABLE_QUERY)
             db.connection.commit()
             print("Таблица ticket_flights создана или уже существует")
         except Exception as e:
@@ -53,6 +73,7 @@ class TicketFlight:
             """
             cursor.execute(insert_query, (ticket_no, flight_id, fare_conditions, amount))
             db.connection.commit()
+            db.table_changed(TicketFlight.TABLE)
             print(f"Билет {ticket_no} на рейс {flight_id} успешно создан")
             return True
         except Exception as e:
@@ -60,25 +81,48 @@ class TicketFlight:
             return False
 
     @staticmethod
-    def read_all(db):
+    def _prepare_bulk_row(record):
+        """Проверка записи пакета и преобразование в кортеж значений"""
+        valid_fare_conditions = ['Economy', 'Comfort', 'Business']
+        if record['fare_conditions'] not in valid_fare_conditions:
+            raise ValueError(f"неверный класс обслуживания. Допустимые значения: {', '.join(valid_fare_conditions)}")
+        if record['amount'] < 0:
+            raise ValueError("сумма не может быть отрицательной")
+        return (record['ticket_no'], record['flight_id'], record['fare_conditions'], record['amount'])
+
+    @staticmethod
+    def create_many(db, records, chunk_size=DEFAULT_CHUNK_SIZE, method=VALUES):
+        """Пакетное создание записей билетов на рейсы в одной транзакции
+
+        records - итерируемый набор словарей с ключами ticket_no, flight_id,
+        fare_conditions и amount.
+        Возвращает BulkResult с количеством вставленных записей и ошибками по строкам.
+        """
+        result = bulk_insert(
+            db, TicketFlight.TABLE,
+            ('ticket_no', 'flight_id', 'fare_conditions', 'amount'),
+            records, TicketFlight._prepare_bulk_row, chunk_size, method
+        )
+        if result.error:
+            print(f"Ошибка при пакетном создании билетов на рейсы: {result.error}")
+        else:
+            print(f"Пакетное создание билетов на рейсы: {result}")
+        return result
+
+    @staticmethod
+    def read_all(db, columns=None):
         """Чтение всех записей билетов на рейсы"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.ticket_flights 
+            # Проекция: выбираются только запрошенные колонки
+            mapper = TicketFlight.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {mapper.select_list} FROM bookings.ticket_flights 
                 ORDER BY flight_id, ticket_no
             """)
             results = cursor.fetchall()
 
-            ticket_flights = []
-            for row in results:
-                ticket_flight = TicketFlight(
-                    ticket_no=row['ticket_no'],
-                    flight_id=row['flight_id'],
-                    fare_conditions=row['fare_conditions'],
-                    amount=row['amount']
-                )
-                ticket_flights.append(ticket_flight)
+            ticket_flights = mapper.map_rows(results)
 
             return ticket_flights
         except Exception as e:
@@ -89,20 +133,15 @@ class TicketFlight:
     def read_by_ticket_and_flight(db, ticket_no, flight_id):
         """Чтение билета на рейс по номеру билета и рейсу"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.ticket_flights 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {TicketFlight.MAPPER.select_list} FROM bookings.ticket_flights 
                 WHERE ticket_no = %s AND flight_id = %s
             """, (ticket_no, flight_id))
             result = cursor.fetchone()
 
             if result:
-                return TicketFlight(
-                    ticket_no=result['ticket_no'],
-                    flight_id=result['flight_id'],
-                    fare_conditions=result['fare_conditions'],
-                    amount=result['amount']
-                )
+                return TicketFlight.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске билета на рейс: {e}")
@@ -112,23 +151,15 @@ class TicketFlight:
     def read_by_ticket(db, ticket_no):
         """Чтение всех рейсов для билета"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.ticket_flights 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {TicketFlight.MAPPER.select_list} FROM bookings.ticket_flights 
                 WHERE ticket_no = %s 
                 ORDER BY flight_id
             """, (ticket_no,))
             results = cursor.fetchall()
 
-            ticket_flights = []
-            for row in results:
-                ticket_flight = TicketFlight(
-                    ticket_no=row['ticket_no'],
-                    flight_id=row['flight_id'],
-                    fare_conditions=row['fare_conditions'],
-                    amount=row['amount']
-                )
-                ticket_flights.append(ticket_flight)
+            ticket_flights = TicketFlight.MAPPER.map_rows(results)
 
             return ticket_flights
         except Exception as e:
@@ -139,23 +170,15 @@ class TicketFlight:
     def read_by_flight(db, flight_id):
         """Чтение всех билетов на рейс"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.ticket_flights 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {TicketFlight.MAPPER.select_list} FROM bookings.ticket_flights 
                 WHERE flight_id = %s 
                 ORDER BY ticket_no
             """, (flight_id,))
             results = cursor.fetchall()
 
-            ticket_flights = []
-            for row in results:
-                ticket_flight = TicketFlight(
-                    ticket_no=row['ticket_no'],
-                    flight_id=row['flight_id'],
-                    fare_conditions=row['fare_conditions'],
-                    amount=row['amount']
-                )
-                ticket_flights.append(ticket_flight)
+            ticket_flights = TicketFlight.MAPPER.map_rows(results)
 
             return ticket_flights
         except Exception as e:
@@ -171,23 +194,15 @@ class TicketFlight:
                 print(f"Ошибка: неверный класс обслуживания. Допустимые значения: {', '.join(valid_fare_conditions)}")
                 return []
 
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.ticket_flights 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {TicketFlight.MAPPER.select_list} FROM bookings.ticket_flights 
                 WHERE fare_conditions = %s 
                 ORDER BY flight_id, ticket_no
             """, (fare_conditions,))
             results = cursor.fetchall()
 
-            ticket_flights = []
-            for row in results:
-                ticket_flight = TicketFlight(
-                    ticket_no=row['ticket_no'],
-                    flight_id=row['flight_id'],
-                    fare_conditions=row['fare_conditions'],
-                    amount=row['amount']
-                )
-                ticket_flights.append(ticket_flight)
+            ticket_flights = TicketFlight.MAPPER.map_rows(results)
 
             return ticket_flights
         except Exception as e:
@@ -212,6 +227,7 @@ class TicketFlight:
 
             cursor.execute(update_query, (fare_conditions, ticket_no, flight_id))
             db.connection.commit()
+            db.table_changed(TicketFlight.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Класс обслуживания для билета {ticket_no} на рейс {flight_id} обновлен: {fare_conditions}")
@@ -240,6 +256,7 @@ class TicketFlight:
 
             cursor.execute(update_query, (amount, ticket_no, flight_id))
             db.connection.commit()
+            db.table_changed(TicketFlight.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Стоимость для билета {ticket_no} на рейс {flight_id} обновлена: ${amount}")
@@ -262,6 +279,7 @@ class TicketFlight:
             """
             cursor.execute(delete_query, (ticket_no, flight_id))
             db.connection.commit()
+            db.table_changed(TicketFlight.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Билет {ticket_no} на рейс {flight_id} успешно удален")
@@ -329,34 +347,98 @@ class TicketFlight:
         return ['Economy', 'Comfort', 'Business']
 
     @staticmethod
-    def read_all_paginated(db, offset, limit):
+    def iter_all(db, itersize=DEFAULT_ITERSIZE, columns=None):
+        """Ленивый обход всех билетов на рейсы через серверный курсор"""
+        # Проекция: выбираются только запрошенные колонки
+        mapper = TicketFlight.MAPPER.project(columns)
+        return iter_models(db, f"""
+            SELECT {mapper.select_list} FROM bookings.ticket_flights 
+            ORDER BY flight_id, ticket_no
+        """, None, mapper.from_row, itersize, "Ошибка при чтении билетов на рейсы")
+
+    @staticmethod
+    def iter_by_ticket(db, ticket_no, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход рейсов билета"""
+        return iter_models(db, f"""
+            SELECT {TicketFlight.MAPPER.select_list} FROM bookings.ticket_flights 
+            WHERE ticket_no = %s 
+            ORDER BY flight_id
+        """, (ticket_no,), TicketFlight.MAPPER.from_row, itersize, "Ошибка при поиске рейсов по билету")
+
+    @staticmethod
+    def iter_by_flight(db, flight_id, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход билетов на рейс"""
+        return iter_models(db, f"""
+            SELECT {TicketFlight.MAPPER.select_list} FROM bookings.ticket_flights 
+            WHERE flight_id = %s 
+            ORDER BY ticket_no
+        """, (flight_id,), TicketFlight.MAPPER.from_row, itersize, "Ошибка при поиске билетов на рейс")
+
+    @staticmethod
+    def iter_by_fare_conditions(db, fare_conditions, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход билетов по классу обслуживания"""
+        valid_fare_conditions = ['Economy', 'Comfort', 'Business']
+        if fare_conditions not in valid_fare_conditions:
+            print(f"Ошибка: неверный класс обслуживания. Допустимые значения: {', '.join(valid_fare_conditions)}")
+            return iter(())
+
+        return iter_models(db, f"""
+            SELECT {TicketFlight.MAPPER.select_list} FROM bookings.ticket_flights 
+            WHERE fare_conditions = %s 
+            ORDER BY flight_id, ticket_no
+        """, (fare_conditions,), TicketFlight.MAPPER.from_row, itersize,
+            "Ошибка при поиске билетов по классу обслуживания")
+
+    @staticmethod
+    def read_all_paginated(db, offset, limit, columns=None):
         """Чтение записей билетов на рейсы с пагинацией"""
         try:
-            cursor = db.get_cursor()
+            # Проекция: выбираются только запрошенные колонки
+            mapper = TicketFlight.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
 
             # Получаем данные
-            cursor.execute("""
-                SELECT * FROM bookings.ticket_flights 
+            cursor.execute(f"""
+                SELECT {mapper.select_list} FROM bookings.ticket_flights 
                 ORDER BY flight_id, ticket_no
                 LIMIT %s OFFSET %s
             """, (limit, offset))
             results = cursor.fetchall()
 
-            ticket_flights = []
-            for row in results:
-                ticket_flight = TicketFlight(
-                    ticket_no=row['ticket_no'],
-                    flight_id=row['flight_id'],
-                    fare_conditions=row['fare_conditions'],
-                    amount=row['amount']
-                )
-                ticket_flights.append(ticket_flight)
+            ticket_flights = mapper.map_rows(results)
 
-            # Получаем общее количество
-            cursor.execute("SELECT COUNT(*) FROM bookings.ticket_flights")
-            total = cursor.fetchone()['count']
+            # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+            total = db.row_counts.count(TicketFlight.TABLE)
 
             return ticket_flights, total
         except Exception as e:
             print(f"Ошибка при чтении билетов на рейсы: {e}")
-            return [], 0
\ No newline at end of file
+            return [], 0
+
+    @staticmethod
+    def read_page(db, limit, token=None, backward=False, columns=None):
+        """Чтение страницы билетов на рейсы с пагинацией по ключу (flight_id, ticket_no)"""
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = TicketFlight.MAPPER.project(columns, TicketFlight.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Получаем данные после (или до) ключа из токена
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"SELECT {mapper.select_list} FROM bookings.ticket_flights",
+                    TicketFlight.PAGE_KEY, limit, token, backward
+                )
+
+                ticket_flights = mapper.map_rows(rows)
+
+                # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+                total = db.row_counts.count(TicketFlight.TABLE)
+
+                return build_keyset_page(ticket_flights, rows, TicketFlight.PAGE_KEY, total, has_next, has_prev,
+                                         db.row_counts.is_estimate(TicketFlight.TABLE), mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении страницы билетов на рейсы: {e}")
+            return KeysetPage([], 0)
+
+
+# Отображение строк запросов на объекты TicketFlight, общее для всех методов чтения
+TicketFlight.MAPPER = RowMapper(TicketFlight, TicketFlight.COLUMNS)
\ No newline at end of file
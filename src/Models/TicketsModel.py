@@ -1,7 +1,63 @@
-import json
+import weakref
+
+from src.Models.pagination import KeysetPage, fetch_keyset_rows, build_keyset_page
+from src.Models.mapper import Column, RowMapper
+from src.Models.prepared import PreparedStatement
+from src.Models.json_fields import to_json, json_column
+from src.Models.streaming import iter_models
+from src.Models.database import DEFAULT_ITERSIZE
+from src.Models.bulk import bulk_insert, DEFAULT_CHUNK_SIZE, VALUES
+
+# Есть ли триграммный индекс по имени пассажира - по базам (проверяется один раз, см. Ticket.has_trigram_index)
+_trigram_index = weakref.WeakKeyDictionary()
 
 
 class Ticket:
+    TABLE = 'bookings.tickets'
+
+    # Уникальный ключ сортировки для пагинации по ключу
+    PAGE_KEY = ('book_ref', 'ticket_no')
+
+    # Ключ сортировки результатов поиска по имени: сначала самые похожие
+    SEARCH_KEY = ('distance', 'ticket_no')
+    # Поиск ранжирует и показывает не больше этого количества самых похожих билетов
+    # (при достижении предела количество показывается как оценка)
+    SEARCH_COUNT_LIMIT = 1000
+
+    # Поля хранятся в слотах без словаря экземпляра
+    __slots__ = ('ticket_no', 'book_ref', 'passenger_id', 'passenger_name', 'contact_data')
+
+    # Колонки выборки в порядке аргументов конструктора (см. MAPPER в конце модуля)
+    COLUMNS = (
+        'ticket_no',
+        'book_ref',
+        'passenger_id',
+        'passenger_name',
+        json_column('contact_data'),
+    )
+
+    # Колонки списка в представлении: контакты приходят усеченным текстом, а не целым JSONB
+    SUMMARY_COLUMNS = (
+        'ticket_no',
+        'book_ref',
+        'passenger_id',
+        'passenger_name',
+        Column('contact_data', "left(contact_data::text, 200)"),
+    )
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.tickets
+    (
+        ticket_no character(13) COLLATE pg_catalog."default" NOT NULL,
+        book_ref character(6) COLLATE pg_catalog."default" NOT NULL,
+        passenger_id character varying(20) COLLATE pg_catalog."default" NOT NULL,
+        passenger_name text COLLATE pg_catalog."default" NOT NULL,
+        contact_data jsonb,
+        CONSTRAINT tickets_pkey PRIMARY KEY (ticket_no)
+    );
+    """
+
     def __init__(self, ticket_no, book_ref, passenger_id, passenger_name, contact_data=None):
         self.ticket_no = ticket_no
         self.book_ref = book_ref
@@ -10,7 +66,7 @@ class Ticket:
         self.contact_data = contact_data
 
     def __str__(self):
-        contact_info = json.dumps(self.contact_data, ensure_ascii=False) if self.contact_data else "Нет данных"
+        contact_info = to_json(self.contact_data) if self.contact_data else "Нет данных"
         return f"Ticket {self.ticket_no}: {self.passenger_name} (Booking: {self.book_ref})"
 
     @staticmethod
@@ -18,18 +74,7 @@ class Ticket:
         """Создание таблицы tickets"""
         try:
             cursor = db.get_cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS bookings.tickets
-            (
-                ticket_no character(13) COLLATE pg_catalog."default" NOT NULL,
-                book_ref character(6) COLLATE pg_catalog."default" NOT NULL,
-                passenger_id character varying(20) COLLATE pg_catalog."default" NOT NULL,
-                passenger_name text COLLATE pg_catalog."default" NOT NULL,
-                contact_data jsonb,
-                CONSTRAINT tickets_pkey PRIMARY KEY (ticket_no)
-            );
-            """
-            cursor.execute(create_table_query)
+            cursor.execute(Ticket.CREATE_TABLE_QUERY)
             db.connection.commit()
             print("Таблица tickets создана или уже существует")
         except Exception as e:
@@ -57,9 +102,10 @@ class Ticket:
                 book_ref,
                 passenger_id,
                 passenger_name,
-                json.dumps(contact_data) if contact_data else None
+                to_json(contact_data) if contact_data else None
             ))
             db.connection.commit()
+            db.table_changed(Ticket.TABLE)
             print(f"Билет {ticket_no} для пассажира {passenger_name} успешно создан")
             return True
         except Exception as e:
@@ -67,26 +113,54 @@ class Ticket:
             return False
 
     @staticmethod
-    def read_all(db):
+    def _prepare_bulk_row(record):
+        """Проверка записи пакета и преобразование в кортеж значений"""
+        if len(record['ticket_no']) != 13:
+            raise ValueError("номер билета должен содержать 13 символов")
+        if len(record['book_ref']) != 6:
+            raise ValueError("номер бронирования должен содержать 6 символов")
+        contact_data = record.get('contact_data')
+        return (
+            record['ticket_no'],
+            record['book_ref'],
+            record['passenger_id'],
+            record['passenger_name'],
+            to_json(contact_data) if contact_data else None
+        )
+
+    @staticmethod
+    def create_many(db, records, chunk_size=DEFAULT_CHUNK_SIZE, method=VALUES):
+        """Пакетное создание билетов в одной транзакции
+
+        records - итерируемый набор словарей с ключами ticket_no, book_ref,
+        passenger_id, passenger_name и необязательным contact_data.
+        Возвращает BulkResult с количеством вставленных записей и ошибками по строкам.
+        """
+        result = bulk_insert(
+            db, Ticket.TABLE,
+            ('ticket_no', 'book_ref', 'passenger_id', 'passenger_name', 'contact_data'),
+            records, Ticket._prepare_bulk_row, chunk_size, method
+        )
+        if result.error:
+            print(f"Ошибка при пакетном создании билетов: {result.error}")
+        else:
+            print(f"Пакетное создание билетов: {result}")
+        return result
+
+    @staticmethod
+    def read_all(db, columns=None):
         """Чтение всех билетов"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.tickets 
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Ticket.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {mapper.select_list} FROM bookings.tickets 
                 ORDER BY book_ref, ticket_no
             """)
             results = cursor.fetchall()
 
-            tickets = []
-            for row in results:
-                ticket = Ticket(
-                    ticket_no=row['ticket_no'],
-                    book_ref=row['book_ref'],
-                    passenger_id=row['passenger_id'],
-                    passenger_name=row['passenger_name'],
-                    contact_data=row['contact_data']
-                )
-                tickets.append(ticket)
+            tickets = mapper.map_rows(results)
 
             return tickets
         except Exception as e:
@@ -97,18 +171,12 @@ class Ticket:
     def read_by_ticket_no(db, ticket_no):
         """Чтение билета по номеру"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("SELECT * FROM bookings.tickets WHERE ticket_no = %s", (ticket_no,))
+            cursor = db.get_cursor(tuple_rows=True)
+            db.execute_prepared(cursor, Ticket.BY_TICKET_NO, (ticket_no,))
             result = cursor.fetchone()
 
             if result:
-                return Ticket(
-                    ticket_no=result['ticket_no'],
-                    book_ref=result['book_ref'],
-                    passenger_id=result['passenger_id'],
-                    passenger_name=result['passenger_name'],
-                    contact_data=result['contact_data']
-                )
+                return Ticket.MAPPER.from_row(result)
             return None
         except Exception as e:
             print(f"Ошибка при поиске билета: {e}")
@@ -118,24 +186,15 @@ class Ticket:
     def read_by_booking(db, book_ref):
         """Чтение всех билетов по бронированию"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.tickets 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Ticket.MAPPER.select_list} FROM bookings.tickets 
                 WHERE book_ref = %s 
                 ORDER BY ticket_no
             """, (book_ref,))
             results = cursor.fetchall()
 
-            tickets = []
-            for row in results:
-                ticket = Ticket(
-                    ticket_no=row['ticket_no'],
-                    book_ref=row['book_ref'],
-                    passenger_id=row['passenger_id'],
-                    passenger_name=row['passenger_name'],
-                    contact_data=row['contact_data']
-                )
-                tickets.append(ticket)
+            tickets = Ticket.MAPPER.map_rows(results)
 
             return tickets
         except Exception as e:
@@ -146,24 +205,15 @@ class Ticket:
     def read_by_passenger_id(db, passenger_id):
         """Чтение билетов по ID пассажира"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.tickets 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Ticket.MAPPER.select_list} FROM bookings.tickets 
                 WHERE passenger_id = %s 
                 ORDER BY book_ref DESC
             """, (passenger_id,))
             results = cursor.fetchall()
 
-            tickets = []
-            for row in results:
-                ticket = Ticket(
-                    ticket_no=row['ticket_no'],
-                    book_ref=row['book_ref'],
-                    passenger_id=row['passenger_id'],
-                    passenger_name=row['passenger_name'],
-                    contact_data=row['contact_data']
-                )
-                tickets.append(ticket)
+            tickets = Ticket.MAPPER.map_rows(results)
 
             return tickets
         except Exception as e:
@@ -174,30 +224,96 @@ class Ticket:
     def search_by_passenger_name(db, passenger_name):
         """Поиск билетов по имени пассажира"""
         try:
-            cursor = db.get_cursor()
-            cursor.execute("""
-                SELECT * FROM bookings.tickets 
+            cursor = db.get_cursor(tuple_rows=True)
+            cursor.execute(f"""
+                SELECT {Ticket.MAPPER.select_list} FROM bookings.tickets 
                 WHERE passenger_name ILIKE %s 
                 ORDER BY passenger_name, book_ref DESC
             """, (f'%{passenger_name}%',))
             results = cursor.fetchall()
 
-            tickets = []
-            for row in results:
-                ticket = Ticket(
-                    ticket_no=row['ticket_no'],
-                    book_ref=row['book_ref'],
-                    passenger_id=row['passenger_id'],
-                    passenger_name=row['passenger_name'],
-                    contact_data=row['contact_data']
-                )
-                tickets.append(ticket)
+            tickets = Ticket.MAPPER.map_rows(results)
 
             return tickets
         except Exception as e:
             print(f"Ошибка при поиске билетов по имени пассажира: {e}")
             return []
 
+    @staticmethod
+    def has_trigram_index(db):
+        """Есть ли триграммный индекс по имени пассажира (проверяется один раз)
+
+        Индекс создает миграция схемы 7, если на сервере доступно расширение pg_trgm.
+        """
+        if db not in _trigram_index:
+            with db.get_cursor(tuple_rows=True) as cursor:
+                cursor.execute("SELECT to_regclass('bookings.tickets_passenger_name_trgm_gist_idx') IS NOT NULL")
+                _trigram_index[db] = cursor.fetchone()[0]
+        return _trigram_index[db]
+
+    @staticmethod
+    def search_page_by_passenger_name(db, passenger_name, limit, token=None, backward=False, columns=None):
+        """Поиск билетов по имени пассажира: страница результатов по убыванию сходства
+
+        Условие и расстояние - похожесть слов из pg_trgm (<% и <<->). GiST-индекс
+        tickets_passenger_name_trgm_gist_idx выдает строки сразу в порядке расстояния,
+        поэтому читаются только SEARCH_COUNT_LIMIT самых похожих билетов, а не все
+        совпадения: страницы листаются внутри этого набора, и дальше предела поиск
+        не показывает (нужно уточнить имя).
+        Без индекса (расширение pg_trgm недоступно) - поиск подстроки через ILIKE,
+        сначала имена, начинающиеся с запроса; набор ограничен так же.
+        Пагинация по ключу (расстояние, номер билета).
+        """
+        passenger_name = passenger_name.strip()
+        if not passenger_name:
+            return KeysetPage([], 0)
+        try:
+            if Ticket.has_trigram_index(db):
+                distance = "(%s <<-> passenger_name)::float8"
+                condition = "%s <%% passenger_name"
+                # Колонка слева от оператора (<->> - перестановка <<->): порядок выдает индекс
+                order = "passenger_name <->> %s"
+                params = (passenger_name, passenger_name, passenger_name)
+            else:
+                distance = "(CASE WHEN passenger_name ILIKE %s THEN 0 ELSE 1 END)::float8"
+                condition = "passenger_name ILIKE %s"
+                order = "distance, ticket_no"
+                params = (f'{passenger_name}%', f'%{passenger_name}%')
+            condition_param = params[1]
+
+            # Проекция: выбираются только запрошенные колонки (номер билета - всегда)
+            mapper = Ticket.MAPPER.project(columns, ('ticket_no',))
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Расстояние приводится к float8, чтобы значение в токене точно совпадало с вычисленным
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"""
+                    SELECT {mapper.select_list}, distance FROM (
+                        SELECT *, {distance} AS distance
+                        FROM bookings.tickets
+                        WHERE {condition}
+                        ORDER BY {order}
+                        LIMIT %s
+                    ) ranked""",
+                    Ticket.SEARCH_KEY, limit, token, backward, params=params + (Ticket.SEARCH_COUNT_LIMIT,)
+                )
+
+                tickets = mapper.map_rows(rows)
+
+                # Количество найденных билетов, не больше SEARCH_COUNT_LIMIT
+                cursor.execute(f"""
+                    SELECT count(*) FROM (
+                        SELECT 1 FROM bookings.tickets WHERE {condition} LIMIT %s
+                    ) found
+                """, (condition_param, Ticket.SEARCH_COUNT_LIMIT))
+                total = cursor.fetchone()[0]
+
+                column_index = dict(mapper.index, distance=len(mapper.names))
+                return build_keyset_page(tickets, rows, Ticket.SEARCH_KEY, total, has_next, has_prev,
+                                         total >= Ticket.SEARCH_COUNT_LIMIT, column_index)
+        except Exception as e:
+            print(f"Ошибка при поиске билетов по имени пассажира: {e}")
+            return KeysetPage([], 0)
+
     @staticmethod
     def update_passenger_info(db, ticket_no, passenger_name=None, passenger_id=None, contact_data=None):
         """Обновление информации о пассажире"""
@@ -216,7 +332,7 @@ class Ticket:
 
             if contact_data is not None:
                 update_fields.append("contact_data = %s")
-                params.append(json.dumps(contact_data))
+                params.append(to_json(contact_data))
 
             if not update_fields:
                 print("Нет данных для обновления")
@@ -231,6 +347,7 @@ class Ticket:
 
             cursor.execute(update_query, params)
             db.connection.commit()
+            db.table_changed(Ticket.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Информация о пассажире для билета {ticket_no} обновлена")
@@ -255,6 +372,7 @@ class Ticket:
 
             cursor.execute(update_query, (book_ref, ticket_no))
             db.connection.commit()
+            db.table_changed(Ticket.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Номер бронирования для билета {ticket_no} обновлен: {book_ref}")
@@ -274,6 +392,7 @@ class Ticket:
             delete_query = "DELETE FROM bookings.tickets WHERE ticket_no = %s"
             cursor.execute(delete_query, (ticket_no,))
             db.connection.commit()
+            db.table_changed(Ticket.TABLE)
 
             if cursor.rowcount > 0:
                 print(f"Билет {ticket_no} успешно удален")
@@ -293,6 +412,7 @@ class Ticket:
             delete_query = "DELETE FROM bookings.tickets WHERE book_ref = %s"
             cursor.execute(delete_query, (book_ref,))
             db.connection.commit()
+            db.table_changed(Ticket.TABLE)
 
             print(f"Все билеты для бронирования {book_ref} удалены")
             return True
@@ -345,33 +465,62 @@ class Ticket:
             return []
 
     @staticmethod
-    def read_all_paginated(db, offset, limit):
+    def iter_all(db, itersize=DEFAULT_ITERSIZE, columns=None):
+        """Ленивый обход всех билетов через серверный курсор"""
+        # Проекция: выбираются только запрошенные колонки
+        mapper = Ticket.MAPPER.project(columns)
+        return iter_models(db, f"""
+            SELECT {mapper.select_list} FROM bookings.tickets 
+            ORDER BY book_ref, ticket_no
+        """, None, mapper.from_row, itersize, "Ошибка при чтении билетов")
+
+    @staticmethod
+    def iter_by_booking(db, book_ref, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход билетов бронирования"""
+        return iter_models(db, f"""
+            SELECT {Ticket.MAPPER.select_list} FROM bookings.tickets 
+            WHERE book_ref = %s 
+            ORDER BY ticket_no
+        """, (book_ref,), Ticket.MAPPER.from_row, itersize, "Ошибка при поиске билетов по бронированию")
+
+    @staticmethod
+    def iter_by_passenger_id(db, passenger_id, itersize=DEFAULT_ITERSIZE):
+        """Ленивый обход билетов пассажира"""
+        return iter_models(db, f"""
+            SELECT {Ticket.MAPPER.select_list} FROM bookings.tickets 
+            WHERE passenger_id = %s 
+            ORDER BY book_ref DESC
+        """, (passenger_id,), Ticket.MAPPER.from_row, itersize, "Ошибка при поиске билетов по ID пассажира")
+
+    @staticmethod
+    def iter_search_by_passenger_name(db, passenger_name, itersize=DEFAULT_ITERSIZE):
+        """Ленивый поиск билетов по имени пассажира"""
+        return iter_models(db, f"""
+            SELECT {Ticket.MAPPER.select_list} FROM bookings.tickets 
+            WHERE passenger_name ILIKE %s 
+            ORDER BY passenger_name, book_ref DESC
+        """, (f'%{passenger_name}%',), Ticket.MAPPER.from_row, itersize, "Ошибка при поиске билетов по имени")
+
+    @staticmethod
+    def read_all_paginated(db, offset, limit, columns=None):
         """Чтение билетов с пагинацией"""
         try:
-            cursor = db.get_cursor()
+            # Проекция: выбираются только запрошенные колонки
+            mapper = Ticket.MAPPER.project(columns)
+            cursor = db.get_cursor(tuple_rows=True)
 
             # Получаем данные с пагинацией
-            cursor.execute("""
-                SELECT * FROM bookings.tickets 
+            cursor.execute(f"""
+                SELECT {mapper.select_list} FROM bookings.tickets 
                 ORDER BY book_ref, ticket_no
                 LIMIT %s OFFSET %s
             """, (limit, offset))
             results = cursor.fetchall()
 
-            tickets = []
-            for row in results:
-                ticket = Ticket(
-                    ticket_no=row['ticket_no'],
-                    book_ref=row['book_ref'],
-                    passenger_id=row['passenger_id'],
-                    passenger_name=row['passenger_name'],
-                    contact_data=row['contact_data']
-                )
-                tickets.append(ticket)
+            tickets = mapper.map_rows(results)
 
-            # Получаем общее количество
-            cursor.execute("SELECT COUNT(*) FROM bookings.tickets")
-            total = cursor.fetchone()['count']
+            # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+            total = db.row_counts.count(Ticket.TABLE)
 
             return {
                 'tickets': tickets,
@@ -382,4 +531,38 @@ class Ticket:
             return {
                 'tickets': [],
                 'total_count': 0
-            }
\ No newline at end of file
+            }
+
+    @staticmethod
+    def read_page(db, limit, token=None, backward=False, columns=None):
+        """Чтение страницы билетов с пагинацией по ключу (book_ref, ticket_no)"""
+        try:
+            # Проекция: выбираются только запрошенные колонки (ключ сортировки - всегда)
+            mapper = Ticket.MAPPER.project(columns, Ticket.PAGE_KEY)
+            with db.get_cursor(tuple_rows=True) as cursor:
+                # Получаем данные после (или до) ключа из токена
+                rows, has_next, has_prev = fetch_keyset_rows(
+                    cursor, f"SELECT {mapper.select_list} FROM bookings.tickets",
+                    Ticket.PAGE_KEY, limit, token, backward
+                )
+
+                tickets = mapper.map_rows(rows)
+
+                # Получаем общее количество (точное, кэшированное или оценку - по режиму таблицы)
+                total = db.row_counts.count(Ticket.TABLE)
+
+                return build_keyset_page(tickets, rows, Ticket.PAGE_KEY, total, has_next, has_prev,
+                                         db.row_counts.is_estimate(Ticket.TABLE), mapper.index)
+        except Exception as e:
+            print(f"Ошибка при чтении страницы билетов: {e}")
+            return KeysetPage([], 0)
+
+
+# Отображение строк запросов на объекты Ticket, общее для всех методов чтения
+Ticket.MAPPER = RowMapper(Ticket, Ticket.COLUMNS)
+
+# Точечный поиск подготавливается на сервере один раз на соединение
+Ticket.BY_TICKET_NO = PreparedStatement(
+    'ticket_by_ticket_no',
+    f"SELECT {Ticket.MAPPER.select_list} FROM bookings.tickets WHERE ticket_no = %s"
+)
\ No newline at end of file
@@ -0,0 +1,128 @@
+import threading
+
+# Номеров, резервируемых за одно обращение к счетчику (1 - номера без пропусков)
+DEFAULT_BLOCK_SIZE = 1
+
+
+class BoardingNumberAllocator:
+    """Выдача номеров посадки без гонок между стойками регистрации
+
+    Следующий номер рейса хранится в строке bookings.boarding_counters и
+    увеличивается одним UPDATE ... RETURNING: блокировка строки упорядочивает
+    параллельные обращения, поэтому два клиента не получат один номер.
+    Строка счетчика создается при первом обращении по MAX(boarding_no) рейса.
+
+    block_size > 1 - номера резервируются блоками и выдаются из памяти процесса
+    (меньше обращений к базе при массовой регистрации); номера блока, не
+    выданные до завершения процесса, остаются пропусками в нумерации.
+    Внутри db.transaction() строка счетчика остается заблокированной до конца
+    транзакции, а из базы резервируются только запрошенные номера: блок,
+    зарезервированный в транзакции, стал бы общим для всех потоков до ее
+    фиксации и при откате пересекся бы с номерами, выданными после него.
+    В памяти хранятся только блоки из зафиксированных резервирований.
+    """
+
+    TABLE = 'bookings.boarding_counters'
+
+    # DDL таблицы (применяется менеджером схемы, см. src/Models/schema.py)
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS bookings.boarding_counters
+    (
+        flight_id integer NOT NULL,
+        next_boarding_no integer NOT NULL,
+        CONSTRAINT boarding_counters_pkey PRIMARY KEY (flight_id),
+        CONSTRAINT boarding_counters_flight_id_fkey FOREIGN KEY (flight_id)
+            REFERENCES bookings.flights (flight_id) ON DELETE CASCADE
+    );
+    """
+
+    def __init__(self, db, block_size=DEFAULT_BLOCK_SIZE):
+        self.db = db
+        self.block_size = block_size
+        self._blocks = {}  # ID рейса -> [следующий номер, конец блока) из зарезервированных
+        self._lock = threading.Lock()
+
+    def allocate(self, flight_id):
+        """Следующий номер посадки рейса"""
+        return self.allocate_many(flight_id, 1)[0]
+
+    def allocate_many(self, flight_id, count):
+        """Список из count номеров посадки рейса (из блока в памяти и при необходимости из базы)"""
+        numbers = []
+        with self._lock:
+            block = self._blocks.get(flight_id)
+            if block is not None:
+                taken = min(count, block[1] - block[0])
+                numbers.extend(range(block[0], block[0] + taken))
+                block[0] += taken
+                if block[0] >= block[1]:
+                    del self._blocks[flight_id]
+
+        missing = count - len(numbers)
+        if missing:
+            # Недостающие номера и остаток блока резервируются одним обращением
+            # (в транзакции - без остатка: резервирование может быть откачено)
+            reserve = missing if self.db.in_transaction() else max(missing, self.block_size)
+            first = self._reserve(flight_id, reserve)
+            numbers.extend(range(first, first + missing))
+            if reserve > missing:
+                with self._lock:
+                    self._blocks[flight_id] = [first + missing, first + reserve]
+        return numbers
+
+    def resync(self, flight_ids):
+        """Сдвиг счетчиков за номера, вставленные в обход распределителя (например, пакетно)"""
+        flight_ids = list(flight_ids)
+        if not flight_ids:
+            return
+        cursor = self.db.get_cursor()
+        try:
+            cursor.execute("""
+                UPDATE bookings.boarding_counters c
+                SET next_boarding_no = GREATEST(c.next_boarding_no, used.max_boarding_no + 1)
+                FROM (
+                    SELECT flight_id, MAX(boarding_no) AS max_boarding_no
+                    FROM bookings.boarding_passes
+                    WHERE flight_id = ANY(%s)
+                    GROUP BY flight_id
+                ) used
+                WHERE c.flight_id = used.flight_id
+            """, (flight_ids,))
+        finally:
+            cursor.close()
+
+    def forget(self, flight_id=None):
+        """Отказ от номеров, зарезервированных в памяти (рейса или всех рейсов)"""
+        with self._lock:
+            if flight_id is None:
+                self._blocks.clear()
+            else:
+                self._blocks.pop(flight_id, None)
+
+    def _reserve(self, flight_id, count):
+        """Резервирование count номеров подряд; возвращает первый из них"""
+        cursor = self.db.get_cursor()
+        try:
+            for _ in range(2):
+                cursor.execute("""
+                    UPDATE bookings.boarding_counters
+                    SET next_boarding_no = next_boarding_no + %s
+                    WHERE flight_id = %s
+                    RETURNING next_boarding_no - %s AS first_boarding_no
+                """, (count, flight_id, count))
+                row = cursor.fetchone()
+                if row is not None:
+                    return row['first_boarding_no']
+
+                # Первое обращение к рейсу: счетчик продолжает уже выданные номера.
+                # При одновременном создании строки другим клиентом вставка пропускается
+                cursor.execute("""
+                    INSERT INTO bookings.boarding_counters (flight_id, next_boarding_no)
+                    SELECT %s, COALESCE(MAX(boarding_no), 0) + 1
+                    FROM bookings.boarding_passes
+                    WHERE flight_id = %s
+                    ON CONFLICT (flight_id) DO NOTHING
+                """, (flight_id, flight_id))
+            raise RuntimeError(f"Не удалось создать счетчик номеров посадки рейса {flight_id}")
+        finally:
+            cursor.close()
\ No newline at end of file
@@ -0,0 +1,137 @@
+import io
+
+from psycopg2.extras import execute_values
+
+DEFAULT_CHUNK_SIZE = 1000
+
+VALUES = 'values'
+COPY = 'copy'
+METHODS = (VALUES, COPY)
+
+
+class BulkRowError:
+    """Ошибка загрузки одной записи пакета"""
+
+    def __init__(self, index, record, message):
+        self.index = index  # Порядковый номер записи во входных данных
+        self.record = record
+        self.message = message
+
+    def __str__(self):
+        return f"Запись {self.index}: {self.message}"
+
+
+class BulkResult:
+    """Итог пакетной загрузки"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.errors = []
+        self.error = None  # Ошибка, из-за которой откатана вся загрузка
+
+    @property
+    def ok(self):
+        return self.error is None and not self.errors
+
+    def __str__(self):
+        if self.error:
+            return f"Загрузка отменена: {self.error}"
+        return f"Загружено записей: {self.inserted}, с ошибками: {len(self.errors)}"
+
+
+def _chunks(records, chunk_size):
+    chunk = []
+    for index, record in enumerate(records):
+        chunk.append((index, record))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy_value(value):
+    """Значение в текстовом формате COPY"""
+    if value is None:
+        return '\\N'
+    text = str(value)
+    return (text.replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def _insert_values(cursor, table, columns, rows):
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+    execute_values(cursor, query, rows, page_size=len(rows))
+
+
+def _insert_copy(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def _insert_row(cursor, table, columns, row):
+    placeholders = ', '.join(['%s'] * len(columns))
+    cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", row)
+
+
+def bulk_insert(db, table, columns, records, prepare, chunk_size=DEFAULT_CHUNK_SIZE, method=VALUES):
+    """Пакетная вставка записей в одной транзакции
+
+    prepare(record) возвращает кортеж значений в порядке columns или
+    выбрасывает ValueError - такая запись попадает в отчет об ошибках.
+    Каждая порция вставляется одним запросом (execute_values или COPY FROM STDIN)
+    под точкой сохранения; если порция отклонена базой, ее записи вставляются
+    по одной, чтобы найти ошибочные, а остальные сохранить.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный способ загрузки: {method}")
+    if chunk_size < 1:
+        raise ValueError("Размер порции должен быть положительным")
+
+    insert_chunk = _insert_copy if method == COPY else _insert_values
+    result = BulkResult()
+
+    try:
+        with db.transaction(), db.get_cursor() as cursor:
+            for chunk in _chunks(records, chunk_size):
+                prepared = []
+                for index, record in chunk:
+                    try:
+                        prepared.append((index, record, prepare(record)))
+                    except (ValueError, TypeError, KeyError) as e:
+                        result.errors.append(BulkRowError(index, record, str(e)))
+                if not prepared:
+                    continue
+
+                cursor.execute("SAVEPOINT bulk_chunk")
+                try:
+                    insert_chunk(cursor, table, columns, [row for _, _, row in prepared])
+                    cursor.execute("RELEASE SAVEPOINT bulk_chunk")
+                    result.inserted += len(prepared)
+                    continue
+                except Exception:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_chunk")
+
+                # Порция отклонена: повторяем по одной записи
+                cursor.execute("RELEASE SAVEPOINT bulk_chunk")
+                for index, record, row in prepared:
+                    cursor.execute("SAVEPOINT bulk_row")
+                    try:
+                        _insert_row(cursor, table, columns, row)
+                        result.inserted += 1
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                        result.errors.append(BulkRowError(index, record, str(e).strip()))
+                    cursor.execute("RELEASE SAVEPOINT bulk_row")
+    except Exception as e:
+        result.inserted = 0
+        result.error = str(e).strip()
+        return result
+
+    if result.inserted:
+        db.table_changed(table)
+    return result
\ No newline at end of file
@@ -1,9 +1,85 @@
+import itertools
+import threading
+from contextlib import contextmanager
+
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from src.Models.boarding_numbers import BoardingNumberAllocator
+from src.Models.instrumentation import DEFAULT_SLOW_THRESHOLD_MS, InstrumentedCursor, QueryStats
+from src.Models.pool import ConnectionPool
+from src.Models.prepared import PreparedStatementCache
+from src.Models.reference_cache import ReferenceCache
+from src.Models.row_counts import RowCountProvider
+from src.Models.seat_map import SeatMapCache
+
+# Размер порции, запрашиваемой серверным курсором за один раз
+DEFAULT_ITERSIZE = 2000
+
+# Имена серверных курсоров должны быть уникальны в пределах соединения
+_stream_names = itertools.count(1)
+
+
+class _ConnectionLease:
+    """Соединение пула, выданное одному потоку, и число его незакрытых курсоров и транзакций"""
+
+    __slots__ = ('owner', 'connection', 'depth')
+
+    def __init__(self, owner, connection):
+        self.owner = owner  # Поток, получивший соединение
+        self.connection = connection
+        self.depth = 0
+
+
+class _PooledCursor:
+    """Курсор, возвращающий соединение в пул при закрытии
+
+    Курсор помнит выдачу соединения (_ConnectionLease) и освобождает именно ее,
+    поэтому закрытие в другом потоке (например, курсора, удерживаемого трассировкой
+    исключения, переданной в главный поток) не затрагивает соединения этого потока.
+    Незакрытый курсор освобождается при удалении - это страховка, а не основной путь:
+    курсоры лучше закрывать явно (close() или with).
+    """
+
+    def __init__(self, cursor, db, lease):
+        self._cursor = cursor
+        self._db = db
+        self._lease = lease
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        try:
+            self._cursor.close()
+        finally:
+            self._db._release_lease(self._lease)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
 
 class PostgreSQLDatabase:
-    def __init__(self, database, user, password, host, port):
+    def __init__(self, database, user, password, host, port,
+                 pool_min_size=None, pool_max_size=None, pool_timeout=30.0,
+                 pool_max_idle=300.0, pool_health_check_interval=30.0,
+                 instrument=True, slow_query_ms=DEFAULT_SLOW_THRESHOLD_MS, prepare_statements=True):
         self.database = database
         self.user = user
         self.password = password
@@ -11,31 +87,232 @@ class PostgreSQLDatabase:
         self.port = port
         self.connection = None
 
+        # Пул включается заданием pool_max_size, иначе используется одно общее соединение
+        self.pool_min_size = pool_min_size if pool_min_size is not None else 1
+        self.pool_max_size = pool_max_size
+        self.pool_timeout = pool_timeout
+        self.pool_max_idle = pool_max_idle
+        self.pool_health_check_interval = pool_health_check_interval
+        self.pool = None
+        self._local = threading.local()
+        # Выданные соединения пула по потокам-владельцам (поток -> _ConnectionLease)
+        self._leases = {}
+        self._leases_lock = threading.Lock()
+
+        # Подписчики на изменения таблиц через модели (кэши, счетчики строк)
+        self._change_listeners = []
+        self.row_counts = RowCountProvider(self)
+        self.add_change_listener(self.row_counts.invalidate)
+        self.reference_cache = ReferenceCache(self)
+        # Карты мест рейсов: проверка и поиск свободных мест без запросов к базе
+        self.seat_maps = SeatMapCache(self)
+        # Номера посадки выдаются атомарно через счетчик рейса в базе
+        self.boarding_numbers = BoardingNumberAllocator(self)
+
+        # Время, строки и объем результата запросов по методам моделей
+        self.query_stats = QueryStats(enabled=instrument, slow_threshold_ms=slow_query_ms)
+        # Частые точечные запросы моделей подготавливаются на каждом соединении один раз
+        # (отключается, например, при работе через pgbouncer в режиме транзакций)
+        self.prepared_statements = PreparedStatementCache(enabled=prepare_statements)
+
+    @property
+    def pooled(self):
+        """Работает ли база в режиме пула соединений"""
+        return self.pool_max_size is not None
+
+    @property
+    def connection(self):
+        """Текущее соединение: общее либо выданное из пула текущему потоку"""
+        if self.pooled:
+            with self._leases_lock:
+                lease = self._leases.get(threading.current_thread())
+            return lease.connection if lease is not None else None
+        return self._connection
+
+    @connection.setter
+    def connection(self, value):
+        self._connection = value
+
+    def _create_connection(self):
+        """Открытие нового соединения с базой данных"""
+        connection = psycopg2.connect(
+            database=self.database,
+            user=self.user,
+            password=self.password,
+            host=self.host,
+            port=self.port
+        )
+        connection.autocommit = True
+        return connection
+
     def connect(self):
         """Установка соединения с базой данных"""
         try:
-            self.connection = psycopg2.connect(
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                host=self.host,
-                port=self.port
-            )
-            self.connection.autocommit = True
+            if self.pooled:
+                self.pool = ConnectionPool(
+                    self._create_connection,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    timeout=self.pool_timeout,
+                    max_idle=self.pool_max_idle,
+                    health_check_interval=self.pool_health_check_interval
+                )
+                self.pool.open()
+                print(f"Успешное подключение к базе данных "
+                      f"(пул соединений {self.pool_min_size}..{self.pool_max_size})")
+                return self.pool
+
+            self.connection = self._create_connection()
             print("Успешное подключение к базе данных")
             return self.connection
         except Exception as e:
             print(f"Ошибка подключения к базе данных: {e}")
+            if self.pool:
+                self.pool.close_all()
+                self.pool = None
             return None
 
     def disconnect(self):
         """Закрытие соединения с базой данных"""
-        if self.connection:
+        if self.pool:
+            self.pool.close_all()
+            print("Пул соединений с базой данных закрыт")
+        elif self.connection:
             self.connection.close()
             print("Соединение с базой данных закрыто")
 
-    def get_cursor(self):
-        """Получение курсора для выполнения запросов"""
+    def get_cursor(self, tuple_rows=False):
+        """Получение курсора для выполнения запросов
+
+        tuple_rows=True - строки возвращаются кортежами, без словаря на каждую строку.
+        """
+        cursor_factory = None if tuple_rows else RealDictCursor
+        if self.pool:
+            lease = self._acquire_lease()
+            try:
+                cursor = self._instrument(lease.connection.cursor(cursor_factory=cursor_factory))
+            except Exception:
+                self._release_lease(lease)
+                raise
+            return _PooledCursor(cursor, self, lease)
         if self.connection:
-            return self.connection.cursor(cursor_factory=RealDictCursor)
-        return None
\ No newline at end of file
+            return self._instrument(self.connection.cursor(cursor_factory=cursor_factory))
+        return None
+
+    def _instrument(self, cursor):
+        """Курсор с учетом запросов в query_stats (если сбор статистики включен)"""
+        if self.query_stats.enabled:
+            return InstrumentedCursor(cursor, self.query_stats)
+        return cursor
+
+    def execute_prepared(self, cursor, statement, params=()):
+        """Выполнение подготовленного запроса (PreparedStatement) курсором, полученным из get_cursor"""
+        self.prepared_statements.execute(cursor, statement, params)
+
+    @contextmanager
+    def transaction(self):
+        """Выполнение группы запросов в одной транзакции на одном соединении
+
+        Вложенные вызовы присоединяются к внешней транзакции. Внутри блока
+        нельзя вызывать методы моделей, фиксирующие изменения (commit).
+        """
+        lease = None
+        if self.pool:
+            lease = self._acquire_lease()
+            connection = lease.connection
+        else:
+            connection = self.connection
+
+        local = self._local
+        depth = getattr(local, 'transaction_depth', 0)
+        if depth == 0:
+            connection.autocommit = False
+        local.transaction_depth = depth + 1
+        try:
+            yield connection
+            if depth == 0:
+                connection.commit()
+        except BaseException:
+            if depth == 0:
+                connection.rollback()
+            raise
+        finally:
+            local.transaction_depth = depth
+            if depth == 0 and not connection.closed:
+                connection.autocommit = True
+            if lease is not None:
+                self._release_lease(lease)
+
+    def in_transaction(self):
+        """Выполняется ли текущий поток внутри блока transaction()"""
+        return getattr(self._local, 'transaction_depth', 0) > 0
+
+    def stream(self, query, params=None, itersize=DEFAULT_ITERSIZE, tuple_rows=False):
+        """Построчная выборка через серверный (именованный) курсор
+
+        Строки передаются с сервера порциями по itersize, поэтому расход памяти
+        не зависит от размера результата. Курсор и транзакция закрываются при
+        исчерпании генератора или досрочном выходе (break, close()).
+        """
+        cursor_factory = None if tuple_rows else RealDictCursor
+        with self.transaction() as connection:
+            cursor = connection.cursor(name=f"stream_{next(_stream_names)}", cursor_factory=cursor_factory)
+            cursor.itersize = itersize
+            cursor = self._instrument(cursor)
+            try:
+                cursor.execute(query, params)
+                for row in cursor:
+                    yield row
+            finally:
+                cursor.close()
+
+    def add_change_listener(self, callback):
+        """Подписка на изменения таблиц: callback(table) вызывается после записи"""
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        """Отписка от изменений таблиц"""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def table_changed(self, table):
+        """Уведомление подписчиков о записи в таблицу"""
+        for callback in list(self._change_listeners):
+            try:
+                callback(table)
+            except Exception as e:
+                print(f"Ошибка обработчика изменения таблицы {table}: {e}")
+
+    def get_pool_stats(self):
+        """Статистика ожидания и загрузки пула соединений"""
+        if self.pool:
+            return self.pool.stats()
+        return None
+
+    def _acquire_lease(self):
+        """Выдача соединения текущему потоку (повторные вызовы используют то же соединение)"""
+        owner = threading.current_thread()
+        with self._leases_lock:
+            lease = self._leases.get(owner)
+            if lease is not None:
+                lease.depth += 1
+                return lease
+        lease = _ConnectionLease(owner, self.pool.getconn())
+        lease.depth = 1
+        with self._leases_lock:
+            self._leases[owner] = lease
+        return lease
+
+    def _release_lease(self, lease):
+        """Возврат соединения в пул, когда закрыты все курсоры и транзакции выдачи
+
+        Освобождается выдача, переданная курсором, независимо от потока, в котором
+        выполняется закрытие.
+        """
+        with self._leases_lock:
+            lease.depth -= 1
+            if lease.depth > 0:
+                return
+            if self._leases.get(lease.owner) is lease:
+                del self._leases[lease.owner]
+        self.pool.putconn(lease.connection)
\ No newline at end of file
@@ -0,0 +1,223 @@
+import json
+import os
+from datetime import date, datetime, time
+
+from src.Models.AircraftModel import Aircraft
+from src.Models.AirportsDataModel import Airport
+from src.Models.BoardingPassesModel import BoardingPass
+from src.Models.BookingModel import Booking
+from src.Models.FlightsModel import Flight
+from src.Models.SeatsModel import Seat
+from src.Models.TicketFlightsModel import TicketFlight
+from src.Models.TicketsModel import Ticket
+from src.Models.database import DEFAULT_ITERSIZE
+from src.Models.json_fields import LazyJSON, lazy_json
+
+CSV = 'csv'
+JSONL = 'jsonl'
+FORMATS = (CSV, JSONL)
+
+# Как часто (в строках) вызывается обработчик прогресса
+PROGRESS_EVERY = 10000
+
+
+class ExportCancelled(Exception):
+    """Экспорт прерван пользователем"""
+    pass
+
+
+class ExportFilter:
+    """Условие отбора строк при экспорте (аналог метода read_by_*)"""
+
+    def __init__(self, name, label, condition, transform=None):
+        self.name = name
+        self.label = label
+        self.condition = condition  # SQL-условие с именованным параметром %(name)s
+        self.transform = transform  # Преобразование введенного значения перед запросом
+
+    def param(self, value):
+        return self.transform(value) if self.transform else value
+
+
+class ExportSpec:
+    """Описание экспортируемой таблицы на основе модели
+
+    Колонки и их выражения берутся из отображения модели (MAPPER), поэтому порядок
+    колонок и чтение jsonb в экспорте те же, что и в методах чтения модели.
+    """
+
+    def __init__(self, model, filters=()):
+        self.model = model
+        self.table = model.TABLE
+        self.filters = {export_filter.name: export_filter for export_filter in filters}
+        self.select = f"SELECT {model.MAPPER.select_list} FROM {model.TABLE}"
+        self.order_by = ', '.join(model.PAGE_KEY)
+        # Колонки jsonb выбираются текстом; в JSON Lines они записываются объектами
+        self.json_columns = tuple(column.name for column in model.MAPPER.columns if column.converter is lazy_json)
+
+    def build_query(self, filters=None):
+        """Запрос выборки и его параметры с учетом заданных фильтров"""
+        conditions = []
+        params = {}
+        for name, value in (filters or {}).items():
+            if value is None or value == '':
+                continue
+            if name not in self.filters:
+                raise ValueError(f"Неизвестный фильтр {name} для таблицы {self.table}")
+            export_filter = self.filters[name]
+            conditions.append(f"({export_filter.condition})")
+            params[name] = export_filter.param(value)
+
+        query = self.select
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {self.order_by}"
+        return query, params or None
+
+
+# Фильтры повторяют выборки методов read_by_* соответствующих моделей
+EXPORT_SPECS = {
+    'flights': ExportSpec(Flight, [
+        ExportFilter('flight_no', "Номер рейса", "flight_no = %(flight_no)s"),
+        ExportFilter('airport', "Аэропорт",
+                     "departure_airport = %(airport)s OR arrival_airport = %(airport)s"),
+        ExportFilter('status', "Статус", "status = %(status)s"),
+        ExportFilter('start_date', "Вылет с", "scheduled_departure >= %(start_date)s"),
+        ExportFilter('end_date', "Вылет по", "scheduled_departure <= %(end_date)s"),
+    ]),
+    'tickets': ExportSpec(Ticket, [
+        ExportFilter('book_ref', "Номер бронирования", "book_ref = %(book_ref)s"),
+        ExportFilter('passenger_id', "ID пассажира", "passenger_id = %(passenger_id)s"),
+        ExportFilter('passenger_name', "Имя пассажира", "passenger_name ILIKE %(passenger_name)s",
+                     lambda value: f'%{value}%'),
+    ]),
+    'ticket_flights': ExportSpec(TicketFlight, [
+        ExportFilter('ticket_no', "Номер билета", "ticket_no = %(ticket_no)s"),
+        ExportFilter('flight_id', "ID рейса", "flight_id = %(flight_id)s", int),
+        ExportFilter('fare_conditions', "Класс обслуживания", "fare_conditions = %(fare_conditions)s"),
+    ]),
+    'boarding_passes': ExportSpec(BoardingPass, [
+        ExportFilter('ticket_no', "Номер билета", "ticket_no = %(ticket_no)s"),
+        ExportFilter('flight_id', "ID рейса", "flight_id = %(flight_id)s", int),
+    ]),
+    'seats': ExportSpec(Seat, [
+        ExportFilter('aircraft_code', "Код самолета", "aircraft_code = %(aircraft_code)s"),
+    ]),
+    'bookings': ExportSpec(Booking, [
+        ExportFilter('book_ref', "Номер бронирования", "book_ref = %(book_ref)s"),
+    ]),
+    'aircrafts': ExportSpec(Aircraft, [
+        ExportFilter('aircraft_code', "Код самолета", "aircraft_code = %(aircraft_code)s"),
+    ]),
+    'airports': ExportSpec(Airport, [
+        ExportFilter('airport_code', "Код аэропорта", "airport_code = %(airport_code)s"),
+    ]),
+}
+
+
+class _CountingWriter:
+    """Файл для COPY TO STDOUT, считающий записанные строки"""
+
+    def __init__(self, file, on_rows):
+        self.file = file
+        self.on_rows = on_rows
+
+    def write(self, data):
+        self.file.write(data)
+        # Переводы строк внутри значений CSV учитываются как строки - для прогресса это допустимо
+        self.on_rows(data.count(b'\n') if isinstance(data, bytes) else data.count('\n'))
+
+
+class _Progress:
+    """Вызов обработчика прогресса не чаще, чем раз в PROGRESS_EVERY строк"""
+
+    def __init__(self, callback, total, cancel_event):
+        self.callback = callback
+        self.total = total
+        self.cancel_event = cancel_event
+        self.rows = 0
+        self._reported = 0
+
+    def add(self, count=1):
+        self.rows += count
+        if self.rows - self._reported >= PROGRESS_EVERY:
+            self.report()
+
+    def report(self):
+        self._reported = self.rows
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ExportCancelled("Экспорт отменен")
+        if self.callback:
+            self.callback(self.rows, self.total)
+
+
+def _json_default(value):
+    if isinstance(value, LazyJSON):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    # Decimal и прочие типы - строкой, без потери точности
+    return str(value)
+
+
+def _export_csv(db, query, params, path, progress):
+    cursor = db.get_cursor()
+    try:
+        copy_query = cursor.mogrify(query, params).decode('utf-8')
+        # Строка заголовка не считается
+        progress.rows = -1
+        with open(path, 'wb') as file:
+            writer = _CountingWriter(file, progress.add)
+            cursor.copy_expert(f"COPY ({copy_query}) TO STDOUT WITH (FORMAT csv, HEADER true)", writer)
+    finally:
+        cursor.close()
+
+
+def _export_jsonl(db, query, params, path, progress, itersize, json_columns=()):
+    with open(path, 'w', encoding='utf-8') as file:
+        rows = db.stream(query, params, itersize)
+        try:
+            for row in rows:
+                for name in json_columns:
+                    row[name] = lazy_json(row[name])
+                file.write(json.dumps(row, ensure_ascii=False, default=_json_default))
+                file.write('\n')
+                progress.add()
+        finally:
+            rows.close()
+
+
+def export_table(db, table, path, fmt=CSV, filters=None, progress=None, cancel_event=None,
+                 itersize=DEFAULT_ITERSIZE):
+    """Потоковый экспорт таблицы в CSV или JSON Lines
+
+    CSV формирует сервер через COPY ... TO STDOUT, JSON Lines читается серверным
+    курсором порциями по itersize, так что таблица целиком в памяти не хранится.
+    progress(rows, total) вызывается по ходу выгрузки (total - None, если задан фильтр);
+    установленный cancel_event прерывает экспорт. Возвращает количество строк.
+    """
+    if table not in EXPORT_SPECS:
+        raise ValueError(f"Неизвестная таблица для экспорта: {table}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+
+    spec = EXPORT_SPECS[table]
+    query, params = spec.build_query(filters)
+    has_filters = any(value not in (None, '') for value in (filters or {}).values())
+    total = None if has_filters else db.row_counts.count(spec.table)
+    tracker = _Progress(progress, total, cancel_event)
+
+    try:
+        if fmt == CSV:
+            _export_csv(db, query, params, path, tracker)
+        else:
+            _export_jsonl(db, query, params, path, tracker, itersize, spec.json_columns)
+    except BaseException:
+        # Неполный файл не оставляем
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    if progress:
+        progress(tracker.rows, total)
+    return tracker.rows
\ No newline at end of file
@@ -0,0 +1,251 @@
+import sys
+import threading
+import time
+from collections import deque
+
+# Границы корзин гистограммы времени выполнения, мс (последняя корзина - все, что больше)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+DEFAULT_SLOW_THRESHOLD_MS = 200.0
+DEFAULT_SLOW_LOG_SIZE = 200
+# Длина текста запроса и параметров в журнале медленных запросов
+MAX_LOGGED_TEXT = 1000
+# Объем результата оценивается по выборке строк, а не по всем значениям:
+# у fetch* измеряется не больше SIZE_SAMPLE_ROWS строк, при обходе курсора - каждая SIZE_SAMPLE_EVERY-я
+SIZE_SAMPLE_ROWS = 10
+SIZE_SAMPLE_EVERY = 100
+
+# Модули, кадры которых пропускаются при поиске вызвавшего метода модели: запросы общих
+# помощников (пагинация, пакетная загрузка, кэши) учитываются за методом, который их вызвал
+_INFRASTRUCTURE_MODULES = ('src.Models.database', 'src.Models.instrumentation', 'src.Models.streaming',
+                           'src.Models.prepared', 'src.Models.pagination', 'src.Models.bulk',
+                           'src.Models.row_counts', 'src.Models.seat_map', 'src.Models.reference_cache',
+                           'src.Models.boarding_numbers', 'src.Models.load_factor', 'psycopg2')
+
+
+def _caller_name():
+    """Метод модели (или другой код приложения), выполняющий запрос"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith(_INFRASTRUCTURE_MODULES):
+            code = frame.f_code
+            return getattr(code, 'co_qualname', code.co_name)
+        frame = frame.f_back
+    return '<unknown>'
+
+
+def _value_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+    return 8
+
+
+def _row_size(row):
+    values = row.values() if isinstance(row, dict) else row
+    return sum(_value_size(value) for value in values)
+
+
+def _rows_size(rows):
+    """Приблизительный объем строк результата в байтах (по длине значений строк выборки)"""
+    count = len(rows)
+    if count <= SIZE_SAMPLE_ROWS:
+        return sum(_row_size(row) for row in rows)
+    sample = rows[::count // SIZE_SAMPLE_ROWS][:SIZE_SAMPLE_ROWS]
+    return sum(_row_size(row) for row in sample) * count // len(sample)
+
+
+class MethodStats:
+    """Статистика запросов одного метода"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.last_query = None
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def percentile(self, fraction):
+        """Оценка перцентиля по гистограмме (верхняя граница корзины), мс"""
+        if not self.calls:
+            return 0.0
+        threshold = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= threshold:
+                return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+
+class SlowQuery:
+    """Запись журнала медленных запросов"""
+
+    def __init__(self, method, query, params, duration_ms, rows):
+        self.method = method
+        self.query = query
+        self.params = params
+        self.duration_ms = duration_ms
+        self.rows = rows
+        self.logged_at = time.time()
+
+
+class QueryStats:
+    """Сбор статистики запросов по методам моделей
+
+    Время выполнения раскладывается по корзинам гистограммы, считаются строки
+    и приблизительный объем полученных данных; запросы дольше порога попадают
+    в журнал медленных запросов вместе с параметрами.
+    """
+
+    def __init__(self, enabled=True, slow_threshold_ms=DEFAULT_SLOW_THRESHOLD_MS,
+                 slow_log_size=DEFAULT_SLOW_LOG_SIZE):
+        self.enabled = enabled
+        self.slow_threshold_ms = slow_threshold_ms
+        self.started_at = time.time()
+        self._methods = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def record_query(self, method, query, params, duration_ms, rows, error=False):
+        """Учет выполненного запроса"""
+        bucket = len(LATENCY_BUCKETS_MS)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if duration_ms <= bound:
+                bucket = index
+                break
+
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = MethodStats(method)
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.buckets[bucket] += 1
+            stats.last_query = query
+            if rows > 0:
+                stats.rows += rows
+            if error:
+                stats.errors += 1
+
+        if duration_ms >= self.slow_threshold_ms:
+            text = query.decode('utf-8', 'replace') if isinstance(query, bytes) else str(query)
+            slow = SlowQuery(method, ' '.join(text.split())[:MAX_LOGGED_TEXT],
+                             repr(params)[:MAX_LOGGED_TEXT] if params is not None else None,
+                             duration_ms, rows)
+            with self._lock:
+                self._slow.append(slow)
+
+    def record_fetch(self, method, rows, size):
+        """Учет полученных строк (fetch* и обход курсора)"""
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = MethodStats(method)
+            stats.rows += rows
+            stats.bytes += size
+
+    def methods(self):
+        """Статистика по методам, самые затратные по суммарному времени - первыми"""
+        with self._lock:
+            return sorted(self._methods.values(), key=lambda stats: stats.total_ms, reverse=True)
+
+    def slow_queries(self):
+        """Журнал медленных запросов, последние - первыми"""
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._methods = {}
+            self._slow.clear()
+            self.started_at = time.time()
+
+
+class InstrumentedCursor:
+    """Курсор, измеряющий время запросов и объем результата для QueryStats"""
+
+    def __init__(self, cursor, stats):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_stats', stats)
+        object.__setattr__(self, '_method', None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def _timed(self, operation, query, params, *args):
+        method = _caller_name()
+        object.__setattr__(self, '_method', method)
+        started = time.perf_counter()
+        try:
+            result = operation(query, *args) if params is None else operation(query, params, *args)
+        except Exception:
+            self._stats.record_query(method, query, params, (time.perf_counter() - started) * 1000, 0, True)
+            raise
+        rowcount = self._cursor.rowcount if self._cursor.description is None else 0
+        self._stats.record_query(method, query, params, (time.perf_counter() - started) * 1000, rowcount)
+        return result
+
+    def execute(self, query, params=None):
+        return self._timed(self._cursor.execute, query, params)
+
+    def executemany(self, query, params_list):
+        return self._timed(self._cursor.executemany, query, params_list)
+
+    def copy_expert(self, sql, file, *args):
+        return self._timed(self._cursor.copy_expert, sql, None, file, *args)
+
+    def _fetched(self, rows):
+        self._stats.record_fetch(self._method or _caller_name(), len(rows), _rows_size(rows))
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._fetched([row])
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany() if size is None else self._cursor.fetchmany(size)
+        return self._fetched(rows)
+
+    def fetchall(self):
+        return self._fetched(self._cursor.fetchall())
+
+    def __iter__(self):
+        method = self._method or _caller_name()
+        count = 0
+        sampled = 0
+        sampled_size = 0
+        try:
+            for row in self._cursor:
+                if count % SIZE_SAMPLE_EVERY == 0:
+                    sampled += 1
+                    sampled_size += _row_size(row)
+                count += 1
+                yield row
+        finally:
+            self._stats.record_fetch(method, count, sampled_size * count // sampled if sampled else 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._cursor.close()
\ No newline at end of file
@@ -0,0 +1,81 @@
+import json
+from collections.abc import Mapping
+
+from src.Models.mapper import Column
+
+# Язык названий, которые списки в представлениях получают уже извлеченными на сервере
+DISPLAY_LANGUAGE = 'ru'
+FALLBACK_LANGUAGE = 'en'
+
+
+class LazyJSON(Mapping):
+    """JSON-объект из колонки jsonb, разбираемый только при первом обращении
+
+    Колонка выбирается как текст (::text), поэтому psycopg2 не строит словарь
+    для каждой строки; json.loads выполняется, только если к полю обратились по ключу.
+    """
+
+    __slots__ = ('raw', '_value')
+
+    def __init__(self, raw):
+        self.raw = raw  # Исходный текст jsonb
+        self._value = None
+
+    @property
+    def value(self):
+        if self._value is None:
+            self._value = json.loads(self.raw)
+        return self._value
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __bool__(self):
+        # Пустоту определяем по тексту, без разбора
+        return self.raw not in ('', '{}', 'null')
+
+    def __str__(self):
+        return self.raw
+
+    def __repr__(self):
+        return f"LazyJSON({self.raw!r})"
+
+
+def lazy_json(value):
+    """Преобразование значения колонки, выбранной как текст, в LazyJSON"""
+    if value is None or isinstance(value, LazyJSON):
+        return value
+    if isinstance(value, str):
+        return LazyJSON(value)
+    # Уже разобранное значение (колонка выбрана без ::text)
+    return value
+
+
+def to_json(value):
+    """Текст JSON для записи в базу или вывода; LazyJSON отдается без повторной сериализации"""
+    if isinstance(value, LazyJSON):
+        return value.raw
+    return json.dumps(value, ensure_ascii=False)
+
+
+def json_column(name):
+    """Колонка jsonb, читаемая как LazyJSON"""
+    return Column(name, f"{name}::text", lazy_json)
+
+
+def display_value(value):
+    """Строка языка отображения из JSON с переводами (то же, что display_column, но без запроса)"""
+    if isinstance(value, Mapping):
+        return value.get(DISPLAY_LANGUAGE) or value.get(FALLBACK_LANGUAGE)
+    return value
+
+
+def display_column(name):
+    """Колонка jsonb с переводами: на сервере извлекается только строка языка отображения"""
+    return Column(name, f"COALESCE({name}->>'{DISPLAY_LANGUAGE}', {name}->>'{FALLBACK_LANGUAGE}')")
\ No newline at end of file
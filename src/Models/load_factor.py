@@ -0,0 +1,140 @@
+import threading
+
+from src.Models.SeatsModel import Seat
+
+
+class FlightLoad:
+    """Загрузка рейса: места, проданные билеты и зарегистрированные пассажиры по классам"""
+
+    __slots__ = ('flight_id', 'aircraft_code', 'capacity', 'sold', 'checked_in')
+
+    def __init__(self, flight_id, aircraft_code, capacity, sold=None, checked_in=None):
+        self.flight_id = flight_id
+        self.aircraft_code = aircraft_code
+        self.capacity = capacity  # Класс обслуживания -> количество мест
+        self.sold = sold or {}  # Класс обслуживания -> продано билетов
+        self.checked_in = checked_in or {}  # Класс обслуживания -> выдано посадочных талонов
+
+    @property
+    def seats(self):
+        return sum(self.capacity.values())
+
+    @property
+    def sold_total(self):
+        return sum(self.sold.values())
+
+    @property
+    def checked_in_total(self):
+        return sum(self.checked_in.values())
+
+    @property
+    def load_factor(self):
+        """Доля проданных мест (None - количество мест самолета неизвестно)"""
+        seats = self.seats
+        return self.sold_total / seats if seats else None
+
+    @property
+    def check_in_factor(self):
+        """Доля зарегистрированных пассажиров среди проданных билетов"""
+        sold = self.sold_total
+        return self.checked_in_total / sold if sold else None
+
+    def fare_load_factor(self, fare_conditions):
+        seats = self.capacity.get(fare_conditions, 0)
+        return self.sold.get(fare_conditions, 0) / seats if seats else None
+
+    def __str__(self):
+        load_factor = f"{self.load_factor:.0%}" if self.load_factor is not None else "?"
+        return (f"Flight {self.flight_id}: {load_factor} "
+                f"({self.sold_total}/{self.seats}, checked in: {self.checked_in_total})")
+
+
+class LoadFactorEngine:
+    """Расчет загрузки для набора рейсов одним запросом
+
+    Количество мест по классам для каждого самолета меняется редко, поэтому
+    читается одним запросом по всей таблице seats и хранится в памяти до записи
+    в seats через модели. Продажи и регистрация считаются одним групповым
+    запросом по flights, ticket_flights и boarding_passes для всех рейсов сразу.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._capacity = None  # Код самолета -> {класс обслуживания: количество мест}
+        self._generation = 0
+        self._lock = threading.Lock()
+        db.add_change_listener(self.invalidate)
+
+    def invalidate(self, table=None):
+        """Сброс количества мест (при записи в seats)"""
+        if table is None or table == Seat.TABLE:
+            with self._lock:
+                self._generation += 1
+                self._capacity = None
+
+    def get_capacity(self, aircraft_code):
+        """Количество мест самолета по классам обслуживания"""
+        capacity = self._load_capacity()
+        return dict(capacity.get(aircraft_code, {})) if capacity is not None else {}
+
+    def get_loads(self, flight_ids):
+        """Загрузка рейсов: словарь ID рейса -> FlightLoad"""
+        flight_ids = list(flight_ids)
+        if not flight_ids:
+            return {}
+        capacity = self._load_capacity()
+        if capacity is None:
+            return {}
+        try:
+            with self.db.get_cursor(tuple_rows=True) as cursor:
+                cursor.execute("""
+                    SELECT f.flight_id, f.aircraft_code, tf.fare_conditions,
+                           count(tf.ticket_no) AS sold, count(bp.ticket_no) AS checked_in
+                    FROM bookings.flights f
+                    LEFT JOIN bookings.ticket_flights tf ON tf.flight_id = f.flight_id
+                    LEFT JOIN bookings.boarding_passes bp
+                           ON bp.flight_id = tf.flight_id AND bp.ticket_no = tf.ticket_no
+                    WHERE f.flight_id = ANY(%s)
+                    GROUP BY f.flight_id, f.aircraft_code, tf.fare_conditions
+                """, (flight_ids,))
+                rows = cursor.fetchall()
+
+                loads = {}
+                for flight_id, aircraft_code, fare_conditions, sold, checked_in in rows:
+                    load = loads.get(flight_id)
+                    if load is None:
+                        load = loads[flight_id] = FlightLoad(flight_id, aircraft_code,
+                                                             capacity.get(aircraft_code, {}))
+                    if fare_conditions is not None:
+                        load.sold[fare_conditions] = sold
+                        load.checked_in[fare_conditions] = checked_in
+                return loads
+        except Exception as e:
+            print(f"Ошибка при расчете загрузки рейсов: {e}")
+            return {}
+
+    def _load_capacity(self):
+        with self._lock:
+            if self._capacity is not None:
+                return self._capacity
+            generation = self._generation
+        try:
+            with self.db.get_cursor(tuple_rows=True) as cursor:
+                cursor.execute("""
+                    SELECT aircraft_code, fare_conditions, count(*) AS seats
+                    FROM bookings.seats
+                    GROUP BY aircraft_code, fare_conditions
+                """)
+                rows = cursor.fetchall()
+        except Exception as e:
+            print(f"Ошибка при чтении количества мест самолетов: {e}")
+            return None
+
+        capacity = {}
+        for aircraft_code, fare_conditions, seats in rows:
+            capacity.setdefault(aircraft_code, {})[fare_conditions] = seats
+        with self._lock:
+            # Загрузка, начатая до сброса, не сохраняется
+            if generation == self._generation:
+                self._capacity = capacity
+        return capacity
\ No newline at end of file
@@ -0,0 +1,87 @@
+class Column:
+    """Колонка модели: аргумент конструктора, SQL-выражение выборки и преобразование значения"""
+
+    def __init__(self, name, expression=None, converter=None):
+        self.name = name
+        self.expression = expression  # None - колонка таблицы с тем же именем
+        self.converter = converter  # Преобразование значения из строки результата
+
+    @property
+    def select_sql(self):
+        if self.expression:
+            return f"{self.expression} AS {self.name}"
+        return self.name
+
+
+class RowMapper:
+    """Отображение строк-кортежей на объекты модели
+
+    Функция построения объекта генерируется один раз по списку колонок,
+    поэтому при чтении нет ни словаря на строку, ни поиска колонок по имени.
+    Строка может содержать дополнительные колонки после колонок модели.
+    Проекция (project) выбирает только нужные колонки, остальные поля объекта - None.
+    """
+
+    def __init__(self, model, columns, arguments=None):
+        self.model = model
+        self.columns = tuple(column if isinstance(column, Column) else Column(column) for column in columns)
+        self.names = tuple(column.name for column in self.columns)
+        # Аргументы конструктора по порядку; не выбранные колонки передаются как None
+        self.arguments = tuple(arguments) if arguments else self.names
+        unknown = set(self.names) - set(self.arguments)
+        if unknown:
+            raise ValueError(f"Неизвестные колонки {model.__name__}: {', '.join(sorted(unknown))}")
+        self.index = {name: index for index, name in enumerate(self.names)}
+        self.select_list = ', '.join(column.select_sql for column in self.columns)
+        self.from_row = self._compile()
+        self._projections = {}
+
+    def _compile(self):
+        namespace = {'model': self.model}
+        positions = {column.name: (index, column) for index, column in enumerate(self.columns)}
+        arguments = []
+        for name in self.arguments:
+            if name not in positions:
+                arguments.append("None")
+                continue
+            index, column = positions[name]
+            if column.converter:
+                namespace[f'convert_{index}'] = column.converter
+                arguments.append(f"convert_{index}(row[{index}])")
+            else:
+                arguments.append(f"row[{index}]")
+
+        source = f"def from_row(row):\n    return model({', '.join(arguments)})\n"
+        exec(compile(source, f"<{self.model.__name__} row mapper>", 'exec'), namespace)
+        return namespace['from_row']
+
+    def project(self, columns=None, required=()):
+        """Отображение только для части колонок (проекция)
+
+        columns - имена колонок модели или Column с другим выражением выборки;
+        required - колонки, которые выбираются всегда (например, ключ сортировки).
+        Отображения кэшируются, так что функция строится один раз на проекцию.
+        """
+        if columns is None:
+            return self
+        key = (tuple(columns), tuple(required))
+        mapper = self._projections.get(key)
+        if mapper is None:
+            definitions = {column.name: column for column in self.columns}
+            selected = []
+            for column in columns:
+                if not isinstance(column, Column):
+                    if column not in definitions:
+                        raise ValueError(f"Неизвестная колонка {self.model.__name__}: {column}")
+                    column = definitions[column]
+                selected.append(column)
+            names = {column.name for column in selected}
+            selected.extend(definitions[name] for name in required if name not in names)
+            mapper = RowMapper(self.model, selected, self.arguments)
+            self._projections[key] = mapper
+        return mapper
+
+    def map_rows(self, rows):
+        """Список объектов по строкам результата"""
+        from_row = self.from_row
+        return [from_row(row) for row in rows]
\ No newline at end of file
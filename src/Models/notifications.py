@@ -0,0 +1,113 @@
+import select
+import threading
+
+# Канал уведомлений об изменении справочников; полезная нагрузка - имя таблицы
+# (триггеры создаются миграцией схемы, см. src/Models/schema.py)
+REFERENCE_CHANNEL = 'reference_changed'
+
+# Канал уведомлений об изменении статуса и фактического времени рейсов;
+# полезная нагрузка - JSON {"flight_id", "status", "times_changed"}
+FLIGHT_CHANNEL = 'flight_changed'
+
+
+class NotificationListener:
+    """Прием уведомлений PostgreSQL (LISTEN/NOTIFY) в фоновом потоке
+
+    Для прослушивания открывается отдельное соединение вне пула: оно все время
+    ждет уведомлений и не выполняет других запросов. Обработчики callback(payload)
+    вызываются в потоке слушателя. После переподключения каждый обработчик
+    получает payload=None: уведомления за время разрыва могли быть потеряны.
+    """
+
+    def __init__(self, db, poll_timeout=1.0, reconnect_delay=5.0):
+        self.db = db
+        self.poll_timeout = poll_timeout  # Как часто проверяются остановка и новые подписки
+        self.reconnect_delay = reconnect_delay
+        self._handlers = {}  # Канал -> список обработчиков
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def subscribe(self, channel, callback):
+        """Подписка на канал (можно и после запуска слушателя)"""
+        with self._lock:
+            self._handlers.setdefault(channel, []).append(callback)
+
+    def unsubscribe(self, channel, callback):
+        """Отписка от канала"""
+        with self._lock:
+            handlers = self._handlers.get(channel, [])
+            if callback in handlers:
+                handlers.remove(callback)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Запуск фонового потока слушателя"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-notifications", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Остановка слушателя и закрытие его соединения"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout if timeout is not None else self.poll_timeout * 2)
+            self._thread = None
+
+    def _run(self):
+        reconnected = False
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                connection = self.db._create_connection()
+                listening = set()
+                if reconnected:
+                    self._dispatch_all(None)
+                print("Прием уведомлений об изменениях запущен")
+
+                while not self._stop_event.is_set():
+                    listening = self._listen_new_channels(connection, listening)
+                    ready, _, _ = select.select([connection], [], [], self.poll_timeout)
+                    if not ready:
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        self._dispatch(notify.channel, notify.payload or None)
+            except Exception as e:
+                print(f"Ошибка приема уведомлений: {e}")
+                reconnected = True
+                self._stop_event.wait(self.reconnect_delay)
+            finally:
+                if connection is not None and not connection.closed:
+                    connection.close()
+
+    def _listen_new_channels(self, connection, listening):
+        with self._lock:
+            channels = set(self._handlers) - listening
+        if channels:
+            cursor = connection.cursor()
+            for channel in channels:
+                cursor.execute(f'LISTEN "{channel}"')
+            cursor.close()
+        return listening | channels
+
+    def _dispatch(self, channel, payload):
+        with self._lock:
+            handlers = list(self._handlers.get(channel, []))
+        for callback in handlers:
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"Ошибка обработчика уведомления {channel}: {e}")
+
+    def _dispatch_all(self, payload):
+        with self._lock:
+            channels = list(self._handlers)
+        for channel in channels:
+            self._dispatch(channel, payload)
\ No newline at end of file
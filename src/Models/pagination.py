@@ -0,0 +1,114 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+
+class KeysetPage:
+    """Страница записей, полученная пагинацией по ключу сортировки"""
+
+    def __init__(self, items, total, next_token=None, prev_token=None, has_next=False, has_prev=False,
+                 estimated=False):
+        self.items = items
+        self.total = total
+        self.estimated = estimated  # total - оценка планировщика, а не точный COUNT(*)
+        self.next_token = next_token  # Ключ последней записи: продолжение вперед
+        self.prev_token = prev_token  # Ключ первой записи: продолжение назад
+        self.has_next = has_next
+        self.has_prev = has_prev
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'$d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'$dec': str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if '$dt' in value:
+            return datetime.fromisoformat(value['$dt'])
+        if '$d' in value:
+            return date.fromisoformat(value['$d'])
+        if '$dec' in value:
+            return Decimal(value['$dec'])
+    return value
+
+
+def encode_token(values):
+    """Упаковка значений ключа сортировки в непрозрачный токен"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_token(token):
+    """Распаковка токена в кортеж значений ключа сортировки"""
+    payload = base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8')
+    return tuple(_decode_value(value) for value in json.loads(payload))
+
+
+def fetch_keyset_rows(cursor, base_query, key_columns, limit, token=None, backward=False,
+                      descending=False, conditions=(), params=(), offset=0):
+    """Выборка страницы строк по ключу сортировки вместо LIMIT/OFFSET
+
+    base_query - SELECT ... FROM ... без WHERE и ORDER BY;
+    key_columns - уникальный ключ сортировки, например ('flight_id', 'boarding_no').
+    offset - пропуск строк после ключа (переход далеко вперед от известной границы).
+    Возвращает строки в порядке отображения и признаки наличия соседних страниц.
+    """
+    conditions = list(conditions)
+    params = list(params)
+
+    # Направление обхода относительно порядка отображения
+    reverse = descending != backward
+    if token is not None:
+        key_values = decode_token(token)
+        columns = ', '.join(key_columns)
+        placeholders = ', '.join(['%s'] * len(key_columns))
+        conditions.append(f"({columns}) {'<' if reverse else '>'} ({placeholders})")
+        params.extend(key_values)
+
+    query = base_query
+    if conditions:
+        query += " WHERE " + " AND ".join(f"({condition})" for condition in conditions)
+    direction = 'DESC' if reverse else 'ASC'
+    query += " ORDER BY " + ", ".join(f"{column} {direction}" for column in key_columns)
+    query += " LIMIT %s"
+    params.append(limit + 1)
+    if offset:
+        query += " OFFSET %s"
+        params.append(offset)
+
+    # Лишняя строка показывает, есть ли записи за пределами страницы
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if backward:
+        rows.reverse()
+        return rows, token is not None, has_more
+    return rows, has_more, token is not None or offset > 0
+
+
+def build_keyset_page(items, rows, key_columns, total, has_next, has_prev, estimated=False, column_index=None):
+    """Формирование страницы с токенами по первой и последней строке
+
+    column_index - позиции колонок, если строки получены кортежами, а не словарями.
+    """
+    next_token = prev_token = None
+    if rows:
+        keys = [column_index[column] for column in key_columns] if column_index else key_columns
+        prev_token = encode_token([rows[0][key] for key in keys])
+        next_token = encode_token([rows[-1][key] for key in keys])
+    return KeysetPage(items, total, next_token, prev_token, has_next, has_prev, estimated)
\ No newline at end of file
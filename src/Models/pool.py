@@ -0,0 +1,243 @@
+import threading
+import time
+from collections import deque
+
+from psycopg2 import extensions
+
+
+class PoolTimeoutError(Exception):
+    """Не удалось получить соединение из пула за отведенное время"""
+    pass
+
+
+class ConnectionPool:
+    """Потокобезопасный пул соединений с PostgreSQL
+
+    Соединения, простаивающие дольше max_idle, закрываются при выдаче и возврате
+    соединений, а также фоновым потоком раз в reap_interval секунд - иначе после
+    пика нагрузки простаивающее приложение держало бы до max_size соединений.
+    """
+
+    def __init__(self, connect_func, min_size=1, max_size=10, timeout=30.0,
+                 max_idle=300.0, health_check_interval=30.0, reap_interval=None):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Некорректные размеры пула: требуется 0 <= min_size <= max_size, max_size >= 1")
+
+        self.connect_func = connect_func
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout  # Максимальное ожидание свободного соединения, сек
+        self.max_idle = max_idle  # Простаивающие дольше соединения закрываются (сверх min_size)
+        self.health_check_interval = health_check_interval  # После такого простоя соединение проверяется
+        # Период фоновой проверки простаивающих соединений, сек (по умолчанию - половина max_idle)
+        self.reap_interval = reap_interval if reap_interval is not None else max_idle / 2
+
+        self._condition = threading.Condition()
+        self._idle = deque()  # Пары (соединение, время возврата), самые старые слева
+        self._size = 0  # Открытые соединения, включая выданные и создаваемые
+        self._in_use = 0
+        self._closed = False
+        self._reaper = None
+        self._reaper_stop = threading.Event()
+
+        # Статистика для подбора размеров пула
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._peak_in_use = 0
+        self._busy_time = 0.0  # Суммарное время (соединение * сек), когда соединения были выданы
+        self._busy_since = time.monotonic()
+        self._opened_at = time.monotonic()
+
+    def open(self):
+        """Создание минимального количества соединений"""
+        for _ in range(self.min_size):
+            connection = self.connect_func()
+            with self._condition:
+                self._size += 1
+                self._created += 1
+                self._idle.append((connection, time.monotonic()))
+
+        if self.reap_interval > 0 and self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_periodically, name='pool-reaper', daemon=True)
+            self._reaper.start()
+
+    def getconn(self):
+        """Получение соединения из пула (с ожиданием не дольше timeout)"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            connection = None
+            released_at = None
+
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise PoolTimeoutError("Пул соединений закрыт")
+
+                    self._reap_idle_locked()
+                    if self._idle:
+                        # LIFO: берем самое «теплое» соединение, старые остаются для удаления
+                        connection, released_at = self._idle.pop()
+                        break
+
+                    if self._size < self.max_size:
+                        # Резервируем место под новое соединение, создаем его вне блокировки
+                        self._size += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"Нет свободных соединений в пуле за {self.timeout} с "
+                            f"(занято {self._in_use} из {self.max_size})"
+                        )
+                    self._condition.wait(remaining)
+
+            if connection is None:
+                try:
+                    connection = self.connect_func()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self._created += 1
+            elif not self._is_healthy(connection, released_at):
+                self._discard(connection)
+                continue
+
+            waited = time.monotonic() - started
+            with self._condition:
+                self._account_busy()
+                self._in_use += 1
+                self._checkouts += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+                self._peak_in_use = max(self._peak_in_use, self._in_use)
+            return connection
+
+    def putconn(self, connection, discard=False):
+        """Возврат соединения в пул"""
+        with self._condition:
+            self._account_busy()
+            self._in_use -= 1
+
+        if discard or self._closed or connection.closed:
+            self._discard(connection)
+            return
+
+        try:
+            # Незавершенная транзакция не должна достаться следующему потоку
+            if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            if not connection.autocommit:
+                connection.autocommit = True
+        except Exception:
+            self._discard(connection)
+            return
+
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._reap_idle_locked()
+            self._condition.notify()
+
+    def reap_idle(self):
+        """Закрытие соединений, простаивающих дольше max_idle (сверх min_size)"""
+        with self._condition:
+            self._reap_idle_locked()
+
+    def close_all(self):
+        """Закрытие всех соединений пула"""
+        self._reaper_stop.set()
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        """Статистика ожидания и загрузки пула"""
+        with self._condition:
+            self._account_busy()
+            elapsed = max(time.monotonic() - self._opened_at, 1e-9)
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'peak_in_use': self._peak_in_use,
+                'utilization': self._in_use / self.max_size,
+                'avg_utilization': self._busy_time / (elapsed * self.max_size),
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'created': self._created,
+                'discarded': self._discarded,
+                'avg_wait': self._total_wait / self._checkouts if self._checkouts else 0.0,
+                'max_wait': self._max_wait,
+                'total_wait': self._total_wait,
+            }
+
+    def _is_healthy(self, connection, released_at):
+        """Проверка соединения перед выдачей"""
+        if connection.closed:
+            return False
+        if time.monotonic() - released_at < self.health_check_interval:
+            return True
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, connection):
+        """Закрытие соединения и освобождение места в пуле"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._discarded += 1
+            self._condition.notify()
+
+    def _reap_periodically(self):
+        """Фоновое закрытие простаивающих соединений до закрытия пула"""
+        while not self._reaper_stop.wait(self.reap_interval):
+            self.reap_idle()
+
+    def _reap_idle_locked(self):
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            connection, released_at = self._idle[0]
+            if now - released_at < self.max_idle:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._discarded += 1
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _account_busy(self):
+        now = time.monotonic()
+        self._busy_time += self._in_use * (now - self._busy_since)
+        self._busy_since = now
\ No newline at end of file
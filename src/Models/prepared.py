@@ -0,0 +1,101 @@
+import itertools
+import threading
+import weakref
+
+from psycopg2 import errors
+
+
+class PreparedStatement:
+    """Часто выполняемый запрос, подготавливаемый на сервере (PREPARE) один раз на соединение
+
+    Запрос записывается с параметрами %s, как в остальных моделях; для PREPARE
+    они заменяются на $1, $2, ... Типы параметров сервер выводит из запроса,
+    если они не заданы явно.
+    """
+
+    def __init__(self, name, query, param_types=()):
+        self.name = name
+        self.query = query
+        self.param_types = tuple(param_types)
+
+        parts = query.split('%s')
+        self.param_count = len(parts) - 1
+        numbers = itertools.count(1)
+        self.server_query = parts[0] + ''.join(f"${next(numbers)}{part}" for part in parts[1:])
+        placeholders = ', '.join(['%s'] * self.param_count)
+        self.execute_query = f"EXECUTE {name} ({placeholders})" if self.param_count else f"EXECUTE {name}"
+
+    @property
+    def prepare_query(self):
+        types = f" ({', '.join(self.param_types)})" if self.param_types else ""
+        return f"PREPARE {self.name}{types} AS {self.server_query}"
+
+
+class PreparedStatementCache:
+    """Подготовленные запросы каждого соединения
+
+    Подготовленный запрос живет до закрытия соединения, поэтому набор имен
+    хранится по соединению: новое соединение (в том числе после переподключения
+    пула) начинает с пустого набора и подготавливает запросы заново при первом
+    выполнении.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._prepared = weakref.WeakKeyDictionary()  # Соединение -> имена подготовленных запросов
+        self._lock = threading.Lock()
+        self.prepares = 0
+        self.executions = 0
+
+    def execute(self, cursor, statement, params=()):
+        """Выполнение запроса через EXECUTE (с подготовкой на соединении курсора при необходимости)"""
+        if not self.enabled:
+            cursor.execute(statement.query, params)
+            return
+
+        connection = cursor.connection
+        if not self._is_prepared(connection, statement):
+            self._prepare(cursor, connection, statement)
+        try:
+            cursor.execute(statement.execute_query, params)
+        except errors.InvalidSqlStatementName:
+            # Запрос удален на сервере (DEALLOCATE, DISCARD ALL) - подготовка заново.
+            # Внутри транзакции ошибка прерывает ее, поэтому повтор возможен только вне транзакции
+            self.forget(connection)
+            if not connection.autocommit:
+                raise
+            self._prepare(cursor, connection, statement)
+            cursor.execute(statement.execute_query, params)
+        with self._lock:
+            self.executions += 1
+
+    def forget(self, connection=None):
+        """Сброс сведений о подготовленных запросах соединения (None - всех соединений)"""
+        with self._lock:
+            if connection is None:
+                self._prepared = weakref.WeakKeyDictionary()
+            else:
+                self._prepared.pop(connection, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'connections': len(self._prepared),
+                'prepares': self.prepares,
+                'executions': self.executions,
+            }
+
+    def _is_prepared(self, connection, statement):
+        with self._lock:
+            return statement.name in self._prepared.get(connection, ())
+
+    def _prepare(self, cursor, connection, statement):
+        try:
+            cursor.execute(statement.prepare_query)
+        except errors.DuplicatePreparedStatement:
+            # Подготовлен на этом соединении раньше, но сведения были сброшены
+            if not connection.autocommit:
+                raise
+        with self._lock:
+            self._prepared.setdefault(connection, set()).add(statement.name)
+            self.prepares += 1
\ No newline at end of file
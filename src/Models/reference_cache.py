@@ -0,0 +1,140 @@
+import threading
+from bisect import bisect_left, bisect_right
+
+from src.Models.pagination import KeysetPage, decode_token, encode_token
+
+# Модели справочных таблиц, кэшируемых целиком (регистрируются в модулях моделей)
+_reference_models = {}
+
+
+def register_reference(model):
+    """Регистрация модели небольшой справочной таблицы с ключом из одной колонки"""
+    if len(model.PAGE_KEY) != 1:
+        raise ValueError(f"Справочник {model.TABLE} должен иметь ключ из одной колонки")
+    _reference_models[model.TABLE] = model
+
+
+class ReferenceCache:
+    """Кэш справочных таблиц (аэропорты, самолеты) в памяти процесса
+
+    Таблица загружается целиком одним запросом и сбрасывается при записи через
+    модели (подписка на db.table_changed) или по уведомлению от других клиентов
+    (см. src/Models/notifications.py); после сброса загружается при следующем обращении.
+    Если загрузка не удалась, методы моделей читают из базы как обычно.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._tables = {}  # Таблица -> словарь ключ -> объект модели (в порядке ключа)
+        self._generation = 0  # Растет при каждом сбросе: загрузка, начатая до сброса, не сохраняется
+        self._lock = threading.Lock()
+        db.add_change_listener(self.invalidate)
+
+    def is_reference(self, table):
+        """Кэшируется ли таблица"""
+        return table in _reference_models
+
+    def load(self):
+        """Загрузка всех зарегистрированных справочников (при запуске приложения)"""
+        for table in _reference_models:
+            self._get_table(table)
+
+    def get_all(self, table):
+        """Все записи справочника или None, если кэш недоступен"""
+        items = self._get_table(table)
+        if items is None:
+            return None
+        return list(items.values())
+
+    def get(self, table, key):
+        """Запись справочника по ключу: (найдена ли таблица в кэше, объект или None)"""
+        items = self._get_table(table)
+        if items is None:
+            return False, None
+        return True, items.get(key)
+
+    def get_page(self, table, limit, token=None, backward=False):
+        """Страница справочника с пагинацией по ключу или None, если кэш недоступен
+
+        Токены и признаки соседних страниц - как у fetch_keyset_rows по ключу справочника,
+        поэтому страницы из кэша и из базы взаимозаменяемы.
+        """
+        items = self._get_table(table)
+        if items is None:
+            return None
+        keys = sorted(items)
+
+        if token is None:
+            position = len(keys) if backward else 0
+        else:
+            key = decode_token(token)[0]
+            position = bisect_left(keys, key) if backward else bisect_right(keys, key)
+
+        if backward:
+            start = max(position - limit, 0)
+            selected = keys[start:position]
+            has_next, has_prev = token is not None, start > 0
+        else:
+            selected = keys[position:position + limit]
+            has_next, has_prev = position + limit < len(keys), token is not None
+
+        next_token = prev_token = None
+        if selected:
+            prev_token = encode_token([selected[0]])
+            next_token = encode_token([selected[-1]])
+        return KeysetPage([items[key] for key in selected], len(keys), next_token, prev_token, has_next, has_prev)
+
+    def get_slice(self, table, offset, limit):
+        """Записи справочника по смещению: (записи, всего) или None, если кэш недоступен"""
+        items = self._get_table(table)
+        if items is None:
+            return None
+        keys = sorted(items)
+        return [items[key] for key in keys[offset:offset + limit]], len(keys)
+
+    def invalidate(self, table=None):
+        """Сброс справочника (или всех справочников)"""
+        with self._lock:
+            self._generation += 1
+            if table is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(table, None)
+
+    def on_notification(self, table):
+        """Обработчик уведомления об изменении справочника другим клиентом
+
+        table=None - уведомления могли быть потеряны, сбрасываются все справочники.
+        """
+        if table is None:
+            self.invalidate()
+            return
+        # Сбрасывает и кэш, и кэшированные количества строк таблицы
+        self.db.table_changed(table)
+
+    def _get_table(self, table):
+        with self._lock:
+            items = self._tables.get(table)
+            generation = self._generation
+        if items is not None or table not in _reference_models:
+            return items
+
+        model = _reference_models[table]
+        key_column = model.PAGE_KEY[0]
+        try:
+            cursor = self.db.get_cursor(tuple_rows=True)
+            try:
+                cursor.execute(f"SELECT {model.MAPPER.select_list} FROM {model.TABLE} ORDER BY {key_column}")
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            print(f"Ошибка при загрузке справочника {table}: {e}")
+            return None
+
+        key_index = model.MAPPER.index[key_column]
+        items = {row[key_index]: model.MAPPER.from_row(row) for row in rows}
+        with self._lock:
+            if generation == self._generation:
+                self._tables[table] = items
+        return items
\ No newline at end of file
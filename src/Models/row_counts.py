@@ -0,0 +1,101 @@
+import threading
+import time
+
+
+class RowCountProvider:
+    """Источник количества строк в таблицах для пагинации
+
+    Режимы подсчета (задаются для каждой таблицы):
+    exact - SELECT COUNT(*) при каждом запросе;
+    cached - точный COUNT(*), кэшируемый на ttl секунд и сбрасываемый при записи через модели;
+    estimate - оценка планировщика из pg_class.reltuples без сканирования таблицы.
+    """
+
+    EXACT = 'exact'
+    CACHED = 'cached'
+    ESTIMATE = 'estimate'
+    MODES = (EXACT, CACHED, ESTIMATE)
+
+    # Большие таблицы демонстрационной базы: полный подсчет - это последовательное сканирование
+    DEFAULT_MODES = {
+        'bookings.bookings': ESTIMATE,
+        'bookings.tickets': ESTIMATE,
+        'bookings.ticket_flights': ESTIMATE,
+        'bookings.boarding_passes': ESTIMATE,
+    }
+
+    def __init__(self, db, default_mode=CACHED, ttl=60.0, modes=None):
+        if default_mode not in self.MODES:
+            raise ValueError(f"Неизвестный режим подсчета: {default_mode}")
+        self.db = db
+        self.default_mode = default_mode
+        self.ttl = ttl
+        self._modes = dict(self.DEFAULT_MODES)
+        self._modes.update(modes or {})
+        self._ttls = {}
+        self._cache = {}  # Таблица -> (количество, время подсчета)
+        self._lock = threading.Lock()
+
+    def set_mode(self, table, mode, ttl=None):
+        """Выбор режима подсчета для таблицы"""
+        if mode not in self.MODES:
+            raise ValueError(f"Неизвестный режим подсчета: {mode}")
+        with self._lock:
+            self._modes[table] = mode
+            if ttl is not None:
+                self._ttls[table] = ttl
+            self._cache.pop(table, None)
+
+    def get_mode(self, table):
+        """Режим подсчета для таблицы"""
+        return self._modes.get(table, self.default_mode)
+
+    def is_estimate(self, table):
+        """Является ли количество для таблицы приблизительным"""
+        return self.get_mode(table) == self.ESTIMATE
+
+    def count(self, table):
+        """Количество строк в таблице согласно ее режиму подсчета"""
+        mode = self.get_mode(table)
+
+        if mode == self.ESTIMATE:
+            estimate = self._count_estimate(table)
+            if estimate is not None:
+                return estimate
+            # Без статистики планировщика считаем точно, но не чаще раза в ttl
+            mode = self.CACHED
+
+        if mode == self.CACHED:
+            ttl = self._ttls.get(table, self.ttl)
+            with self._lock:
+                cached = self._cache.get(table)
+            if cached and time.monotonic() - cached[1] < ttl:
+                return cached[0]
+            total = self._count_exact(table)
+            with self._lock:
+                self._cache[table] = (total, time.monotonic())
+            return total
+
+        return self._count_exact(table)
+
+    def invalidate(self, table=None):
+        """Сброс кэшированного количества (для таблицы или для всех)"""
+        with self._lock:
+            if table is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(table, None)
+
+    def _count_exact(self, table):
+        with self.db.get_cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            return cursor.fetchone()['count']
+
+    def _count_estimate(self, table):
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = %s::regclass", (table,))
+            result = cursor.fetchone()
+            # reltuples = -1 (или 0 до первого ANALYZE) - статистики еще нет
+            if result and result['estimate'] > 0:
+                return result['estimate']
+            return None
\ No newline at end of file
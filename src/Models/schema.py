@@ -0,0 +1,269 @@
+from psycopg2 import errors
+
+from src.Models.AircraftModel import Aircraft
+from src.Models.AirportsDataModel import Airport
+from src.Models.BoardingPassesModel import BoardingPass
+from src.Models.BookingModel import Booking
+from src.Models.FlightsModel import Flight
+from src.Models.SeatsModel import Seat
+from src.Models.TicketFlightsModel import TicketFlight
+from src.Models.TicketsModel import Ticket
+from src.Models.boarding_numbers import BoardingNumberAllocator
+from src.Models.notifications import REFERENCE_CHANNEL, FLIGHT_CHANNEL
+
+
+class Migration:
+    """Версионированное изменение схемы базы данных"""
+
+    def __init__(self, version, description, statements):
+        self.version = version
+        self.description = description
+        self.statements = statements
+
+    def apply(self, cursor):
+        """Выполнение миграции; False - миграция пропущена (см. SchemaManager.retry_skipped)"""
+        for statement in self.statements:
+            cursor.execute(statement)
+        return True
+
+
+class TrigramIndexMigration(Migration):
+    """Миграция, требующая расширения pg_trgm
+
+    Расширение устанавливается, только если оно есть на сервере и у пользователя
+    хватает прав; иначе миграция записывается пропущенной, не мешая остальным, а поиск
+    по имени пассажира выполняется через ILIKE (см. Ticket.search_page_by_passenger_name).
+    """
+
+    def apply(self, cursor):
+        cursor.execute("""
+            SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') AS installed,
+                   EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') AS available,
+                   current_setting('is_superuser') = 'on' AS superuser,
+                   has_database_privilege(current_database(), 'CREATE') AS can_create
+        """)
+        row = cursor.fetchone()
+        if not row['installed']:
+            if not row['available'] or not (row['superuser'] or row['can_create']):
+                print("Расширение pg_trgm недоступно: поиск по имени пассажира будет выполняться через ILIKE")
+                return False
+            # Без прав суперпользователя устанавливаются только доверенные расширения (PostgreSQL 13+)
+            cursor.execute("SAVEPOINT create_extension")
+            try:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT create_extension")
+                print(f"Не удалось установить расширение pg_trgm ({str(e).strip()}): "
+                      f"поиск по имени пассажира будет выполняться через ILIKE")
+                return False
+            cursor.execute("RELEASE SAVEPOINT create_extension")
+        return super().apply(cursor)
+
+
+# Миграции применяются по возрастанию версии; уже выпущенные миграции не изменяются
+MIGRATIONS = [
+    Migration(1, "Базовые таблицы", [
+        Aircraft.CREATE_TABLE_QUERY,
+        Airport.CREATE_TABLE_QUERY,
+        Booking.CREATE_TABLE_QUERY,
+        Flight.CREATE_TABLE_QUERY,
+        Ticket.CREATE_TABLE_QUERY,
+        TicketFlight.CREATE_TABLE_QUERY,
+        BoardingPass.CREATE_TABLE_QUERY,
+        Seat.CREATE_TABLE_QUERY,
+    ]),
+    Migration(2, "Индексы под ключи пагинации", [
+        """
+        CREATE INDEX IF NOT EXISTS flights_scheduled_departure_flight_id_idx
+            ON bookings.flights (scheduled_departure, flight_id)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS bookings_book_date_book_ref_idx
+            ON bookings.bookings (book_date, book_ref)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS tickets_book_ref_ticket_no_idx
+            ON bookings.tickets (book_ref, ticket_no)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS ticket_flights_flight_id_ticket_no_idx
+            ON bookings.ticket_flights (flight_id, ticket_no)
+        """,
+    ]),
+    Migration(3, "Уведомления об изменении справочников", [
+        f"""
+        CREATE OR REPLACE FUNCTION bookings.notify_reference_changed() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('{REFERENCE_CHANNEL}', TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$
+        """,
+        "DROP TRIGGER IF EXISTS airports_data_notify_changed ON bookings.airports_data",
+        """
+        CREATE TRIGGER airports_data_notify_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON bookings.airports_data
+            FOR EACH STATEMENT EXECUTE FUNCTION bookings.notify_reference_changed()
+        """,
+        "DROP TRIGGER IF EXISTS aircrafts_data_notify_changed ON bookings.aircrafts_data",
+        """
+        CREATE TRIGGER aircrafts_data_notify_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON bookings.aircrafts_data
+            FOR EACH STATEMENT EXECUTE FUNCTION bookings.notify_reference_changed()
+        """,
+    ]),
+    Migration(4, "Уведомления об изменении статуса рейсов", [
+        f"""
+        CREATE OR REPLACE FUNCTION bookings.notify_flight_changed() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('{FLIGHT_CHANNEL}', json_build_object(
+                'flight_id', NEW.flight_id,
+                'status', NEW.status,
+                'times_changed', OLD.actual_departure IS DISTINCT FROM NEW.actual_departure
+                              OR OLD.actual_arrival IS DISTINCT FROM NEW.actual_arrival
+            )::text);
+            RETURN NULL;
+        END;
+        $$
+        """,
+        "DROP TRIGGER IF EXISTS flights_notify_changed ON bookings.flights",
+        """
+        CREATE TRIGGER flights_notify_changed
+            AFTER UPDATE OF status, actual_departure, actual_arrival ON bookings.flights
+            FOR EACH ROW
+            WHEN (OLD.status IS DISTINCT FROM NEW.status
+                  OR OLD.actual_departure IS DISTINCT FROM NEW.actual_departure
+                  OR OLD.actual_arrival IS DISTINCT FROM NEW.actual_arrival)
+            EXECUTE FUNCTION bookings.notify_flight_changed()
+        """,
+    ]),
+    TrigramIndexMigration(5, "Триграммный индекс для поиска по имени пассажира", [
+        """
+        CREATE INDEX IF NOT EXISTS tickets_passenger_name_trgm_idx
+            ON bookings.tickets USING gin (passenger_name gin_trgm_ops)
+        """,
+    ]),
+    Migration(6, "Счетчики номеров посадки по рейсам", [
+        BoardingNumberAllocator.CREATE_TABLE_QUERY,
+    ]),
+    # GIN не выдает строки в порядке расстояния <<->, GiST - выдает (поиск ближайших)
+    TrigramIndexMigration(7, "GiST-индекс вместо GIN для поиска по имени пассажира", [
+        """
+        CREATE INDEX IF NOT EXISTS tickets_passenger_name_trgm_gist_idx
+            ON bookings.tickets USING gist (passenger_name gist_trgm_ops)
+        """,
+        "DROP INDEX IF EXISTS bookings.tickets_passenger_name_trgm_idx",
+    ]),
+
+]
+
+
+class SchemaManager:
+    """Проверка и обновление схемы один раз при запуске приложения"""
+
+    VERSION_TABLE = 'bookings.schema_version'
+    # Ключ advisory-блокировки: миграции не выполняются параллельно несколькими клиентами
+    LOCK_KEY = 740211
+
+    def __init__(self, db, trusted=False, migrations=None, retry_skipped=False):
+        self.db = db
+        self.trusted = trusted  # Доверенная схема: проверка полностью пропускается
+        # Повторить пропущенные миграции (например, после установки pg_trgm на сервере)
+        self.retry_skipped = retry_skipped
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda migration: migration.version)
+
+    @property
+    def latest_version(self):
+        return self.migrations[-1].version if self.migrations else 0
+
+    def applied_versions(self, include_skipped=True):
+        """Версии примененных (и по умолчанию пропущенных) миграций - один запрос к базе"""
+        query = f"SELECT version FROM {self.VERSION_TABLE}"
+        if not include_skipped:
+            query += " WHERE NOT skipped"
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(query)
+                return {row['version'] for row in cursor.fetchall()}
+        except (errors.UndefinedTable, errors.UndefinedColumn):
+            return set()
+
+    def pending(self, applied):
+        """Миграции, еще не примененные к базе"""
+        return [migration for migration in self.migrations if migration.version not in applied]
+
+    def ensure(self):
+        """Применение недостающих миграций; возвращает True, если все миграции применены"""
+        if self.trusted:
+            print("Проверка схемы пропущена (доверенная схема)")
+            return True
+
+        try:
+            applied = self.applied_versions(include_skipped=not self.retry_skipped)
+            if not self.pending(applied):
+                print(f"Схема базы данных актуальна (версия {self.latest_version})")
+                return True
+            return self.migrate()
+        except Exception as e:
+            print(f"Ошибка при обновлении схемы базы данных: {e}")
+            return False
+
+    def migrate(self):
+        """Применение недостающих миграций, каждой - в своей транзакции
+
+        Версия записывается в той же транзакции, что и изменения миграции: ошибка
+        одной миграции не откатывает уже примененные и не мешает следующим, а сама
+        миграция повторяется при следующем запуске. Пропущенная миграция записывается
+        с пометкой skipped и повторяется только по запросу (retry_skipped), чтобы
+        обычный запуск не выполнял миграции заново. Возвращает True, если ошибок не было.
+        """
+        with self.db.transaction(), self.db.get_cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (self.LOCK_KEY,))
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.VERSION_TABLE}
+                (
+                    version integer NOT NULL,
+                    description text NOT NULL,
+                    applied_at timestamp with time zone NOT NULL DEFAULT now(),
+                    skipped boolean NOT NULL DEFAULT false,
+                    CONSTRAINT schema_version_pkey PRIMARY KEY (version)
+                )
+            """)
+            cursor.execute(f"""
+                ALTER TABLE {self.VERSION_TABLE} ADD COLUMN IF NOT EXISTS skipped boolean NOT NULL DEFAULT false
+            """)
+
+        ok = True
+        for migration in self.migrations:
+            try:
+                with self.db.transaction(), self.db.get_cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_xact_lock(%s)", (self.LOCK_KEY,))
+
+                    # Версию перечитываем под блокировкой: миграцию мог применить другой клиент
+                    cursor.execute(f"SELECT skipped FROM {self.VERSION_TABLE} WHERE version = %s",
+                                   (migration.version,))
+                    recorded = cursor.fetchone()
+                    if recorded is not None and not (recorded['skipped'] and self.retry_skipped):
+                        continue
+                    applied = migration.apply(cursor)
+                    if applied:
+                        cursor.execute(f"""
+                            INSERT INTO {self.VERSION_TABLE} (version, description) VALUES (%s, %s)
+                            ON CONFLICT (version) DO UPDATE
+                            SET description = EXCLUDED.description, applied_at = now(), skipped = false
+                        """, (migration.version, migration.description))
+                    elif recorded is None:
+                        cursor.execute(
+                            f"INSERT INTO {self.VERSION_TABLE} (version, description, skipped) VALUES (%s, %s, true)",
+                            (migration.version, migration.description)
+                        )
+                if applied:
+                    print(f"Применена миграция схемы {migration.version}: {migration.description}")
+                else:
+                    print(f"Миграция схемы {migration.version} ({migration.description}) пропущена")
+            except Exception as e:
+                ok = False
+                print(f"Ошибка миграции схемы {migration.version} ({migration.description}): {e}")
+        return ok
\ No newline at end of file
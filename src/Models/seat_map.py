@@ -0,0 +1,263 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Таблица, запись в которую меняет схемы мест самолетов
+_SEATS_TABLE = 'bookings.seats'
+
+# Сколько рейсов держать в памяти (вытесняются давно не использованные)
+DEFAULT_MAX_FLIGHTS = 500
+# Занятость рейса перечитывается не реже, чем раз в столько секунд: места могут занимать другие клиенты
+DEFAULT_OCCUPANCY_TTL = 60.0
+
+# Состояние места рейса
+SEAT_FREE = 'free'
+SEAT_OCCUPIED = 'occupied'
+SEAT_UNKNOWN = 'unknown'  # В самолете рейса нет такого места
+
+_SEAT_NO = re.compile(r'(\d+)(\D*)')
+
+
+def _seat_order(seat_no):
+    """Порядок мест в салоне: по номеру ряда, затем по букве (2A после 1K, 10A после 9K)"""
+    match = _SEAT_NO.match(seat_no)
+    if match is None:
+        return (0, seat_no)
+    return (int(match.group(1)), match.group(2))
+
+
+def _iter_bits(mask):
+    """Номера установленных битов по возрастанию"""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class SeatLayout:
+    """Схема мест самолета: номер места -> номер бита и маски мест по классам обслуживания"""
+
+    def __init__(self, aircraft_code, seats):
+        self.aircraft_code = aircraft_code
+        ordered = sorted(seats, key=lambda seat: _seat_order(seat[0]))
+        self.seat_numbers = [seat_no for seat_no, _ in ordered]
+        self.index = {seat_no: position for position, seat_no in enumerate(self.seat_numbers)}
+        self.fare_conditions = {}
+        self.fare_masks = {}
+        for position, (seat_no, fare_conditions) in enumerate(ordered):
+            self.fare_conditions[seat_no] = fare_conditions
+            self.fare_masks[fare_conditions] = self.fare_masks.get(fare_conditions, 0) | (1 << position)
+        self.fare_sizes = {fare: bin(mask).count('1') for fare, mask in self.fare_masks.items()}
+        self.all_mask = (1 << len(self.seat_numbers)) - 1
+
+    def __len__(self):
+        return len(self.seat_numbers)
+
+
+class SeatOccupancy:
+    """Занятость мест одного рейса в виде битовой маски по схеме самолета"""
+
+    def __init__(self, flight_id, layout, occupied=()):
+        self.flight_id = flight_id
+        self.layout = layout
+        self.bits = 0
+        self.occupied_by_fare = dict.fromkeys(layout.fare_masks, 0)
+        self.loaded_at = time.monotonic()
+        for seat_no in occupied:
+            self.occupy(seat_no)
+
+    def status(self, seat_no):
+        position = self.layout.index.get(seat_no)
+        if position is None:
+            return SEAT_UNKNOWN
+        return SEAT_OCCUPIED if self.bits >> position & 1 else SEAT_FREE
+
+    def occupy(self, seat_no):
+        """Отметка места занятым; False - такого места нет в самолете"""
+        position = self.layout.index.get(seat_no)
+        if position is None:
+            return False
+        bit = 1 << position
+        if not self.bits & bit:
+            self.bits |= bit
+            self.occupied_by_fare[self.layout.fare_conditions[seat_no]] += 1
+        return True
+
+    def release(self, seat_no):
+        """Освобождение места"""
+        position = self.layout.index.get(seat_no)
+        if position is None:
+            return
+        bit = 1 << position
+        if self.bits & bit:
+            self.bits &= ~bit
+            self.occupied_by_fare[self.layout.fare_conditions[seat_no]] -= 1
+
+    def free_count(self, fare_conditions=None):
+        """Количество свободных мест (всего или в классе обслуживания)"""
+        if fare_conditions is None:
+            return len(self.layout) - sum(self.occupied_by_fare.values())
+        return self.layout.fare_sizes.get(fare_conditions, 0) - self.occupied_by_fare.get(fare_conditions, 0)
+
+    def _free_mask(self, fare_conditions=None):
+        mask = self.layout.all_mask if fare_conditions is None else self.layout.fare_masks.get(fare_conditions, 0)
+        return mask & ~self.bits
+
+    def first_free(self, fare_conditions=None):
+        """Первое свободное место по порядку в салоне или None"""
+        mask = self._free_mask(fare_conditions)
+        if not mask:
+            return None
+        return self.layout.seat_numbers[(mask & -mask).bit_length() - 1]
+
+    def free_seats(self, fare_conditions=None):
+        """Свободные места по порядку в салоне"""
+        seat_numbers = self.layout.seat_numbers
+        return [seat_numbers[position] for position in _iter_bits(self._free_mask(fare_conditions))]
+
+    def occupied_seats(self):
+        """Занятые места по порядку в салоне"""
+        seat_numbers = self.layout.seat_numbers
+        return [seat_numbers[position] for position in _iter_bits(self.bits)]
+
+
+class SeatMapCache:
+    """Карты мест рейсов в памяти процесса
+
+    Схема мест читается из bookings.seats один раз на самолет, занятость рейса -
+    одним запросом по посадочным талонам при первом обращении. Дальше модель
+    BoardingPass обновляет карту при создании, пересадке и удалении талона,
+    поэтому проверка места и поиск свободных мест запросов к базе не требуют.
+    Места, занятые другими клиентами, появляются после перечитывания занятости
+    (не реже раза в ttl секунд); окончательную проверку выполняет уникальный
+    ключ (flight_id, seat_no) в базе.
+    """
+
+    def __init__(self, db, max_flights=DEFAULT_MAX_FLIGHTS, ttl=DEFAULT_OCCUPANCY_TTL):
+        self.db = db
+        self.max_flights = max_flights
+        self.ttl = ttl
+        self._layouts = {}  # Код самолета -> SeatLayout
+        self._flights = OrderedDict()  # ID рейса -> SeatOccupancy (LRU)
+        self._generation = 0
+        self._lock = threading.Lock()
+        db.add_change_listener(self.invalidate)
+
+    def invalidate(self, table=None):
+        """Сброс схем и карт (при записи в seats)
+
+        Запись в flights (статус, фактическое время) схему мест не меняет; рейсы,
+        у которых сменился самолет или которые удалены, сбрасываются по одному
+        через invalidate_flights.
+        """
+        if table is None or table == _SEATS_TABLE:
+            with self._lock:
+                self._generation += 1
+                self._flights.clear()
+                self._layouts.clear()
+
+    def invalidate_flights(self, flight_ids):
+        """Сброс карт рейсов (перечитываются при следующем обращении)"""
+        with self._lock:
+            for flight_id in flight_ids:
+                self._flights.pop(flight_id, None)
+
+    def get(self, flight_id):
+        """Карта мест рейса или None (рейс не найден или данные не удалось прочитать)"""
+        with self._lock:
+            occupancy = self._flights.get(flight_id)
+            if occupancy is not None:
+                if time.monotonic() - occupancy.loaded_at <= self.ttl:
+                    self._flights.move_to_end(flight_id)
+                    return occupancy
+                del self._flights[flight_id]
+            generation = self._generation
+        return self._load_flight(flight_id, generation)
+
+    def seat_status(self, flight_id, seat_no):
+        """SEAT_FREE, SEAT_OCCUPIED, SEAT_UNKNOWN или None, если карта недоступна"""
+        occupancy = self.get(flight_id)
+        if occupancy is None:
+            return None
+        with self._lock:
+            return occupancy.status(seat_no)
+
+    def free_seats(self, flight_id, fare_conditions=None):
+        occupancy = self.get(flight_id)
+        if occupancy is None:
+            return []
+        with self._lock:
+            return occupancy.free_seats(fare_conditions)
+
+    def free_count(self, flight_id, fare_conditions=None):
+        occupancy = self.get(flight_id)
+        if occupancy is None:
+            return None
+        with self._lock:
+            return occupancy.free_count(fare_conditions)
+
+    def first_free(self, flight_id, fare_conditions=None):
+        occupancy = self.get(flight_id)
+        if occupancy is None:
+            return None
+        with self._lock:
+            return occupancy.first_free(fare_conditions)
+
+    def occupied_seats(self, flight_id):
+        """Занятые места рейса или None, если карта недоступна"""
+        occupancy = self.get(flight_id)
+        if occupancy is None:
+            return None
+        with self._lock:
+            return occupancy.occupied_seats()
+
+    def occupy(self, flight_id, seat_no):
+        """Место занято (после записи в базу); незагруженные карты не читаются"""
+        with self._lock:
+            occupancy = self._flights.get(flight_id)
+            if occupancy is not None and not occupancy.occupy(seat_no):
+                # Места нет в схеме - карта устарела
+                del self._flights[flight_id]
+
+    def release(self, flight_id, seat_no):
+        """Место освобождено (после записи в базу)"""
+        with self._lock:
+            occupancy = self._flights.get(flight_id)
+            if occupancy is not None:
+                occupancy.release(seat_no)
+
+    def _load_flight(self, flight_id, generation):
+        try:
+            with self.db.get_cursor(tuple_rows=True) as cursor:
+                cursor.execute("SELECT aircraft_code FROM bookings.flights WHERE flight_id = %s", (flight_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                layout = self._get_layout(cursor, row[0])
+                cursor.execute("SELECT seat_no FROM bookings.boarding_passes WHERE flight_id = %s", (flight_id,))
+                occupied = [seat_no for seat_no, in cursor.fetchall()]
+        except Exception as e:
+            print(f"Ошибка при чтении карты мест рейса {flight_id}: {e}")
+            return None
+
+        occupancy = SeatOccupancy(flight_id, layout, occupied)
+        with self._lock:
+            # Карта, прочитанная до сброса, не сохраняется
+            if generation == self._generation:
+                self._flights[flight_id] = occupancy
+                while len(self._flights) > self.max_flights:
+                    self._flights.popitem(last=False)
+        return occupancy
+
+    def _get_layout(self, cursor, aircraft_code):
+        with self._lock:
+            layout = self._layouts.get(aircraft_code)
+        if layout is not None:
+            return layout
+        cursor.execute("SELECT seat_no, fare_conditions FROM bookings.seats WHERE aircraft_code = %s",
+                       (aircraft_code,))
+        layout = SeatLayout(aircraft_code, cursor.fetchall())
+        with self._lock:
+            self._layouts[aircraft_code] = layout
+        return layout
\ No newline at end of file
@@ -0,0 +1,18 @@
+from src.Models.database import DEFAULT_ITERSIZE
+
+
+def iter_models(db, query, params, factory, itersize=DEFAULT_ITERSIZE, error_message="Ошибка при чтении данных"):
+    """Ленивое построение объектов моделей по строкам серверного курсора
+
+    factory(row) создает объект модели из строки-кортежа. Генератор можно прервать
+    в любой момент (break, close()) - серверный курсор и транзакция при этом
+    закрываются сразу, а не при сборке мусора.
+    """
+    rows = db.stream(query, params, itersize, tuple_rows=True)
+    try:
+        for row in rows:
+            yield factory(row)
+    except Exception as e:
+        print(f"{error_message}: {e}")
+    finally:
+        rows.close()
\ No newline at end of file
@@ -5,6 +5,15 @@ import json
 
 
 class AircraftView(BaseView):
+    # Таблица для экспорта (см. src/Models/export.py)
+    export_table = 'aircrafts'
+
+    # Ключ строки таблицы
+    row_key = ('aircraft_code',)
+
+    # Таблица страниц (кэш страниц сбрасывается при записи в нее)
+    source_table = 'bookings.aircrafts_data'
+
     def setup_ui(self):
         """Настройка UI для самолетов с пагинацией"""
         # Заголовок
@@ -79,32 +88,20 @@ class AircraftView(BaseView):
         # Устанавливаем позицию
         dialog.geometry(f"+{x}+{y}")
 
-    def refresh_data(self):
-        """Обновление данных в таблице с пагинацией"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Получаем параметры пагинации
-        offset, limit = self.get_pagination_params()
-
-        # Получаем данные с пагинацией
-        aircrafts, total = self.controller.get_all_aircrafts_paginated(offset, limit)
-        self.total_records = total
-
-        for aircraft in aircrafts:
-            # Форматируем JSON модель для отображения
-            model_str = str(aircraft.model)[:200] if aircraft.model else "Нет данных"
-            model_str = model_str.replace('{', '').replace('}', '').replace("'", "")
-
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы самолетов"""
+        return self.controller.get_aircrafts_page(limit, token, backward, summary=True)
 
-            self.tree.insert('', 'end', values=(
-                aircraft.aircraft_code,
-                model_str,
-                aircraft.range
-            ))
+    def format_row(self, aircraft):
+        """Значения строки таблицы для самолета"""
+        # Название модели на языке отображения извлекается на сервере (см. SUMMARY_COLUMNS)
+        model_str = str(aircraft.model) if aircraft.model else "Нет данных"
 
-        # Обновляем элементы управления пагинацией
-        self.update_pagination_controls()
+        return (
+            aircraft.aircraft_code,
+            model_str,
+            aircraft.range
+        )
 
     def show_create_dialog(self):
         """Диалог создания самолета"""
@@ -1,10 +1,19 @@
 import tkinter as tk
 from src.View.BaseView import BaseView
 from tkinter import ttk, messagebox
-import json
+from src.Models.json_fields import to_json
 
 
 class AirportView(BaseView):
+    # Таблица для экспорта (см. src/Models/export.py)
+    export_table = 'airports'
+
+    # Ключ строки таблицы
+    row_key = ('airport_code',)
+
+    # Таблица страниц (кэш страниц сбрасывается при записи в нее)
+    source_table = 'bookings.airports_data'
+
     def setup_ui(self):
         """Настройка UI для аэропортов с пагинацией"""
         # Заголовок
@@ -90,52 +99,39 @@ class AirportView(BaseView):
         # Устанавливаем позицию
         dialog.geometry(f"+{x}+{y}")
 
-    def refresh_data(self):
-        """Обновление данных в таблице с пагинацией"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Получаем параметры пагинации
-        offset, limit = self.get_pagination_params()
-
-        # Получаем данные с пагинацией
-        airports, total = self.controller.get_all_airports_paginated(offset, limit)
-        self.total_records = total
-
-        for airport in airports:
-            # Форматируем JSON данные для отображения
-            airport_name_str = str(airport.airport_name)[:200] if airport.airport_name else "Нет данных"
-            airport_name_str = airport_name_str.replace('{', '').replace('}', '').replace("'", "")
-
-            city_str = str(airport.city)[:200] if airport.city else "Нет данных"
-            city_str = city_str.replace('{', '').replace('}', '').replace("'", "")
-
-            # Извлекаем координаты из строки POINT
-            coords = airport.coordinates.replace('POINT(', '').replace(')', '')
-
-            # Форматируем координаты в формат XX.XXXX
-            try:
-                # Разделяем координаты на долготу и широту
-                lon, lat = coords.split()
-                # Форматируем каждую координату
-                formatted_lon = f"{float(lon):.4f}"
-                formatted_lat = f"{float(lat):.4f}"
-                # Объединяем обратно
-                coords = f"{formatted_lon} {formatted_lat}"
-            except (ValueError, AttributeError):
-                # Если возникла ошибка при преобразовании, оставляем исходное значение
-                coords = coords if coords else "Нет данных"
-
-            self.tree.insert('', 'end', values=(
-                airport.airport_code,
-                airport_name_str,
-                city_str,
-                coords,
-                airport.timezone
-            ))
-
-        # Обновляем элементы управления пагинацией
-        self.update_pagination_controls()
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы аэропортов"""
+        return self.controller.get_airports_page(limit, token, backward, summary=True)
+
+    def format_row(self, airport):
+        """Значения строки таблицы для аэропорта"""
+        # Название и город на языке отображения извлекаются на сервере (см. SUMMARY_COLUMNS)
+        airport_name_str = str(airport.airport_name) if airport.airport_name else "Нет данных"
+        city_str = str(airport.city) if airport.city else "Нет данных"
+
+        # Извлекаем координаты из строки POINT
+        coords = airport.coordinates.replace('POINT(', '').replace(')', '')
+
+        # Форматируем координаты в формат XX.XXXX
+        try:
+            # Разделяем координаты на долготу и широту
+            lon, lat = coords.split()
+            # Форматируем каждую координату
+            formatted_lon = f"{float(lon):.4f}"
+            formatted_lat = f"{float(lat):.4f}"
+            # Объединяем обратно
+            coords = f"{formatted_lon} {formatted_lat}"
+        except (ValueError, AttributeError):
+            # Если возникла ошибка при преобразовании, оставляем исходное значение
+            coords = coords if coords else "Нет данных"
+
+        return (
+            airport.airport_code,
+            airport_name_str,
+            city_str,
+            coords,
+            airport.timezone
+        )
 
     def show_create_dialog(self):
         """Диалог создания аэропорта"""
@@ -370,7 +366,7 @@ class AirportView(BaseView):
 
             result = f"Аэропорты в радиусе {radius} км:\n\n"
             for airport, distance in nearby_airports:
-                airport_name_str = json.dumps(airport.airport_name, ensure_ascii=False)
+                airport_name_str = to_json(airport.airport_name)
                 result += f"• {airport.airport_code}: {airport_name_str} - {distance:.1f} км\n"
 
             messagebox.showinfo("Ближайшие аэропорты", result)
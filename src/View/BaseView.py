@@ -1,11 +1,34 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+import threading
+from tkinter import ttk, messagebox, filedialog
 import json
+from src.View.background import run_in_background
+from src.View.tree_diff import KeyedRows
+from src.View.virtual_grid import VirtualGrid
+from src.View.page_cache import PageCache, DEFAULT_PREFETCH_DEPTH
+from src.Controllers.ExportController import ExportController
+from src.Models.export import ExportCancelled
 
 
 class BaseView:
     """Базовый класс для всех представлений с пагинацией"""
 
+    # Имя таблицы для экспорта (None - экспорт для вкладки недоступен)
+    export_table = None
+
+    # Поля записи, составляющие ключ строки таблицы (первичный ключ)
+    row_key = None
+
+    # Таблица страниц: кэш страниц сбрасывается при записи в нее через модели
+    source_table = None
+    # Сколько соседних страниц в каждую сторону загружается заранее (0 - без упреждения)
+    prefetch_depth = DEFAULT_PREFETCH_DEPTH
+
+    # Просмотр всей таблицы виртуальным списком (нужен fetch_chunk)
+    virtual_mode = False
+    # Подпись необязательного фильтра виртуального списка (None - без фильтра)
+    virtual_filter_label = None
+
     def __init__(self, tab, controller, tab_name):
         self.tab = tab
         self.controller = controller
@@ -13,6 +36,19 @@ class BaseView:
         self.current_page = 1
         self.page_size = 50  # Количество записей на странице
         self.total_records = 0
+        # Пагинация по ключу: токен границы, направление и размер запрашиваемой страницы
+        self.page_token = None
+        self.page_backward = False
+        self.page_limit = self.page_size
+        self.page = None  # Последняя загруженная страница (KeysetPage)
+        # Номер последнего запроса: ответы на устаревшие запросы отбрасываются
+        self.load_sequence = 0
+        self.loading = False
+        self._tree_rows = None
+        # Загруженные и загружаемые заранее страницы; ожидаемая страница - (номер запроса, ключ)
+        self.page_cache = PageCache()
+        self.waiting_page = None
+        self.controller.db.add_change_listener(self.on_table_changed)
         self.setup_ui()
 
     def center_dialog(self, dialog):
@@ -83,45 +119,94 @@ class BaseView:
         self.total_label = ttk.Label(pagination_frame, text="Всего: 0")
         self.total_label.pack(side=tk.LEFT, padx=20)
 
+        # Индикатор фоновой загрузки
+        self.loading_label = ttk.Label(pagination_frame, text="", foreground='gray')
+        self.loading_label.pack(side=tk.LEFT, padx=5)
+
+        # Просмотр всей таблицы без страниц
+        if self.virtual_mode:
+            ttk.Button(pagination_frame, text="Вся таблица...",
+                       command=self.show_virtual_window).pack(side=tk.LEFT, padx=10)
+
+        # Экспорт всей таблицы (а не только текущей страницы)
+        if self.export_table:
+            ttk.Button(pagination_frame, text="Экспорт...",
+                       command=self.show_export_dialog).pack(side=tk.LEFT, padx=10)
+
         return pagination_frame
 
     def update_pagination_controls(self):
         """Обновление состояния элементов управления пагинацией"""
-        total_pages = max(1, (self.total_records + self.page_size - 1) // self.page_size)
-
-        # Обновляем информацию о странице
-        self.page_label.config(text=f"Страница {self.current_page} из {total_pages}")
-        self.total_label.config(text=f"Всего: {self.total_records}")
-
-        # Обновляем состояние кнопок
-        self.first_btn.config(state='normal' if self.current_page > 1 else 'disabled')
-        self.prev_btn.config(state='normal' if self.current_page > 1 else 'disabled')
-        self.next_btn.config(state='normal' if self.current_page < total_pages else 'disabled')
-        self.last_btn.config(state='normal' if self.current_page < total_pages else 'disabled')
+        total_pages = self.get_total_pages()
+
+        # Приблизительное количество (оценка планировщика) помечается тильдой
+        approximate = "~" if self.page and self.page.estimated else ""
+        # Номер страницы, отсчитанной с конца при оценочном количестве, неизвестен
+        number = "?" if self.current_page is None else self.current_page
+        self.page_label.config(text=f"Страница {number} из {approximate}{total_pages}")
+        self.total_label.config(text=f"Всего: {approximate}{self.total_records}")
+
+        # Обновляем состояние кнопок по наличию соседних страниц
+        has_prev = self.page.has_prev if self.page else self.current_page > 1
+        has_next = self.page.has_next if self.page else (self.current_page or 1) < total_pages
+        self.first_btn.config(state='normal' if has_prev else 'disabled')
+        self.prev_btn.config(state='normal' if has_prev else 'disabled')
+        self.next_btn.config(state='normal' if has_next else 'disabled')
+        self.last_btn.config(state='normal' if has_next else 'disabled')
+
+    def get_total_pages(self):
+        """Общее количество страниц"""
+        return max(1, (self.total_records + self.page_size - 1) // self.page_size)
+
+    def set_page_request(self, token=None, backward=False, limit=None):
+        """Установка параметров следующего запроса страницы"""
+        self.page_token = token
+        self.page_backward = backward
+        self.page_limit = limit or self.page_size
 
     def first_page(self):
         """Переход на первую страницу"""
         self.current_page = 1
-        self.refresh_data()
+        self.set_page_request()
+        self.refresh_data(use_cache=True)
 
     def prev_page(self):
         """Переход на предыдущую страницу"""
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.refresh_data()
+        if self.page and self.page.has_prev:
+            if self.current_page is None:
+                # Номер неизвестен - идем назад от первой записи страницы
+                self.set_page_request(self.page.prev_token, backward=True)
+            else:
+                self.current_page = max(1, self.current_page - 1)
+                if self.current_page == 1:
+                    self.set_page_request()
+                else:
+                    self.set_page_request(self.page.prev_token, backward=True)
+            self.refresh_data(use_cache=True)
 
     def next_page(self):
         """Переход на следующую страницу"""
-        total_pages = max(1, (self.total_records + self.page_size - 1) // self.page_size)
-        if self.current_page < total_pages:
-            self.current_page += 1
-            self.refresh_data()
+        if self.page and self.page.has_next:
+            if self.current_page is not None:
+                self.current_page += 1
+            self.set_page_request(self.page.next_token)
+            self.refresh_data(use_cache=True)
 
     def last_page(self):
-        """Переход на последнюю страницу"""
-        total_pages = max(1, (self.total_records + self.page_size - 1) // self.page_size)
-        self.current_page = total_pages
-        self.refresh_data()
+        """Переход на последнюю страницу
+
+        Последняя страница читается с конца. Только при точном количестве записей
+        известны ее номер и неполный остаток, сохраняющий границы страниц; при
+        оценке планировщика читается полная страница, а номер остается неизвестным.
+        """
+        if self.page and not self.page.estimated:
+            self.current_page = self.get_total_pages()
+            remainder = self.total_records % self.page_size
+            self.set_page_request(backward=True, limit=remainder or self.page_size)
+        else:
+            self.current_page = None
+            self.set_page_request(backward=True)
+        self.refresh_data(use_cache=True)
 
     def change_page_size(self, event=None):
         """Изменение количества записей на странице"""
@@ -130,18 +215,344 @@ class BaseView:
             if new_size != self.page_size:
                 self.page_size = new_size
                 self.current_page = 1  # Сбрасываем на первую страницу
-                self.refresh_data()
+                self.set_page_request()
+                self.refresh_data(use_cache=True)
         except ValueError:
             pass
 
     def get_pagination_params(self):
         """Получение параметров пагинации для запроса"""
-        offset = (self.current_page - 1) * self.page_size
+        offset = ((self.current_page or 1) - 1) * self.page_size
         return offset, self.page_size
 
-    def refresh_data(self):
-        """Обновление данных (должен быть переопределен в дочерних классах)"""
-        pass
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы данных от контроллера (должен быть переопределен в дочерних классах)
+
+        Выполняется в фоновом потоке: обращаться к виджетам здесь нельзя.
+        """
+        return None
+
+    def format_row(self, item):
+        """Значения строки таблицы для записи (должен быть переопределен в дочерних классах)"""
+        return ()
+
+    def fetch_chunk(self, limit, token, offset, filter_value, keys_only=False):
+        """Получение порции записей для виртуального списка (должен быть переопределен при virtual_mode)
+
+        keys_only - достаточно колонок ключа сортировки (поиск границы порции).
+
+        Выполняется в фоновом потоке: обращаться к виджетам здесь нельзя.
+        """
+        return None
+
+    def row_id(self, item):
+        """Идентификатор строки таблицы для записи по row_key (None - назначается таблицей)"""
+        if not self.row_key:
+            return None
+        return '|'.join(str(getattr(item, field)) for field in self.row_key)
+
+    @property
+    def tree_rows(self):
+        """Показанные строки таблицы по ключу (обновляются по разнице, а не пересозданием)"""
+        if self._tree_rows is None:
+            self._tree_rows = KeyedRows(self.tree)
+        return self._tree_rows
+
+    def show_rows(self, items):
+        """Отображение записей в таблице с изменением только отличающихся строк"""
+        return self.tree_rows.apply([(self.row_id(item), self.format_row(item)) for item in items])
+
+    def refresh_data(self, use_cache=False):
+        """Обновление данных текущей страницы (запрос выполняется в фоновом потоке)
+
+        use_cache=True (навигация по страницам) - страница берется из кэша или
+        дожидается уже начатой загрузки заранее; иначе кэш сбрасывается и
+        страница читается заново.
+        """
+        self.load_sequence += 1
+        sequence = self.load_sequence
+        key = (self.page_limit, self.page_token, self.page_backward)
+        self.waiting_page = None
+
+        if use_cache:
+            page = self.page_cache.get(key)
+            if page is not None:
+                self.on_page_loaded(sequence, page)
+                return
+            if self.page_cache.is_pending(key):
+                # Страница уже загружается заранее - показываем ее по готовности
+                self.set_loading(True)
+                self.waiting_page = (sequence, key)
+                return
+        else:
+            self.page_cache.clear()
+
+        self.load_page(sequence, key)
+
+    def load_page(self, sequence, key):
+        """Фоновая загрузка страницы для показа"""
+        limit, token, backward = key
+        generation = self.page_cache.generation
+
+        def on_loaded(page):
+            self.page_cache.put(key, page, generation)
+            self.on_page_loaded(sequence, page)
+
+        self.set_loading(True)
+        run_in_background(
+            self.tab,
+            lambda: self.fetch_page(limit, token, backward),
+            on_loaded,
+            lambda error: self.on_page_failed(sequence, error)
+        )
+
+    def on_page_loaded(self, sequence, page):
+        """Обработка загруженной страницы в главном потоке"""
+        if sequence != self.load_sequence:
+            return  # Пользователь уже запросил другую страницу
+        self.set_loading(False)
+        if page is not None:
+            self.display_page(page)
+            self.prefetch_adjacent(page)
+        else:
+            self.update_pagination_controls()
+
+    def page_keys(self, page, number):
+        """Ключи запросов соседних страниц так, как их строят next_page и prev_page"""
+        next_key = (self.page_size, page.next_token, False) if page.has_next else None
+        prev_key = None
+        if page.has_prev and (number is None or number > 1):
+            prev_key = (self.page_size, None, False) if number == 2 else (self.page_size, page.prev_token, True)
+        return next_key, prev_key
+
+    @staticmethod
+    def shift_page_number(number, direction):
+        """Номер соседней страницы (None - номер неизвестен)"""
+        return None if number is None else number + direction
+
+    def prefetch_adjacent(self, page):
+        """Загрузка заранее соседних страниц после показа текущей"""
+        if self.prefetch_depth <= 0:
+            return
+        next_key, prev_key = self.page_keys(page, self.current_page)
+        self.prefetch(next_key, self.shift_page_number(self.current_page, 1), 1, self.prefetch_depth)
+        self.prefetch(prev_key, self.shift_page_number(self.current_page, -1), -1, self.prefetch_depth)
+
+    def prefetch(self, key, number, direction, depth):
+        """Фоновая загрузка страницы в кэш; далее - следующей в том же направлении"""
+        if key is None or depth <= 0 or not self.page_cache.start_pending(key):
+            return
+        limit, token, backward = key
+        generation = self.page_cache.generation
+
+        def on_loaded(page):
+            self.page_cache.put(key, page, generation)
+            stale = generation != self.page_cache.generation
+            if self.waiting_page and self.waiting_page[1] == key:
+                sequence = self.waiting_page[0]
+                self.waiting_page = None
+                if stale:
+                    # Таблица изменилась, пока страница загружалась
+                    self.load_page(sequence, key)
+                else:
+                    self.on_page_loaded(sequence, page)
+            if page is not None and not stale:
+                next_key, prev_key = self.page_keys(page, number)
+                self.prefetch(next_key if direction > 0 else prev_key, self.shift_page_number(number, direction),
+                              direction, depth - 1)
+
+        def on_failed(error):
+            self.page_cache.discard_pending(key)
+            if self.waiting_page and self.waiting_page[1] == key:
+                sequence = self.waiting_page[0]
+                self.waiting_page = None
+                self.on_page_failed(sequence, error)
+
+        run_in_background(self.tab, lambda: self.fetch_page(limit, token, backward), on_loaded, on_failed)
+
+    def on_table_changed(self, table):
+        """Сброс кэша страниц при записи в таблицу (вызывается в потоке, выполнившем запись)"""
+        if table == self.source_table:
+            self.page_cache.clear()
+
+    def on_page_failed(self, sequence, error):
+        """Обработка ошибки фоновой загрузки"""
+        if sequence != self.load_sequence:
+            return
+        self.set_loading(False)
+        self.update_pagination_controls()
+        print(f"Ошибка при загрузке данных вкладки {self.tab_name}: {error}")
+        messagebox.showerror("Ошибка", f"Не удалось загрузить данные: {error}")
+
+    def set_loading(self, loading):
+        """Показ индикатора загрузки и блокировка навигации на время запроса"""
+        self.loading = loading
+        self.loading_label.config(text="Загрузка..." if loading else "")
+        self.tree.config(cursor='watch' if loading else '')
+        if loading:
+            for button in (self.first_btn, self.prev_btn, self.next_btn, self.last_btn):
+                button.config(state='disabled')
+
+    def display_page(self, page):
+        """Отображение загруженной страницы в таблице"""
+        self.page = page
+        self.total_records = page.total
+        if not page.has_prev:
+            self.current_page = 1  # Дошли до начала от страницы с неизвестным номером
+
+        self.show_rows(page.items)
+
+        # Обновляем элементы управления пагинацией
+        self.update_pagination_controls()
+
+    def show_virtual_window(self):
+        """Окно просмотра всей таблицы виртуальным списком"""
+        window = tk.Toplevel(self.tab)
+        window.title(f"{self.tab_name}: вся таблица")
+        window.transient(self.tab)
+
+        filter_entry = None
+        if self.virtual_filter_label:
+            filter_frame = ttk.Frame(window)
+            filter_frame.pack(fill='x', padx=10, pady=5)
+            ttk.Label(filter_frame, text=f"{self.virtual_filter_label}:").pack(side=tk.LEFT)
+            filter_entry = ttk.Entry(filter_frame, width=20)
+            filter_entry.pack(side=tk.LEFT, padx=5)
+
+        status_label = ttk.Label(window, text="")
+        filter_state = {'value': None}
+
+        def on_status(top, total, loading, exact):
+            approximate = "" if exact else "~"
+            text = f"Строки {min(top + 1, total)}-{min(top + grid.visible_rows, total)} из {approximate}{total}"
+            status_label.config(text=text + (" (загрузка...)" if loading else ""))
+
+        # Колонки и заголовки те же, что у таблицы вкладки
+        columns = [(name, self.tree.heading(name, 'text'), self.tree.column(name, 'width'))
+                   for name in self.tree['columns']]
+        grid = VirtualGrid(
+            window, columns,
+            lambda limit, token, offset: self.fetch_chunk(limit, token, offset, filter_state['value']),
+            self.format_row, self.row_id, on_status=on_status,
+            seek=lambda token, offset: self.fetch_chunk(1, token, offset, filter_state['value'], keys_only=True)
+        )
+        grid.frame.pack(fill='both', expand=True, padx=10, pady=5)
+        status_label.pack(anchor='w', padx=10, pady=(0, 10))
+
+        if filter_entry is not None:
+            def apply_filter(event=None):
+                filter_state['value'] = filter_entry.get().strip() or None
+                grid.reload()
+
+            ttk.Button(filter_entry.master, text="Применить", command=apply_filter).pack(side=tk.LEFT)
+            filter_entry.bind('<Return>', apply_filter)
+
+        grid.reload()
+        grid.tree.focus_set()
+
+    def show_export_dialog(self):
+        """Диалог потокового экспорта таблицы в CSV или JSON Lines"""
+        exporter = ExportController(self.controller.db)
+        formats = list(exporter.get_formats())
+
+        dialog = tk.Toplevel(self.tab)
+        dialog.title(f"Экспорт: {self.tab_name}")
+        dialog.transient(self.tab)
+        dialog.grab_set()
+
+        ttk.Label(dialog, text="Формат:").grid(row=0, column=0, sticky='w', padx=10, pady=5)
+        format_combo = ttk.Combobox(dialog, values=formats, width=37, state='readonly')
+        format_combo.set(formats[0])
+        format_combo.grid(row=0, column=1, padx=10, pady=5, sticky='ew')
+
+        # Необязательные фильтры (пустые значения не применяются)
+        entries = {}
+        row = 1
+        for name, label in exporter.get_filters(self.export_table):
+            ttk.Label(dialog, text=f"{label}:").grid(row=row, column=0, sticky='w', padx=10, pady=5)
+            entry = ttk.Entry(dialog, width=40)
+            entry.grid(row=row, column=1, padx=10, pady=5, sticky='ew')
+            entries[name] = entry
+            row += 1
+
+        progress_bar = ttk.Progressbar(dialog, mode='determinate', length=300)
+        progress_bar.grid(row=row, column=0, columnspan=2, padx=10, pady=5, sticky='ew')
+        progress_label = ttk.Label(dialog, text="")
+        progress_label.grid(row=row + 1, column=0, columnspan=2, padx=10, sticky='w')
+
+        # Обработчик прогресса вызывается в фоновом потоке и только запоминает значения,
+        # виджеты обновляются опросом из главного потока
+        state = {'rows': 0, 'total': None, 'running': False}
+        cancel_event = threading.Event()
+
+        def on_progress(rows, total):
+            state['rows'] = rows
+            state['total'] = total
+
+        def poll():
+            if not state['running']:
+                return
+            rows, total = state['rows'], state['total']
+            if total:
+                progress_bar.config(maximum=max(total, rows), value=rows)
+                progress_label.config(text=f"Выгружено строк: {rows} из ~{total}")
+            else:
+                progress_label.config(text=f"Выгружено строк: {rows}")
+            dialog.after(200, poll)
+
+        def on_done(rows):
+            state['running'] = False
+            messagebox.showinfo("Успех", f"Экспортировано строк: {rows}", parent=dialog)
+            dialog.destroy()
+
+        def on_failed(error):
+            state['running'] = False
+            if isinstance(error, ExportCancelled):
+                dialog.destroy()
+                return
+            print(f"Ошибка при экспорте вкладки {self.tab_name}: {error}")
+            messagebox.showerror("Ошибка", f"Не удалось выполнить экспорт: {error}", parent=dialog)
+            export_btn.config(state='normal')
+
+        def start():
+            fmt = format_combo.get()
+            path = filedialog.asksaveasfilename(
+                parent=dialog,
+                defaultextension=f".{fmt}",
+                initialfile=f"{self.export_table}.{fmt}",
+                filetypes=[(fmt.upper(), f"*.{fmt}"), ("Все файлы", "*.*")]
+            )
+            if not path:
+                return
+            filters = {name: entry.get().strip() for name, entry in entries.items()}
+
+            export_btn.config(state='disabled')
+            state['running'] = True
+            run_in_background(
+                dialog,
+                lambda: exporter.export(self.export_table, path, fmt, filters, on_progress, cancel_event),
+                on_done,
+                on_failed
+            )
+            poll()
+
+        def cancel():
+            if state['running']:
+                # Фоновый экспорт остановится на ближайшей проверке и удалит неполный файл
+                cancel_event.set()
+                progress_label.config(text="Отмена...")
+            else:
+                dialog.destroy()
+
+        button_frame = ttk.Frame(dialog)
+        button_frame.grid(row=row + 2, column=0, columnspan=2, pady=15)
+        export_btn = ttk.Button(button_frame, text="Экспорт", command=start)
+        export_btn.pack(side='left', padx=10)
+        ttk.Button(button_frame, text="Отмена", command=cancel).pack(side='left', padx=10)
+
+        dialog.protocol("WM_DELETE_WINDOW", cancel)
+        dialog.columnconfigure(1, weight=1)
+        self.center_dialog(dialog)
 
     def create_dialog(self, title, fields, callback, size="500x400"):
         """Создание диалогового окна с полями ввода"""
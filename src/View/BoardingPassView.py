@@ -2,9 +2,24 @@ import tkinter as tk
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.View.BaseView import BaseView
+from src.View.background import run_in_background
+from src.Models.seat_map import SEAT_OCCUPIED, SEAT_UNKNOWN
 
 
 class BoardingPassView(BaseView):
+    # Таблица для экспорта (см. src/Models/export.py)
+    export_table = 'boarding_passes'
+
+    # Ключ строки таблицы
+    row_key = ('ticket_no', 'flight_id')
+
+    # Таблица страниц (кэш страниц сбрасывается при записи в нее)
+    source_table = 'bookings.boarding_passes'
+
+    # Просмотр всех талонов (или талонов рейса) виртуальным списком
+    virtual_mode = True
+    virtual_filter_label = "ID рейса"
+
     def setup_ui(self):
         """Настройка UI для посадочных талонов с пагинацией"""
         # Заголовок
@@ -21,6 +36,7 @@ class BoardingPassView(BaseView):
             ("Показать все", self.refresh_data),
             ("Для рейса", self.show_by_flight_dialog),
             ("Создать", self.show_create_dialog),
+            ("Регистрация рейса", self.show_check_in_flight_dialog),
             ("Найти по билету", self.show_find_dialog),
             ("Найти по посадке", self.show_find_by_boarding_dialog),
             ("Обновить место", self.show_update_seat_dialog),
@@ -91,41 +107,36 @@ class BoardingPassView(BaseView):
         # Устанавливаем позицию
         dialog.geometry(f"+{x}+{y}")
 
-    def refresh_data(self):
-        """Обновление данных в таблице с пагинацией"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Получаем параметры пагинации
-        offset, limit = self.get_pagination_params()
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы посадочных талонов"""
+        return self.controller.get_boarding_passes_page(limit, token, backward)
 
-        # Получаем данные с пагинацией
-        boarding_passes, total = self.controller.get_all_boarding_passes_paginated(offset, limit)
-        self.total_records = total
+    def fetch_chunk(self, limit, token, offset, filter_value, keys_only=False):
+        """Получение порции посадочных талонов (фильтр - ID рейса)"""
+        flight_id = int(filter_value) if filter_value and filter_value.isdigit() else None
+        return self.controller.get_boarding_passes_chunk(limit, token, offset, flight_id, keys_only)
 
-        for bp in boarding_passes:
-            self.tree.insert('', 'end', values=(
-                bp.ticket_no,
-                bp.flight_id,
-                bp.boarding_no,
-                bp.seat_no
-            ))
-
-        # Обновляем элементы управления пагинацией
-        self.update_pagination_controls()
+    def format_row(self, bp):
+        """Значения строки таблицы для посадочного талона"""
+        return (
+            bp.ticket_no,
+            bp.flight_id,
+            bp.boarding_no,
+            bp.seat_no
+        )
 
     def show_create_dialog(self):
         """Диалог создания посадочного талона"""
         fields = {
             'ticket_no': {'label': 'Номер билета (13 символов):', 'type': 'entry'},
             'flight_id': {'label': 'ID рейса:', 'type': 'entry'},
-            'seat_no': {'label': 'Номер места (например, 12A):', 'type': 'entry'}
+            'seat_no': {'label': 'Номер места (пусто - первое свободное):', 'type': 'entry'}
         }
 
         def create_callback(data):
             ticket_no = data['ticket_no']
             flight_id_str = data['flight_id']
-            seat_no = data['seat_no']
+            seat_no = data['seat_no'].strip().upper()
 
             if len(ticket_no) != 13:
                 messagebox.showerror("Ошибка", "Номер билета должен содержать 13 символов")
@@ -137,17 +148,96 @@ class BoardingPassView(BaseView):
                 messagebox.showerror("Ошибка", "Введите корректный ID рейса")
                 return
 
+            # Проверка места по карте мест рейса (без запроса к базе)
+            if not seat_no:
+                seat_no = self.controller.find_free_seat(ticket_no, flight_id)
+                if seat_no is None:
+                    messagebox.showerror("Ошибка", "На рейсе нет свободных мест в классе обслуживания билета")
+                    return
+            else:
+                status = self.controller.get_seat_status(flight_id, seat_no)
+                if status == SEAT_UNKNOWN:
+                    messagebox.showerror("Ошибка", f"В самолете рейса нет места {seat_no}")
+                    return
+                if status == SEAT_OCCUPIED:
+                    free_seat = self.controller.find_free_seat(ticket_no, flight_id)
+                    hint = f"\nСвободное место в классе билета: {free_seat}" if free_seat else ""
+                    messagebox.showerror("Ошибка", f"Место {seat_no} уже занято{hint}")
+                    return
+
             # Получаем следующий номер посадки
             boarding_no = self.controller.get_next_boarding_no(flight_id)
+            if boarding_no is None:
+                messagebox.showerror("Ошибка", "Не удалось получить номер посадки: счетчик номеров рейса недоступен")
+                return
 
             if self.controller.create_boarding_pass(ticket_no, flight_id, boarding_no, seat_no):
-                messagebox.showinfo("Успех", "Посадочный талон создан!")
+                messagebox.showinfo("Успех", f"Посадочный талон создан! Место: {seat_no}")
                 self.refresh_data()
             else:
                 messagebox.showerror("Ошибка", "Не удалось создать посадочный талон")
 
         self.create_dialog("Создание посадочного талона", fields, create_callback, "400x200")
 
+    def show_check_in_flight_dialog(self):
+        """Диалог регистрации пассажиров рейса одной транзакцией"""
+        dialog = tk.Toplevel(self.tab)
+        dialog.title("Регистрация пассажиров рейса")
+        dialog.geometry("420x260")
+        dialog.transient(self.tab)
+        dialog.grab_set()
+
+        ttk.Label(dialog, text="ID рейса:").pack(pady=5)
+        flight_entry = ttk.Entry(dialog)
+        flight_entry.pack(pady=5)
+
+        ttk.Label(dialog, text="Номера билетов через запятую (пусто - все без талона):").pack(pady=5)
+        tickets_entry = ttk.Entry(dialog, width=50)
+        tickets_entry.pack(pady=5)
+
+        def check_in():
+            try:
+                flight_id = int(flight_entry.get())
+            except ValueError:
+                messagebox.showerror("Ошибка", "Введите корректный ID рейса")
+                return
+
+            ticket_nos = [ticket_no.strip() for ticket_no in tickets_entry.get().replace(',', ' ').split()]
+            if any(len(ticket_no) != 13 for ticket_no in ticket_nos):
+                messagebox.showerror("Ошибка", "Номер билета должен содержать 13 символов")
+                return
+
+            check_in_button.config(state='disabled')
+
+            def on_done(result):
+                dialog.destroy()
+                if result.error:
+                    messagebox.showerror("Ошибка", f"Регистрация не выполнена: {result.error}")
+                    return
+                message = f"Зарегистрировано пассажиров: {result.checked_in}"
+                if result.skipped:
+                    details = "\n".join(f"{ticket_no}: {reason}" for ticket_no, reason in result.skipped[:10])
+                    more = f"\n... и еще {len(result.skipped) - 10}" if len(result.skipped) > 10 else ""
+                    message += f"\nБез посадочного талона: {len(result.skipped)}\n\n{details}{more}"
+                messagebox.showinfo("Регистрация рейса", message)
+                if result.checked_in:
+                    self.refresh_data()
+
+            def on_failed(error):
+                dialog.destroy()
+                messagebox.showerror("Ошибка", f"Регистрация не выполнена: {error}")
+
+            # Регистрация выполняется в фоне: окно не блокируется на время транзакции
+            run_in_background(self.tab, lambda: self.controller.check_in_flight(flight_id, ticket_nos or None),
+                              on_done, on_failed)
+
+        check_in_button = ttk.Button(dialog, text="Зарегистрировать", command=check_in)
+        check_in_button.pack(pady=10)
+        ttk.Button(dialog, text="Отмена", command=dialog.destroy).pack(pady=5)
+
+        # Центрируем диалоговое окно
+        self.center_dialog(dialog)
+
     def show_find_dialog(self):
         """Диалог поиска посадочного талона по билету и рейсу"""
         dialog = tk.Toplevel(self.tab)
@@ -262,25 +352,17 @@ class BoardingPassView(BaseView):
                 messagebox.showerror("Ошибка", "Введите корректный ID рейса")
                 return
 
-            # Очищаем таблицу
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
             # Загружаем данные для конкретного рейса
             boarding_passes = self.controller.get_boarding_passes_by_flight(flight_id)
 
             if not boarding_passes:
+                # Очищаем таблицу
+                self.tree_rows.clear()
                 messagebox.showinfo("Информация", f"Посадочные талоны для рейсу {flight_id} не найдены")
                 dialog.destroy()
                 return
 
-            for bp in boarding_passes:
-                self.tree.insert('', 'end', values=(
-                    bp.ticket_no,
-                    bp.flight_id,
-                    bp.boarding_no,
-                    bp.seat_no
-                ))
+            self.show_rows(boarding_passes)
 
             messagebox.showinfo("Успех", f"Загружено {len(boarding_passes)} посадочных талонов для рейса {flight_id}")
             dialog.destroy()
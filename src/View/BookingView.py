@@ -5,6 +5,15 @@ from datetime import datetime
 
 
 class BookingView(BaseView):
+    # Таблица для экспорта (см. src/Models/export.py)
+    export_table = 'bookings'
+
+    # Ключ строки таблицы
+    row_key = ('book_ref',)
+
+    # Таблица страниц (кэш страниц сбрасывается при записи в нее)
+    source_table = 'bookings.bookings'
+
     def setup_ui(self):
         """Настройка UI для бронирований с пагинацией"""
         # Заголовок
@@ -79,28 +88,18 @@ class BookingView(BaseView):
         # Устанавливаем позицию
         dialog.geometry(f"+{x}+{y}")
 
-    def refresh_data(self):
-        """Обновление данных в таблице с пагинацией"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Получаем параметры пагинации
-        offset, limit = self.get_pagination_params()
-
-        # Получаем данные с пагинацией
-        bookings, total = self.controller.get_all_bookings_paginated(offset, limit)
-        self.total_records = total
-
-        for booking in bookings:
-            formatted_date = booking.book_date.strftime("%Y-%m-%d %H:%M:%S")
-            self.tree.insert('', 'end', values=(
-                booking.book_ref,
-                formatted_date,
-                f"${booking.total_amount:.2f}"
-            ))
-
-        # Обновляем элементы управления пагинацией
-        self.update_pagination_controls()
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы бронирований"""
+        return self.controller.get_bookings_page(limit, token, backward)
+
+    def format_row(self, booking):
+        """Значения строки таблицы для бронирования"""
+        formatted_date = booking.book_date.strftime("%Y-%m-%d %H:%M:%S")
+        return (
+            booking.book_ref,
+            formatted_date,
+            f"${booking.total_amount:.2f}"
+        )
 
     def show_create_dialog(self):
         """Диалог создания бронирования"""
@@ -0,0 +1,190 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from src.Models.instrumentation import LATENCY_BUCKETS_MS
+from src.View.tree_diff import KeyedRows
+
+
+class DiagnosticsView:
+    """Вкладка диагностики: время запросов по методам моделей и журнал медленных запросов"""
+
+    # Период обновления статистики, пока вкладка открыта
+    REFRESH_INTERVAL_MS = 2000
+
+    def __init__(self, tab, controller, tab_name):
+        self.tab = tab
+        self.controller = controller
+        self.tab_name = tab_name
+        self.refresh_job = None
+        self.method_queries = {}
+        self.slow_queries = {}
+        self.setup_ui()
+        # Статистика обновляется по таймеру только на выбранной вкладке
+        self.tab.master.bind('<<NotebookTabChanged>>', self.on_tab_changed, add='+')
+        self.refresh()
+
+    def setup_ui(self):
+        """Настройка UI для вкладки диагностики"""
+        control_frame = ttk.Frame(self.tab)
+        control_frame.pack(fill='x', padx=10, pady=5)
+
+        self.enabled_var = tk.BooleanVar(value=self.controller.is_enabled())
+        ttk.Checkbutton(control_frame, text="Собирать статистику", variable=self.enabled_var,
+                        command=self.toggle_enabled).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(control_frame, text="Медленный запрос от, мс:").pack(side=tk.LEFT, padx=(20, 5))
+        self.threshold_entry = ttk.Entry(control_frame, width=8)
+        self.threshold_entry.insert(0, f"{self.controller.get_slow_threshold():g}")
+        self.threshold_entry.pack(side=tk.LEFT)
+        self.threshold_entry.bind('<Return>', lambda event: self.apply_threshold())
+        ttk.Button(control_frame, text="Применить", command=self.apply_threshold).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(control_frame, text="Обновить", command=self.refresh).pack(side=tk.LEFT, padx=(20, 5))
+        ttk.Button(control_frame, text="Сбросить", command=self.reset).pack(side=tk.LEFT, padx=5)
+
+        self.pool_label = ttk.Label(self.tab, text="")
+        self.pool_label.pack(anchor='w', padx=10)
+        self.prepared_label = ttk.Label(self.tab, text="")
+        self.prepared_label.pack(anchor='w', padx=10)
+
+        # Статистика по методам
+        ttk.Label(self.tab, text="Запросы по методам").pack(anchor='w', padx=10, pady=(10, 0))
+        methods_frame = ttk.Frame(self.tab)
+        methods_frame.pack(fill='both', expand=True, padx=10, pady=5)
+
+        columns = ('method', 'calls', 'errors', 'total', 'avg', 'p50', 'p95', 'max', 'rows', 'bytes', 'histogram')
+        self.methods_tree = ttk.Treeview(methods_frame, columns=columns, show='headings', height=12)
+        for column, text, width in (('method', 'Метод', 260), ('calls', 'Вызовов', 70), ('errors', 'Ошибок', 60),
+                                    ('total', 'Всего, мс', 90), ('avg', 'Среднее, мс', 90),
+                                    ('p50', 'p50, мс', 70), ('p95', 'p95, мс', 70), ('max', 'Макс., мс', 80),
+                                    ('rows', 'Строк', 80), ('bytes', 'Объем, КБ', 80),
+                                    ('histogram', 'Гистограмма', 260)):
+            self.methods_tree.heading(column, text=text)
+            self.methods_tree.column(column, width=width)
+        methods_scroll = ttk.Scrollbar(methods_frame, orient=tk.VERTICAL, command=self.methods_tree.yview)
+        self.methods_tree.configure(yscrollcommand=methods_scroll.set)
+        self.methods_tree.pack(side='left', fill='both', expand=True)
+        methods_scroll.pack(side='right', fill='y')
+        self.methods_tree.bind('<<TreeviewSelect>>', self.show_method_query)
+        # Строки обновляются по разнице: выделение сохраняется между обновлениями
+        self.method_rows = KeyedRows(self.methods_tree)
+
+        self.histogram_label = ttk.Label(self.tab, text="Корзины гистограммы, мс: "
+                                         + " ".join(f"≤{bound}" for bound in LATENCY_BUCKETS_MS) + " >")
+        self.histogram_label.pack(anchor='w', padx=10)
+
+        # Журнал медленных запросов
+        ttk.Label(self.tab, text="Медленные запросы").pack(anchor='w', padx=10, pady=(10, 0))
+        slow_frame = ttk.Frame(self.tab)
+        slow_frame.pack(fill='both', expand=True, padx=10, pady=5)
+
+        columns = ('time', 'method', 'duration', 'rows', 'query', 'params')
+        self.slow_tree = ttk.Treeview(slow_frame, columns=columns, show='headings', height=8)
+        for column, text, width in (('time', 'Время', 80), ('method', 'Метод', 200), ('duration', 'мс', 70),
+                                    ('rows', 'Строк', 60), ('query', 'Запрос', 450), ('params', 'Параметры', 250)):
+            self.slow_tree.heading(column, text=text)
+            self.slow_tree.column(column, width=width)
+        slow_scroll = ttk.Scrollbar(slow_frame, orient=tk.VERTICAL, command=self.slow_tree.yview)
+        self.slow_tree.configure(yscrollcommand=slow_scroll.set)
+        self.slow_tree.pack(side='left', fill='both', expand=True)
+        slow_scroll.pack(side='right', fill='y')
+        self.slow_tree.bind('<Double-1>', self.show_slow_query)
+        self.slow_rows = KeyedRows(self.slow_tree)
+
+        self.query_text = tk.Text(self.tab, height=4, wrap='word')
+        self.query_text.pack(fill='x', padx=10, pady=(0, 10))
+
+    def is_selected(self):
+        """Выбрана ли вкладка диагностики в Notebook"""
+        try:
+            return self.tab.master.select() == str(self.tab)
+        except tk.TclError:
+            return False
+
+    def on_tab_changed(self, event=None):
+        """Возобновление обновления при выборе вкладки"""
+        if self.refresh_job is None and self.is_selected():
+            self.refresh()
+
+    def refresh(self):
+        """Обновление таблиц статистики (повторяется по таймеру, пока вкладка выбрана)"""
+        if self.refresh_job:
+            self.tab.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        if not self.tab.winfo_exists():
+            return
+
+        rows = []
+        self.method_queries = {}
+        for stats in self.controller.get_method_stats():
+            self.method_queries[stats.name] = stats.last_query
+            histogram = " ".join(str(count) for count in stats.buckets)
+            rows.append((stats.name, (
+                stats.name, stats.calls, stats.errors, f"{stats.total_ms:.1f}", f"{stats.avg_ms:.2f}",
+                f"{stats.percentile(0.5):g}", f"{stats.percentile(0.95):g}", f"{stats.max_ms:.1f}",
+                stats.rows, f"{stats.bytes / 1024:.1f}", histogram
+            )))
+        self.method_rows.apply(rows)
+
+        # Ключ записи журнала - сам объект записи: уже показанные строки не перерисовываются
+        rows = []
+        self.slow_queries = {}
+        for slow in self.controller.get_slow_queries():
+            iid = str(id(slow))
+            self.slow_queries[iid] = slow
+            rows.append((iid, (
+                time.strftime('%H:%M:%S', time.localtime(slow.logged_at)), slow.method,
+                f"{slow.duration_ms:.1f}", slow.rows if slow.rows >= 0 else "", slow.query, slow.params or ""
+            )))
+        self.slow_rows.apply(rows)
+
+        pool = self.controller.get_pool_stats()
+        if pool:
+            self.pool_label.config(text=(
+                f"Пул соединений: занято {pool['in_use']} из {pool['size']} (макс. {pool['max_size']}), "
+                f"тайм-аутов: {pool['timeouts']}, среднее ожидание {pool['avg_wait'] * 1000:.1f} мс"
+            ))
+        else:
+            self.pool_label.config(text="Пул соединений не используется")
+
+        prepared = self.controller.get_prepared_stats()
+        self.prepared_label.config(text=(
+            f"Подготовленные запросы: выполнено {prepared['executions']}, "
+            f"подготовок {prepared['prepares']} на {prepared['connections']} соединениях"
+        ))
+
+        if self.is_selected():
+            self.refresh_job = self.tab.after(self.REFRESH_INTERVAL_MS, self.refresh)
+
+    def show_method_query(self, event=None):
+        """Текст последнего запроса выбранного метода"""
+        selection = self.methods_tree.selection()
+        if selection:
+            query = self.method_queries.get(selection[0])
+            self.show_text(" ".join(str(query).split()) if query is not None else "")
+
+    def show_slow_query(self, event=None):
+        """Полный текст медленного запроса и его параметры"""
+        selection = self.slow_tree.selection()
+        if selection:
+            slow = self.slow_queries.get(selection[0])
+            if slow is None:
+                return
+            self.show_text(f"{slow.query}\n\nПараметры: {slow.params}")
+
+    def show_text(self, text):
+        self.query_text.delete('1.0', tk.END)
+        self.query_text.insert('1.0', text)
+
+    def apply_threshold(self):
+        if not self.controller.set_slow_threshold(self.threshold_entry.get()):
+            messagebox.showerror("Ошибка", "Порог должен быть неотрицательным числом")
+
+    def toggle_enabled(self):
+        self.controller.set_enabled(self.enabled_var.get())
+
+    def reset(self):
+        self.controller.reset()
+        self.show_text("")
+        self.refresh()
\ No newline at end of file
@@ -1,10 +1,25 @@
 # FlightsView.py
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.View.BaseView import BaseView
+from src.View.background import run_in_background
 from datetime import datetime
 
+# Как часто главный поток забирает изменения рейсов, полученные слушателем уведомлений
+LIVE_CHANGES_INTERVAL_MS = 250
+
+
 class FlightsView(BaseView):
+    # Таблица для экспорта (см. src/Models/export.py)
+    export_table = 'flights'
+
+    # Ключ строки таблицы
+    row_key = ('flight_id',)
+
+    # Таблица страниц (кэш страниц сбрасывается при записи в нее)
+    source_table = 'bookings.flights'
+
     def setup_ui(self):
         """Настройка UI для рейсов с пагинацией"""
         # Заголовок
@@ -33,9 +48,15 @@ class FlightsView(BaseView):
         # Treeview
         columns = ('flight_id', 'flight_no', 'scheduled_departure', 'scheduled_arrival',
                    'departure_airport', 'arrival_airport', 'status', 'aircraft_code',
-                   'actual_departure', 'actual_arrival')
+                   'actual_departure', 'actual_arrival', 'load_factor')
         self.tree = ttk.Treeview(self.tab, columns=columns, show='headings')
 
+        # Загрузка рейсов текущей страницы (ID рейса -> FlightLoad) и сортировка по ней.
+        # Сортируются только рейсы текущей страницы: страницы по-прежнему идут по плановому
+        # вылету, поэтому заголовок колонки помечает сортировку как постраничную
+        self.flight_loads = {}
+        self.load_sort = None  # None - порядок страницы, 'asc' / 'desc' - по загрузке
+
         # Настраиваем заголовки колонок
         self.tree.heading('flight_id', text='ID')
         self.tree.heading('flight_no', text='Номер рейса')
@@ -47,6 +68,7 @@ class FlightsView(BaseView):
         self.tree.heading('aircraft_code', text='Самолет')
         self.tree.heading('actual_departure', text='Факт. вылет')
         self.tree.heading('actual_arrival', text='Факт. прилет')
+        self.tree.heading('load_factor', text='Загрузка', command=self.toggle_load_sort)
 
         # Настраиваем ширину колонок
         self.tree.column('flight_id', width=50)
@@ -59,6 +81,7 @@ class FlightsView(BaseView):
         self.tree.column('aircraft_code', width=70)
         self.tree.column('actual_departure', width=120)
         self.tree.column('actual_arrival', width=120)
+        self.tree.column('load_factor', width=110)
 
         # Добавляем scrollbar
         scrollbar = ttk.Scrollbar(self.tab, orient=tk.VERTICAL, command=self.tree.yview)
@@ -71,6 +94,12 @@ class FlightsView(BaseView):
         # Элементы пагинации
         self.setup_pagination_controls(self.tab)
 
+        # Изменения рейсов другими операторами приходят через LISTEN/NOTIFY: слушатель
+        # кладет их в очередь, главный поток обновляет только затронутые строки
+        self.live_changes = queue.Queue()
+        if self.controller.subscribe_changes(self.live_changes.put):
+            self.tab.after(LIVE_CHANGES_INTERVAL_MS, self.apply_live_changes)
+
         # Загружаем данные
         self.refresh_data()
 
@@ -95,40 +124,122 @@ class FlightsView(BaseView):
         # Устанавливаем позицию
         dialog.geometry(f"+{x}+{y}")
 
-    def refresh_data(self):
-        """Обновление данных в таблице с пагинацией"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Получаем параметры пагинации
-        offset, limit = self.get_pagination_params()
-
-        # Получаем данные с пагинацией
-        flights, total = self.controller.get_all_flights_paginated(offset, limit)
-        self.total_records = total
-
-        for flight in flights:
-            scheduled_departure = flight.scheduled_departure.strftime(
-                "%Y-%m-%d %H:%M") if flight.scheduled_departure else ""
-            scheduled_arrival = flight.scheduled_arrival.strftime("%Y-%m-%d %H:%M") if flight.scheduled_arrival else ""
-            actual_departure = flight.actual_departure.strftime("%Y-%m-%d %H:%M") if flight.actual_departure else ""
-            actual_arrival = flight.actual_arrival.strftime("%Y-%m-%d %H:%M") if flight.actual_arrival else ""
-
-            self.tree.insert('', 'end', values=(
-                flight.flight_id,
-                flight.flight_no,
-                scheduled_departure,
-                scheduled_arrival,
-                flight.departure_airport,
-                flight.arrival_airport,
-                flight.status,
-                flight.aircraft_code,
-                actual_departure,
-                actual_arrival
-            ))
-
-        # Обновляем элементы управления пагинацией
-        self.update_pagination_controls()
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы рейсов вместе с их загрузкой"""
+        return self.controller.get_flights_page(limit, token, backward, with_load=True)
+
+    def display_page(self, page):
+        """Отображение страницы вместе с загрузкой ее рейсов"""
+        self.flight_loads = getattr(page, 'loads', None) or {}
+        super().display_page(page)
+
+    def show_rows(self, items):
+        """Отображение рейсов в порядке страницы или по загрузке"""
+        if self.load_sort:
+            def load_key(flight):
+                load = self.flight_loads.get(flight.flight_id)
+                load_factor = load.load_factor if load else None
+                # Рейсы без данных о загрузке - в конце при любом направлении
+                if load_factor is None:
+                    return (1, 0)
+                return (0, -load_factor if self.load_sort == 'desc' else load_factor)
+
+            items = sorted(items, key=load_key)
+        return super().show_rows(items)
+
+    def toggle_load_sort(self):
+        """Сортировка рейсов текущей страницы по загрузке: по убыванию, по возрастанию, без сортировки
+
+        Порядок страниц не меняется (пагинация по плановому вылету), поэтому это
+        сортировка внутри страницы, а не всего списка рейсов.
+        """
+        self.load_sort = {None: 'desc', 'desc': 'asc', 'asc': None}[self.load_sort]
+        label = {None: '', 'desc': ' ▼ на стр.', 'asc': ' ▲ на стр.'}[self.load_sort]
+        self.tree.heading('load_factor', text=f"Загрузка{label}")
+        if self.page is not None:
+            self.show_rows(self.page.items)
+
+    def apply_live_changes(self):
+        """Применение полученных изменений рейсов к рейсам текущей страницы"""
+        reload_ids = set()
+        reload_page = False
+        changed = False
+        patched = False
+        flights = {flight.flight_id: flight for flight in self.page.items} if self.page is not None else {}
+        while True:
+            try:
+                change = self.live_changes.get_nowait()
+            except queue.Empty:
+                break
+            changed = True
+            if change is None:
+                reload_page = True
+                continue
+            flight = flights.get(change['flight_id'])
+            if flight is None:
+                continue  # Рейс не на текущей странице
+            flight.status = change['status']
+            patched = True
+            if change['times_changed']:
+                reload_ids.add(change['flight_id'])
+
+        if changed:
+            # Страницы в кэше могли содержать измененные рейсы
+            self.page_cache.clear()
+        if reload_page:
+            self.refresh_data()
+        else:
+            if patched:
+                # Строки перерисовываются по объектам страницы: сортировка и повторный показ их не откатят
+                self.show_rows(self.page.items)
+            if reload_ids:
+                # Фактическое время перечитывается одним запросом по измененным рейсам
+                run_in_background(self.tab, lambda: self.controller.find_flights(reload_ids), self.patch_rows)
+
+        self.tab.after(LIVE_CHANGES_INTERVAL_MS, self.apply_live_changes)
+
+    def patch_rows(self, flights):
+        """Замена перечитанных рейсов на текущей странице и перерисовка ее строк"""
+        if self.page is None:
+            return
+        reloaded = {flight.flight_id: flight for flight in flights}
+        items = self.page.items
+        replaced = False
+        for index, flight in enumerate(items):
+            fresh = reloaded.get(flight.flight_id)
+            if fresh is not None:
+                items[index] = fresh
+                replaced = True
+        if replaced:
+            self.show_rows(items)
+
+    def format_row(self, flight):
+        """Значения строки таблицы для рейса"""
+        scheduled_departure = flight.scheduled_departure.strftime(
+            "%Y-%m-%d %H:%M") if flight.scheduled_departure else ""
+        scheduled_arrival = flight.scheduled_arrival.strftime("%Y-%m-%d %H:%M") if flight.scheduled_arrival else ""
+        actual_departure = flight.actual_departure.strftime("%Y-%m-%d %H:%M") if flight.actual_departure else ""
+        actual_arrival = flight.actual_arrival.strftime("%Y-%m-%d %H:%M") if flight.actual_arrival else ""
+
+        load = self.flight_loads.get(flight.flight_id)
+        if load is not None and load.load_factor is not None:
+            load_factor = f"{load.load_factor:.0%} ({load.sold_total}/{load.seats})"
+        else:
+            load_factor = ""
+
+        return (
+            flight.flight_id,
+            flight.flight_no,
+            scheduled_departure,
+            scheduled_arrival,
+            flight.departure_airport,
+            flight.arrival_airport,
+            flight.status,
+            flight.aircraft_code,
+            actual_departure,
+            actual_arrival,
+            load_factor
+        )
 
     def show_create_dialog(self):
         """Диалог создания рейса"""
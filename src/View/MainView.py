@@ -7,12 +7,17 @@ from src.View.FlightsView import FlightsView
 from src.View.SeatsView import SeatsView
 from src.View.TicketFlightsView import TicketFlightsView
 from src.View.TicketsView import TicketsView
+from src.View.DiagnosticsView import DiagnosticsView
 
 
 
 class MainView:
+    # Задержка перед предзагрузкой соседних вкладок, чтобы не мешать отрисовке выбранной
+    PREFETCH_DELAY_MS = 500
+
     def __init__(self, root, booking_controller, aircraft_controller, airport_controller, boarding_pass_controller, flights_controller
-                 , seats_controller, ticket_flights_controller, tickets_controller):
+                 , seats_controller, ticket_flights_controller, tickets_controller, prefetch_neighbours=True,
+                 diagnostics_controller=None):
         self.root = root
         self.booking_controller = booking_controller
         self.aircraft_controller = aircraft_controller
@@ -22,7 +27,12 @@ class MainView:
         self.seats_controller = seats_controller
         self.ticket_flights_controller = ticket_flights_controller
         self.tickets_controller = tickets_controller
+        self.diagnostics_controller = diagnostics_controller
         self.views = {}  # Словарь для хранения представлений
+        # Вкладки создаются пустыми, представление строится при первом выборе
+        self.tab_specs = {}  # Идентификатор вкладки -> (название, класс представления, контроллер)
+        self.prefetch_neighbours = prefetch_neighbours
+        self.prefetch_job = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -36,6 +46,7 @@ class MainView:
         # Создаем Notebook (вкладки)
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
 
         # Создаем вкладки и соответствующие представления
         self.create_tab("Бронирования", BookingView, self.booking_controller)
@@ -46,20 +57,53 @@ class MainView:
         self.create_tab("Места", SeatsView, self.seats_controller)
         #self.create_tab("Билеты и рейсы", TicketFlightsView, self.ticket_flights_controller)
         self.create_tab("Билеты", TicketsView, self.tickets_controller)
+        if self.diagnostics_controller:
+            self.create_tab("Диагностика", DiagnosticsView, self.diagnostics_controller)
 
+        # Запросы к базе при запуске выполняет только выбранная вкладка
+        self.on_tab_changed()
 
     def create_tab(self, tab_name, view_class, controller):
-        """Создание новой вкладки с представлением"""
+        """Создание новой вкладки (представление строится при первом выборе)"""
         # Создаем фрейм для вкладки
         tab = ttk.Frame(self.notebook)
         self.notebook.add(tab, text=tab_name)
-
-        # Создаем представление для этой вкладки
-        view = view_class(tab, controller, tab_name)
-        self.views[tab_name] = view
+        self.tab_specs[str(tab)] = (tab_name, view_class, controller)
 
         return tab
 
+    def build_tab(self, tab_id):
+        """Создание представления для вкладки, если оно еще не создано"""
+        tab_name, view_class, controller = self.tab_specs[str(tab_id)]
+        if tab_name not in self.views:
+            tab = self.notebook.nametowidget(tab_id)
+            self.views[tab_name] = view_class(tab, controller, tab_name)
+        return self.views[tab_name]
+
+    def on_tab_changed(self, event=None):
+        """Построение выбранной вкладки и планирование предзагрузки соседних"""
+        selected = self.notebook.select()
+        if not selected:
+            return
+        self.build_tab(selected)
+
+        if self.prefetch_neighbours:
+            if self.prefetch_job:
+                self.root.after_cancel(self.prefetch_job)
+            self.prefetch_job = self.root.after(self.PREFETCH_DELAY_MS, self.prefetch_neighbour_tabs)
+
+    def prefetch_neighbour_tabs(self):
+        """Построение соседних с выбранной вкладок (данные загружаются в фоне)"""
+        self.prefetch_job = None
+        tabs = self.notebook.tabs()
+        selected = self.notebook.select()
+        if selected not in tabs:
+            return
+        index = tabs.index(selected)
+        for neighbour in (index - 1, index + 1):
+            if 0 <= neighbour < len(tabs):
+                self.build_tab(tabs[neighbour])
+
     def add_new_tab(self, tab_name, view_class, controller):
         """Метод для легкого добавления новых вкладок"""
         return self.create_tab(tab_name, view_class, controller)
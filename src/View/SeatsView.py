@@ -4,6 +4,15 @@ from tkinter import ttk, messagebox
 
 
 class SeatsView(BaseView):
+    # Таблица для экспорта (см. src/Models/export.py)
+    export_table = 'seats'
+
+    # Ключ строки таблицы
+    row_key = ('aircraft_code', 'seat_no')
+
+    # Таблица страниц (кэш страниц сбрасывается при записи в нее)
+    source_table = 'bookings.seats'
+
     def setup_ui(self):
         """Настройка UI для мест с пагинацией"""
         # Заголовок
@@ -78,27 +87,17 @@ class SeatsView(BaseView):
         # Устанавливаем позицию
         dialog.geometry(f"+{x}+{y}")
 
-    def refresh_data(self):
-        """Обновление данных в таблице с пагинацией"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Получаем параметры пагинации
-        offset, limit = self.get_pagination_params()
-
-        # Получаем данные с пагинацией
-        seats, total = self.controller.get_all_seats_paginated(offset, limit)
-        self.total_records = total
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы мест"""
+        return self.controller.get_seats_page(limit, token, backward)
 
-        for seat in seats:
-            self.tree.insert('', 'end', values=(
-                seat.aircraft_code,
-                seat.seat_no,
-                seat.fare_conditions
-            ))
-
-        # Обновляем элементы управления пагинацией
-        self.update_pagination_controls()
+    def format_row(self, seat):
+        """Значения строки таблицы для места"""
+        return (
+            seat.aircraft_code,
+            seat.seat_no,
+            seat.fare_conditions
+        )
 
     def show_create_dialog(self):
         """Диалог создания места"""
@@ -240,6 +239,4 @@ class SeatsView(BaseView):
         ttk.Button(dialog, text="Отмена", command=dialog.destroy).pack(pady=5)
 
         # Центрируем диалоговое окно
-        self.center_dialog(dialog)
-
-
+        self.center_dialog(dialog)
\ No newline at end of file
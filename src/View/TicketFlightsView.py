@@ -5,6 +5,15 @@ from src.View.BaseView import BaseView
 
 
 class TicketFlightsView(BaseView):
+    # Таблица для экспорта (см. src/Models/export.py)
+    export_table = 'ticket_flights'
+
+    # Ключ строки таблицы
+    row_key = ('ticket_no', 'flight_id')
+
+    # Таблица страниц (кэш страниц сбрасывается при записи в нее)
+    source_table = 'bookings.ticket_flights'
+
     def setup_ui(self):
         """Настройка UI для билетов на рейсы с пагинацией"""
         # Заголовок
@@ -81,28 +90,18 @@ class TicketFlightsView(BaseView):
         # Устанавливаем позицию
         dialog.geometry(f"+{x}+{y}")
 
-    def refresh_data(self):
-        """Обновление данных в таблице с пагинацией"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Получаем параметры пагинации
-        offset, limit = self.get_pagination_params()
-
-        # Получаем данные с пагинацией
-        ticket_flights, total = self.controller.get_all_ticket_flights_paginated(offset, limit)
-        self.total_records = total
-
-        for tf in ticket_flights:
-            self.tree.insert('', 'end', values=(
-                tf.ticket_no,
-                tf.flight_id,
-                tf.fare_conditions,
-                f"${tf.amount:.2f}"
-            ))
-
-        # Обновляем элементы управления пагинацией
-        self.update_pagination_controls()
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы билетов на рейсы"""
+        return self.controller.get_ticket_flights_page(limit, token, backward)
+
+    def format_row(self, tf):
+        """Значения строки таблицы для билета на рейс"""
+        return (
+            tf.ticket_no,
+            tf.flight_id,
+            tf.fare_conditions,
+            f"${tf.amount:.2f}"
+        )
 
     def show_create_dialog(self):
         """Диалог создания билета на рейс"""
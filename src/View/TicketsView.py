@@ -5,6 +5,18 @@ from src.View.BaseView import BaseView
 
 
 class TicketsView(BaseView):
+    # Таблица для экспорта (см. src/Models/export.py)
+    export_table = 'tickets'
+
+    # Ключ строки таблицы
+    row_key = ('ticket_no',)
+
+    # Таблица страниц (кэш страниц сбрасывается при записи в нее)
+    source_table = 'bookings.tickets'
+
+    # Пауза после ввода, после которой выполняется поиск (запрос не уходит на каждое нажатие)
+    SEARCH_DEBOUNCE_MS = 300
+
     def setup_ui(self):
         """Настройка UI для билетов с пагинацией"""
         # Заголовок
@@ -18,7 +30,7 @@ class TicketsView(BaseView):
 
         # Кнопки управления
         buttons = [
-            ("Показать все", self.refresh_data),
+            ("Показать все", self.show_all),
             ("Создать", self.show_create_dialog),
             ("Найти по номеру", self.show_find_dialog),
             ("Обновить", self.show_update_dialog),
@@ -30,6 +42,19 @@ class TicketsView(BaseView):
                 row=0, column=i, padx=5, pady=5
             )
 
+        # Поиск по имени пассажира (результаты по убыванию сходства)
+        search_frame = ttk.Frame(self.tab)
+        search_frame.pack(fill='x', padx=10)
+        ttk.Label(search_frame, text="Поиск по имени пассажира:").pack(side=tk.LEFT)
+        self.search_query = ""  # Текст, по которому показаны текущие результаты
+        self.search_job = None
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self.on_search_changed)
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind('<Return>', lambda event: self.apply_search())
+        search_entry.bind('<Escape>', lambda event: self.show_all())
+
         # Treeview
         columns = ('ticket_no', 'book_ref', 'passenger_id', 'passenger_name', 'contact_data')
         self.tree = ttk.Treeview(self.tab, columns=columns, show='headings')
@@ -83,32 +108,55 @@ class TicketsView(BaseView):
         # Устанавливаем позицию
         dialog.geometry(f"+{x}+{y}")
 
-    def refresh_data(self):
-        """Обновление данных в таблице с пагинацией"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Получаем параметры пагинации
-        offset, limit = self.get_pagination_params()
-
-        # Получаем данные с пагинацией
-        result = self.controller.get_all_tickets_paginated(offset, limit)
-        tickets = result['tickets']
-        self.total_records = result['total_count']
-
-        for ticket in tickets:
-            contact_info = str(ticket.contact_data)[:200] if ticket.contact_data else "Нет данных"
-            contact_info = contact_info.replace('{', '').replace('}', '').replace("'", "")
-            self.tree.insert('', 'end', values=(
-                ticket.ticket_no,
-                ticket.book_ref,
-                ticket.passenger_id,
-                ticket.passenger_name,
-                contact_info
-            ))
-
-        # Обновляем элементы управления пагинацией
-        self.update_pagination_controls()
+    def fetch_page(self, limit, token, backward):
+        """Получение страницы билетов (или результатов поиска)"""
+        if self.search_query:
+            return self.controller.search_tickets_page(self.search_query, limit, token, backward, summary=True)
+        return self.controller.get_tickets_page(limit, token, backward, summary=True)
+
+    def on_search_changed(self, *args):
+        """Отложенный поиск: таймер перезапускается при каждом изменении текста"""
+        if self.search_job:
+            self.tab.after_cancel(self.search_job)
+        self.search_job = self.tab.after(self.SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        """Показ первой страницы результатов для введенного текста"""
+        if self.search_job:
+            self.tab.after_cancel(self.search_job)
+            self.search_job = None
+        query = self.search_var.get().strip()
+        if query == self.search_query:
+            return
+        self.search_query = query
+        self.current_page = 1
+        self.set_page_request()
+        # Кэш страниц сбрасывается: ключи страниц не зависят от текста поиска
+        self.refresh_data()
+
+    def show_all(self):
+        """Сброс поиска и показ всех билетов"""
+        searching = bool(self.search_query)
+        self.search_var.set("")
+        if searching:
+            self.apply_search()
+        else:
+            if self.search_job:
+                self.tab.after_cancel(self.search_job)
+                self.search_job = None
+            self.refresh_data()
+
+    def format_row(self, ticket):
+        """Значения строки таблицы для билета"""
+        contact_info = str(ticket.contact_data)[:200] if ticket.contact_data else "Нет данных"
+        contact_info = contact_info.replace('{', '').replace('}', '').replace("'", "").replace('"', '')
+        return (
+            ticket.ticket_no,
+            ticket.book_ref,
+            ticket.passenger_id,
+            ticket.passenger_name,
+            contact_info
+        )
 
     def show_create_dialog(self):
         """Диалог создания билета"""
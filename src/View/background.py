@@ -0,0 +1,45 @@
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+# Общий пул потоков для запросов представлений: Tk остается в главном потоке
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='view-loader')
+
+POLL_INTERVAL_MS = 20
+
+
+def run_in_background(widget, func, on_success, on_error=None):
+    """Выполнение func в фоновом потоке с передачей результата в главный поток
+
+    Результат забирается опросом через widget.after(), поэтому обработчики
+    вызываются только из потока Tk и могут работать с виджетами.
+    """
+    future = _executor.submit(func)
+
+    def poll():
+        if not future.done():
+            schedule()
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            else:
+                print(f"Ошибка фоновой загрузки: {e}")
+            return
+        on_success(result)
+
+    def schedule():
+        try:
+            widget.after(POLL_INTERVAL_MS, poll)
+        except tk.TclError:
+            # Виджет уже уничтожен - результат больше некому показывать
+            pass
+
+    schedule()
+    return future
+
+
+def submit(func):
+    """Выполнение func в фоновом потоке без передачи результата в Tk"""
+    return _executor.submit(func)
\ No newline at end of file
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Сколько соседних страниц в каждую сторону загружается заранее
+DEFAULT_PREFETCH_DEPTH = 1
+DEFAULT_MAX_PAGES = 20
+# Страница старше этого возраста (секунды) считается устаревшей: ее могли изменить другие клиенты
+DEFAULT_TTL = 30.0
+
+
+class PageCache:
+    """Кэш загруженных страниц представления
+
+    Ключ страницы - параметры запроса (limit, token, backward). Кэш сбрасывается
+    при записи в таблицу (из потока, выполнившего запись), поэтому доступ
+    защищен блокировкой, а страницы, запрошенные до сброса, не сохраняются.
+    """
+
+    def __init__(self, max_pages=DEFAULT_MAX_PAGES, ttl=DEFAULT_TTL):
+        self.max_pages = max_pages
+        self.ttl = ttl
+        self._pages = OrderedDict()  # Ключ -> (страница, время загрузки)
+        self._pending = set()  # Ключи страниц, загружаемых заранее
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def get(self, key):
+        """Страница из кэша или None"""
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is None:
+                return None
+            page, loaded_at = entry
+            if time.monotonic() - loaded_at > self.ttl:
+                del self._pages[key]
+                return None
+            self._pages.move_to_end(key)
+            return page
+
+    def put(self, key, page, generation):
+        """Сохранение страницы, если кэш не сбрасывался после начала ее загрузки"""
+        with self._lock:
+            self._pending.discard(key)
+            if generation != self._generation or page is None:
+                return
+            self._pages[key] = (page, time.monotonic())
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def start_pending(self, key):
+        """Отметка о начале загрузки страницы заранее; False - уже в кэше или загружается"""
+        with self._lock:
+            if key in self._pending or key in self._pages:
+                return False
+            self._pending.add(key)
+            return True
+
+    def is_pending(self, key):
+        with self._lock:
+            return key in self._pending
+
+    def discard_pending(self, key):
+        with self._lock:
+            self._pending.discard(key)
+
+    def clear(self):
+        """Сброс всех страниц"""
+        with self._lock:
+            self._generation += 1
+            self._pages.clear()
+            self._pending.clear()
\ No newline at end of file
@@ -0,0 +1,99 @@
+class TreeDiffResult:
+    """Количество операций с таблицей при применении изменений"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.deleted = 0
+        self.moved = 0
+
+    @property
+    def changes(self):
+        return self.inserted + self.updated + self.deleted + self.moved
+
+    def __str__(self):
+        return (f"добавлено: {self.inserted}, изменено: {self.updated}, "
+                f"удалено: {self.deleted}, перемещено: {self.moved}")
+
+
+class KeyedRows:
+    """Строки Treeview по ключу записи
+
+    Хранит значения отображаемых строк и при обновлении вызывает виджет только
+    для отличающихся строк: удаляет пропавшие, добавляет новые, меняет значения
+    измененных и переставляет строки, оказавшиеся не на своем месте.
+    Строки без ключа (или с повторяющимися ключами) заменяются целиком.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.values = {}  # Идентификатор строки -> значения, как их вернул format_row
+        self.keyed = True  # False - строки показаны без ключей и при обновлении заменяются целиком
+
+    def apply(self, rows):
+        """Приведение таблицы к списку строк [(идентификатор, значения), ...]"""
+        result = TreeDiffResult()
+        ids = [iid for iid, _ in rows]
+        if None in ids or len(set(ids)) != len(ids):
+            self._replace_all(rows, result)
+            return result
+        if not self.keyed:
+            result.deleted = len(self.tree.get_children())
+            self.clear()
+
+        new_ids = set(ids)
+        removed = [iid for iid in self.values if iid not in new_ids]
+        if removed:
+            self.tree.delete(*removed)
+            for iid in removed:
+                del self.values[iid]
+            result.deleted = len(removed)
+
+        for index, (iid, values) in enumerate(rows):
+            old = self.values.get(iid)
+            if old is None:
+                self.tree.insert('', index, iid=iid, values=values)
+                result.inserted += 1
+            elif old != values:
+                self.tree.item(iid, values=values)
+                result.updated += 1
+            self.values[iid] = values
+
+        # Вставка по позициям сохраняет порядок; перестановка нужна, только если
+        # изменился порядок уже показанных строк
+        children = list(self.tree.get_children())
+        if children != ids:
+            for index, iid in enumerate(ids):
+                if children[index] != iid:
+                    self.tree.move(iid, '', index)
+                    children.remove(iid)
+                    children.insert(index, iid)
+                    result.moved += 1
+        return result
+
+    def set(self, iid, values):
+        """Замена значений одной строки (например, по уведомлению об изменении)"""
+        if iid in self.values and self.values[iid] != values:
+            self.tree.item(iid, values=values)
+            self.values[iid] = values
+
+    def get(self, iid):
+        """Значения строки или None, если строка не показана"""
+        return self.values.get(iid)
+
+    def clear(self):
+        """Удаление всех строк"""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self.values = {}
+        self.keyed = True
+
+    def _replace_all(self, rows, result):
+        result.deleted = len(self.tree.get_children())
+        self.clear()
+        # Без надежного ключа идентификаторы назначает таблица
+        for _, values in rows:
+            self.tree.insert('', 'end', values=values)
+        result.inserted = len(rows)
+        self.keyed = False
\ No newline at end of file
@@ -0,0 +1,261 @@
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+
+from src.View.background import run_in_background
+from src.View.tree_diff import KeyedRows
+
+# Строк в одной порции, запрашиваемой у базы
+DEFAULT_CHUNK_SIZE = 500
+# Сколько порций хранится в памяти (вытесняются давно не показанные)
+DEFAULT_CACHE_CHUNKS = 40
+DEFAULT_VISIBLE_ROWS = 25
+# Запас строк вокруг видимого окна: порции, в которые он попадает, запрашиваются заранее
+DEFAULT_BUFFER_ROWS = 100
+# Строк за один шаг колеса мыши
+WHEEL_STEP = 3
+# Наибольший сдвиг OFFSET одного запроса: дальний переход идет шагами поиска границ
+MAX_SEEK_ROWS = 20000
+
+
+class VirtualGrid:
+    """Виртуальный список строк таблицы без постраничной навигации
+
+    Treeview содержит только видимое окно строк; положение в таблице задает
+    собственная полоса прокрутки. Строки запрашиваются порциями по ключу:
+    порция n читается после ключа последней строки порции n-1, а при переходе
+    вперед - от ближайшей известной границы со сдвигом. Загруженные порции
+    хранятся в LRU-кэше, поэтому расход памяти виджета и кэша не зависит от
+    размера таблицы.
+
+    Сдвиг одного запроса не больше MAX_SEEK_ROWS строк. Дальше известных границ
+    список продвигается поиском границ: одна строка (только ключ) через каждые
+    MAX_SEEK_ROWS строк, и каждая найденная граница запоминается. Ограничение:
+    первый переход ползунком далеко от прочитанного места занимает время,
+    пропорциональное расстоянию (несколько коротких запросов вместо одного
+    длинного OFFSET); обратно и повторно туда же переход быстрый.
+
+    fetch(limit, token, offset) выполняется в фоновом потоке и возвращает KeysetPage
+    (None - ошибка чтения: порция будет запрошена снова при следующей прокрутке);
+    seek(token, offset) - одна строка со сдвигом для поиска границы (по умолчанию
+    fetch(1, token, offset)).
+    """
+
+    def __init__(self, parent, columns, fetch, format_row, row_id, chunk_size=DEFAULT_CHUNK_SIZE,
+                 cache_chunks=DEFAULT_CACHE_CHUNKS, visible_rows=DEFAULT_VISIBLE_ROWS,
+                 buffer_rows=DEFAULT_BUFFER_ROWS, on_status=None, seek=None):
+        self.fetch = fetch
+        self.seek = seek or (lambda token, offset: fetch(1, token, offset))
+        self.format_row = format_row
+        self.row_id = row_id
+        self.chunk_size = chunk_size
+        self.cache_chunks = cache_chunks
+        self.visible_rows = visible_rows
+        self.buffer_rows = buffer_rows
+        self.on_status = on_status  # on_status(первая видимая строка, всего строк, идет ли загрузка, точно ли количество)
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=[name for name, _, _ in columns],
+                                 show='headings', height=visible_rows)
+        for name, text, width in columns:
+            self.tree.heading(name, text=text)
+            self.tree.column(name, width=width)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        # Прокрутка колесом и клавишами обрабатывается здесь, а не самим Treeview
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_mousewheel)
+        for sequence, rows in (('<Next>', visible_rows), ('<Prior>', -visible_rows),
+                               ('<Down>', 1), ('<Up>', -1)):
+            self.tree.bind(sequence, lambda event, rows=rows: self.scroll_by(rows))
+        self.tree.bind('<Home>', lambda event: self.scroll_to(0))
+        self.tree.bind('<End>', lambda event: self.scroll_to(self.total))
+
+        self.placeholder = ("Загрузка...",) + ("",) * (len(columns) - 1)
+        self.rows = KeyedRows(self.tree)
+        self.generation = 0
+        self.reset()
+
+    def reset(self):
+        self.top = 0
+        self.total = 0
+        self.end_known = False  # total точно (дочитали до конца), а не оценка
+        self.chunks = OrderedDict()  # Номер порции -> записи (LRU)
+        self.tokens = {0: None}  # Номер порции -> токен ключа, после которого она начинается
+        self.loading = set()
+        self.seeking = set()  # Номера порций, границы которых ищутся
+
+    def reload(self):
+        """Перечитывание с начала (например, после смены фильтра)"""
+        self.generation += 1
+        self.reset()
+        self.rows.clear()
+        self.request_chunk(0)
+        self.report_status()
+
+    def on_scrollbar(self, action, *args):
+        if action == 'moveto':
+            self.scroll_to(int(float(args[0]) * self.total))
+        elif action == 'scroll':
+            step = self.visible_rows if args[1] == 'pages' else 1
+            self.scroll_by(int(args[0]) * step)
+
+    def on_mousewheel(self, event):
+        if event.num == 4:
+            self.scroll_by(-WHEEL_STEP)
+        elif event.num == 5:
+            self.scroll_by(WHEEL_STEP)
+        elif event.delta:
+            self.scroll_by(-WHEEL_STEP if event.delta > 0 else WHEEL_STEP)
+        return 'break'
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.top + rows)
+        return 'break'
+
+    def scroll_to(self, top):
+        top = max(0, min(top, self.total - self.visible_rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+        return 'break'
+
+    def render(self):
+        """Отображение видимого окна из кэша порций и запрос недостающих порций"""
+        rows = []
+        for index in range(self.top, min(self.top + self.visible_rows, self.total)):
+            number, position = divmod(index, self.chunk_size)
+            chunk = self.get_chunk(number)
+            if chunk is None:
+                rows.append((f"~{index}", self.placeholder))
+            elif position < len(chunk):
+                item = chunk[position]
+                rows.append((self.row_id(item), self.format_row(item)))
+        self.rows.apply(rows)
+
+        if self.total:
+            self.scrollbar.set(self.top / self.total, min(1.0, (self.top + self.visible_rows) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        # Видимые порции и порции в пределах запаса вокруг окна
+        first = max(0, self.top - self.buffer_rows) // self.chunk_size
+        last = max(0, min(self.total - 1, self.top + self.visible_rows + self.buffer_rows)) // self.chunk_size
+        for number in range(first, last + 1):
+            self.request_chunk(number)
+        self.report_status()
+
+    def get_chunk(self, number):
+        chunk = self.chunks.get(number)
+        if chunk is not None:
+            self.chunks.move_to_end(number)
+        return chunk
+
+    def request_chunk(self, number):
+        """Фоновая загрузка порции, если ее нет в кэше и она еще не запрошена"""
+        if number in self.chunks or number in self.loading:
+            return
+        # Ближайшая известная граница до порции: дальше - сдвиг по индексу ключа
+        base = max(known for known in self.tokens if known <= number)
+        if (number - base) * self.chunk_size > MAX_SEEK_ROWS:
+            # Слишком далеко - сначала ищем промежуточную границу
+            self.request_boundary(base + max(1, MAX_SEEK_ROWS // self.chunk_size), base)
+            return
+        token = self.tokens[base]
+        offset = (number - base) * self.chunk_size
+        limit = self.chunk_size
+        generation = self.generation
+        self.loading.add(number)
+        run_in_background(
+            self.tree,
+            lambda: self.fetch(limit, token, offset),
+            lambda page: self.on_chunk_loaded(generation, number, page),
+            lambda error: self.on_chunk_failed(generation, number, error)
+        )
+
+    def request_boundary(self, number, base):
+        """Поиск токена начала порции number: ключ последней строки порции number-1"""
+        if number in self.seeking:
+            return
+        token = self.tokens[base]
+        offset = (number - base) * self.chunk_size - 1
+        generation = self.generation
+        self.seeking.add(number)
+        run_in_background(
+            self.tree,
+            lambda: self.seek(token, offset),
+            lambda page: self.on_boundary_loaded(generation, number, page),
+            lambda error: self.on_boundary_failed(generation, number, error)
+        )
+
+    def on_boundary_loaded(self, generation, number, page):
+        if generation != self.generation:
+            return
+        if page is None:
+            self.on_boundary_failed(generation, number, "граница не прочитана")
+            return
+        self.seeking.discard(number)
+
+        if page.has_next:
+            self.tokens[number] = page.next_token
+            if not self.end_known:
+                self.total = max(self.total, number * self.chunk_size + 1)
+        elif page.items:
+            # Найденная строка - последняя в таблице
+            self.total = number * self.chunk_size
+            self.end_known = True
+        else:
+            # Сдвиг за концом таблицы: строк меньше, чем показывала оценка
+            self.total = min(self.total, number * self.chunk_size - 1)
+        self.top = max(0, min(self.top, self.total - self.visible_rows))
+        # Перерисовка запрашивает видимые порции уже от найденной границы
+        self.render()
+
+    def on_boundary_failed(self, generation, number, error):
+        if generation != self.generation:
+            return
+        self.seeking.discard(number)
+        print(f"Ошибка при поиске границы порции {number} виртуального списка: {error}")
+        self.report_status()
+
+    def on_chunk_loaded(self, generation, number, page):
+        if generation != self.generation:
+            return  # Ответ на запрос до перезагрузки
+        if page is None:
+            # Ошибка чтения, а не конец таблицы: количество строк не меняется
+            self.on_chunk_failed(generation, number, "порция не прочитана")
+            return
+        self.loading.discard(number)
+
+        self.chunks[number] = list(page.items)
+        self.chunks.move_to_end(number)
+        while len(self.chunks) > self.cache_chunks:
+            self.chunks.popitem(last=False)
+
+        loaded_end = number * self.chunk_size + len(page.items)
+        if page.has_next:
+            self.tokens[number + 1] = page.next_token
+            if not self.end_known:
+                self.total = max(self.total if number else page.total, loaded_end + 1)
+        elif page.items or number == 0:
+            # Последняя порция: количество строк теперь известно точно
+            self.total = loaded_end
+            self.end_known = True
+        else:
+            # Прочитано без ошибок, но сдвиг оказался за концом таблицы (оценка количества была завышена)
+            self.total = min(self.total, number * self.chunk_size)
+        self.top = max(0, min(self.top, self.total - self.visible_rows))
+        self.render()
+
+    def on_chunk_failed(self, generation, number, error):
+        if generation != self.generation:
+            return
+        self.loading.discard(number)
+        print(f"Ошибка при загрузке порции {number} виртуального списка: {error}")
+        self.report_status()
+
+    def report_status(self):
+        if self.on_status:
+            self.on_status(self.top, self.total, bool(self.loading or self.seeking), self.end_known)
\ No newline at end of file
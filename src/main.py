@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.Models.database import PostgreSQLDatabase
+from src.Models.schema import SchemaManager
+from src.Models.notifications import NotificationListener, REFERENCE_CHANNEL
 from src.Controllers.BookingController import BookingController
 from src.Controllers.AircraftController import AircraftController
 from src.Controllers.AirportsDataController import AirportController
@@ -9,8 +11,13 @@ from src.Controllers.FlightsController import FlightController
 from src.Controllers.SeatsController import SeatController
 from src.Controllers.TicketFlightsController import TicketFlightsController
 from src.Controllers.TicketsController import TicketsController
+from src.Controllers.DiagnosticsController import DiagnosticsController
 from src.View.MainView import MainView
 
+# Размеры пула соединений: вкладки, фоновые загрузки и пакетные операции работают параллельно
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 10
+
 
 class DatabaseConnectionDialog:
     """Диалоговое окно для подключения к базе данных"""
@@ -21,7 +28,7 @@ class DatabaseConnectionDialog:
         # Создаем отдельное окно для диалога подключения
         self.dialog = tk.Tk()
         self.dialog.title("Подключение к базе данных")
-        self.dialog.geometry("300x250")
+        self.dialog.geometry("300x345")
         self.dialog.resizable(False, False)
 
         # Центрирование диалога на экране
@@ -63,9 +70,24 @@ class DatabaseConnectionDialog:
         self.port_entry.grid(row=4, column=1, sticky=(tk.W, tk.E), pady=5, padx=(10, 0))
         self.port_entry.insert(0, "5432")
 
+        # Доверенная схема: проверка и миграции схемы при запуске пропускаются
+        self.trusted_schema_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(main_frame, text="Не проверять схему (быстрый запуск)",
+                        variable=self.trusted_schema_var).grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # Изменения справочников другими клиентами приходят через LISTEN/NOTIFY
+        self.listen_changes_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(main_frame, text="Получать изменения других клиентов",
+                        variable=self.listen_changes_var).grid(row=6, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # Пропущенные миграции (например, без pg_trgm на сервере) повторяются только по запросу
+        self.retry_skipped_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(main_frame, text="Повторить пропущенные миграции",
+                        variable=self.retry_skipped_var).grid(row=7, column=0, columnspan=2, sticky=tk.W, pady=5)
+
         # Кнопки
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=5, column=0, columnspan=2, pady=15)
+        button_frame.grid(row=8, column=0, columnspan=2, pady=15)
 
         ttk.Button(button_frame, text="Подключиться",
                    command=self.on_connect).pack(side=tk.LEFT, padx=5)
@@ -90,7 +112,8 @@ class DatabaseConnectionDialog:
             messagebox.showerror("Ошибка", "Все поля должны быть заполнены")
             return
 
-        self.result = (database, user, password, host, port)
+        self.result = (database, user, password, host, port, self.trusted_schema_var.get(),
+                       self.listen_changes_var.get(), self.retry_skipped_var.get())
         self.dialog.quit()
         self.dialog.destroy()
 
@@ -109,15 +132,16 @@ class DatabaseConnectionDialog:
 class MainController:
     """Главный контроллер для объединения функциональности"""
 
-    def __init__(self, db):
+    def __init__(self, db, listener=None):
         self.booking_controller = BookingController(db)
         self.aircraft_controller = AircraftController(db)
         self.airport_controller = AirportController(db)
         self.boarding_pass_controller = BoardingPassController(db)
-        self.flights_controller = FlightController(db)
+        self.flights_controller = FlightController(db, listener)
         self.seats_controller = SeatController(db)
         self.ticket_flights_controller = TicketFlightsController(db)
         self.tickets_controller = TicketsController(db)
+        self.diagnostics_controller = DiagnosticsController(db)
 
 
 def main():
@@ -130,16 +154,30 @@ def main():
         return
 
     # Создаем подключение к БД с введенными параметрами
-    database, user, password, host, port = connection_params
-    db = PostgreSQLDatabase(database, user, password, host, port)
+    database, user, password, host, port, trusted_schema, listen_changes, retry_skipped = connection_params
+    db = PostgreSQLDatabase(database, user, password, host, port,
+                            pool_min_size=POOL_MIN_SIZE, pool_max_size=POOL_MAX_SIZE)
 
     if db.connect():
+        # Схема проверяется один раз до создания контроллеров
+        if not SchemaManager(db, trusted=trusted_schema, retry_skipped=retry_skipped).ensure():
+            print("Схема базы данных не обновлена, продолжаем с текущей схемой")
+
+        # Справочники (аэропорты, самолеты) загружаются в память один раз
+        db.reference_cache.load()
+
+        listener = None
+        if listen_changes:
+            listener = NotificationListener(db)
+            listener.subscribe(REFERENCE_CHANNEL, db.reference_cache.on_notification)
+            listener.start()
+
         # Создаем главное окно приложения
         root = tk.Tk()
         root.title("Авиабилеты")
 
         # Создаем главный контроллер
-        main_controller = MainController(db)
+        main_controller = MainController(db, listener)
 
         # Создаем представление
         view = MainView(root,
@@ -150,12 +188,15 @@ def main():
                         main_controller.flights_controller,
                         main_controller.seats_controller,
                         main_controller.ticket_flights_controller,
-                        main_controller.tickets_controller)
+                        main_controller.tickets_controller,
+                        diagnostics_controller=main_controller.diagnostics_controller)
 
         # Запускаем главный цикл
         root.mainloop()
 
         # Закрываем соединение с БД при выходе
+        if listener:
+            listener.stop()
         db.disconnect()
     else:
         print("Не удалось подключиться к базе данных")
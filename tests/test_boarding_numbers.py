@@ -0,0 +1,113 @@
+import importlib.util
+import os
+import threading
+import time
+import unittest
+
+# Тест выполняется на реальной базе (демобаза bookings), параметры подключения - из переменных PG*
+TEST_DATABASE = os.environ.get('PGDATABASE')
+
+
+@unittest.skipUnless(importlib.util.find_spec('psycopg2'), "psycopg2 не установлен")
+@unittest.skipUnless(TEST_DATABASE, "не задана тестовая база (PGDATABASE)")
+class BoardingNumberConcurrencyTest(unittest.TestCase):
+    def setUp(self):
+        from src.Models.boarding_numbers import BoardingNumberAllocator
+        from src.Models.database import PostgreSQLDatabase
+
+        self.db = PostgreSQLDatabase(
+            TEST_DATABASE,
+            os.environ.get('PGUSER', 'postgres'),
+            os.environ.get('PGPASSWORD', ''),
+            os.environ.get('PGHOST', 'localhost'),
+            os.environ.get('PGPORT', '5432'),
+            pool_min_size=1, pool_max_size=8, pool_timeout=10.0
+        )
+        if not self.db.connect():
+            self.skipTest("нет подключения к тестовой базе")
+        self.addCleanup(self.db.disconnect)
+
+        with self.db.get_cursor() as cursor:
+            cursor.execute(BoardingNumberAllocator.CREATE_TABLE_QUERY)
+            cursor.execute("SELECT flight_id FROM bookings.flights ORDER BY flight_id LIMIT 1")
+            self.flight_id = cursor.fetchone()['flight_id']
+            cursor.execute(
+                "SELECT next_boarding_no FROM bookings.boarding_counters WHERE flight_id = %s",
+                (self.flight_id,)
+            )
+            row = cursor.fetchone()
+        self.addCleanup(self._restore_counter, row['next_boarding_no'] if row else None)
+
+        self.allocator = BoardingNumberAllocator(self.db, block_size=10)
+
+    def _restore_counter(self, next_boarding_no):
+        """Счетчик рейса возвращается к состоянию до теста (посадочные талоны тест не создает)"""
+        with self.db.get_cursor() as cursor:
+            if next_boarding_no is None:
+                cursor.execute("DELETE FROM bookings.boarding_counters WHERE flight_id = %s", (self.flight_id,))
+            else:
+                cursor.execute(
+                    "UPDATE bookings.boarding_counters SET next_boarding_no = %s WHERE flight_id = %s",
+                    (next_boarding_no, self.flight_id)
+                )
+
+    def _run_threads(self, targets):
+        threads = [threading.Thread(target=target) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+            self.assertFalse(thread.is_alive())
+
+    def test_parallel_allocations_are_unique(self):
+        issued = []
+        lock = threading.Lock()
+
+        def allocate():
+            for count in (1, 3, 7, 2):
+                numbers = self.allocator.allocate_many(self.flight_id, count)
+                with lock:
+                    issued.extend(numbers)
+
+        self._run_threads([allocate] * 6)
+
+        self.assertEqual(len(issued), 6 * 13)
+        self.assertEqual(len(set(issued)), len(issued))
+
+    def test_rolled_back_reservation_does_not_overlap_later_numbers(self):
+        reserved = threading.Event()
+        rolled_back = []
+        committed = []
+        lock = threading.Lock()
+
+        def allocate_and_roll_back():
+            try:
+                with self.db.transaction():
+                    rolled_back.extend(self.allocator.allocate_many(self.flight_id, 3))
+                    reserved.set()
+                    # Параллельные выдачи успевают обратиться к распределителю до отката
+                    time.sleep(0.5)
+                    raise RuntimeError("откат")
+            except RuntimeError:
+                pass
+
+        def allocate_committed():
+            reserved.wait(10)
+            for _ in range(4):
+                numbers = self.allocator.allocate_many(self.flight_id, 2)
+                with lock:
+                    committed.extend(numbers)
+
+        self._run_threads([allocate_and_roll_back, allocate_committed, allocate_committed])
+        with self.db.transaction():
+            committed.extend(self.allocator.allocate_many(self.flight_id, 5))
+        committed.extend(self.allocator.allocate_many(self.flight_id, 12))
+
+        self.assertEqual(len(rolled_back), 3)
+        self.assertEqual(len(committed), 2 * 4 * 2 + 5 + 12)
+        # Номера откаченной транзакции могут быть выданы повторно, выданные после фиксации - нет
+        self.assertEqual(len(set(committed)), len(committed))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import importlib.util
+import unittest
+from datetime import datetime
+
+from src.Models.instrumentation import InstrumentedCursor, QueryStats
+from src.Models.row_counts import RowCountProvider
+
+
+class FakeCursor:
+    """Курсор без базы: страница рейсов из одной строки и количество строк"""
+
+    description = None
+    rowcount = 0
+
+    def __init__(self):
+        self._rows = []
+
+    def execute(self, query, params=None):
+        if 'COUNT(*)' in query:
+            self._rows = [{'count': 1}]
+        else:
+            self._rows = [(1, datetime(2017, 8, 1, 10, 0))]
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.query_stats = QueryStats()
+        self.row_counts = RowCountProvider(self)
+
+    def get_cursor(self, tuple_rows=False):
+        return InstrumentedCursor(FakeCursor(), self.query_stats)
+
+
+@unittest.skipUnless(importlib.util.find_spec('psycopg2'), "psycopg2 не установлен")
+class CallerAttributionTest(unittest.TestCase):
+    def test_paged_read_is_attributed_to_model_method(self):
+        from src.Models.FlightsModel import Flight
+
+        db = FakeDatabase()
+        page = Flight.read_page(db, 10, columns=('flight_id', 'scheduled_departure'))
+
+        self.assertEqual(len(page.items), 1)
+        methods = {stats.name: stats for stats in db.query_stats.methods()}
+        # Запрос страницы (fetch_keyset_rows) и подсчет строк (RowCountProvider) - за методом модели
+        self.assertEqual(set(methods), {'Flight.read_page'})
+        self.assertEqual(methods['Flight.read_page'].calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
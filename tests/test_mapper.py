@@ -0,0 +1,56 @@
+import unittest
+
+from src.Models.mapper import Column, RowMapper
+
+
+class Passenger:
+    def __init__(self, ticket_no, passenger_name, contact_data=None):
+        self.ticket_no = ticket_no
+        self.passenger_name = passenger_name
+        self.contact_data = contact_data
+
+
+MAPPER = RowMapper(Passenger, (
+    'ticket_no',
+    Column('passenger_name', "upper(passenger_name)", str.title),
+    Column('contact_data', "contact_data::text"),
+))
+
+
+class RowMapperTest(unittest.TestCase):
+    def test_select_list_uses_column_expressions(self):
+        self.assertEqual(
+            MAPPER.select_list,
+            "ticket_no, upper(passenger_name) AS passenger_name, contact_data::text AS contact_data"
+        )
+
+    def test_from_row_applies_converters_and_ignores_extra_columns(self):
+        passenger = MAPPER.from_row(('0005432000987', 'IVAN IVANOV', '{}', 'лишняя колонка'))
+
+        self.assertEqual(passenger.ticket_no, '0005432000987')
+        self.assertEqual(passenger.passenger_name, 'Ivan Ivanov')
+        self.assertEqual(passenger.contact_data, '{}')
+
+    def test_projection_fills_missing_arguments_with_none(self):
+        projection = MAPPER.project(['passenger_name'], required=('ticket_no',))
+
+        self.assertEqual(projection.names, ('passenger_name', 'ticket_no'))
+        self.assertEqual(projection.select_list, "upper(passenger_name) AS passenger_name, ticket_no")
+        passenger = projection.from_row(('PETR PETROV', '0005432000988'))
+        self.assertEqual(passenger.ticket_no, '0005432000988')
+        self.assertEqual(passenger.passenger_name, 'Petr Petrov')
+        self.assertIsNone(passenger.contact_data)
+
+    def test_projection_is_cached(self):
+        self.assertIs(MAPPER.project(['ticket_no']), MAPPER.project(['ticket_no']))
+        self.assertIs(MAPPER.project(None), MAPPER)
+
+    def test_unknown_columns_are_rejected(self):
+        with self.assertRaises(ValueError):
+            MAPPER.project(['book_ref'])
+        with self.assertRaises(ValueError):
+            RowMapper(Passenger, ('ticket_no', 'book_ref'), ('ticket_no', 'passenger_name'))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
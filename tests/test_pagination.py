@@ -0,0 +1,86 @@
+import unittest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from src.Models.pagination import build_keyset_page, decode_token, encode_token, fetch_keyset_rows
+
+
+class RecordingCursor:
+    """Курсор без базы: запоминает запрос и возвращает заданные строки"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.query = None
+        self.params = None
+
+    def execute(self, query, params=None):
+        self.query = query
+        self.params = params
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class TokenTest(unittest.TestCase):
+    def test_round_trip_keeps_value_types(self):
+        values = (
+            42, 'PG0001', None,
+            datetime(2017, 8, 1, 10, 30, tzinfo=timezone.utc),
+            date(2017, 8, 1),
+            Decimal('12500.50'),
+        )
+
+        decoded = decode_token(encode_token(values))
+
+        self.assertEqual(decoded, values)
+        self.assertEqual([type(value) for value in decoded], [type(value) for value in values])
+
+    def test_token_is_url_safe_ascii(self):
+        token = encode_token(['Иванов ИВАН', 1])
+
+        self.assertTrue(token.isascii())
+        self.assertNotIn('/', token)
+        self.assertNotIn('+', token)
+        self.assertEqual(decode_token(token), ('Иванов ИВАН', 1))
+
+
+class FetchKeysetRowsTest(unittest.TestCase):
+    def test_forward_page_after_token(self):
+        cursor = RecordingCursor([{'flight_id': 11}, {'flight_id': 12}, {'flight_id': 13}])
+
+        rows, has_next, has_prev = fetch_keyset_rows(
+            cursor, "SELECT flight_id FROM bookings.flights", ('flight_id',), 2, token=encode_token([10])
+        )
+
+        self.assertIn("WHERE ((flight_id) > (%s))", cursor.query)
+        self.assertIn("ORDER BY flight_id ASC LIMIT %s", cursor.query)
+        self.assertEqual(cursor.params, [10, 3])
+        self.assertEqual(rows, [{'flight_id': 11}, {'flight_id': 12}])
+        self.assertTrue(has_next)
+        self.assertTrue(has_prev)
+
+    def test_backward_page_is_returned_in_display_order(self):
+        cursor = RecordingCursor([{'flight_id': 9}, {'flight_id': 8}])
+
+        rows, has_next, has_prev = fetch_keyset_rows(
+            cursor, "SELECT flight_id FROM bookings.flights", ('flight_id',), 2,
+            token=encode_token([10]), backward=True
+        )
+
+        self.assertIn("(flight_id) < (%s)", cursor.query)
+        self.assertIn("ORDER BY flight_id DESC", cursor.query)
+        self.assertEqual(rows, [{'flight_id': 8}, {'flight_id': 9}])
+        self.assertTrue(has_next)
+        self.assertFalse(has_prev)
+
+    def test_page_tokens_from_tuple_rows(self):
+        rows = [(1, 'A'), (2, 'B')]
+
+        page = build_keyset_page(rows, rows, ('flight_id',), 2, False, False, column_index={'flight_id': 0})
+
+        self.assertEqual(decode_token(page.prev_token), (1,))
+        self.assertEqual(decode_token(page.next_token), (2,))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,101 @@
+import importlib.util
+import threading
+import time
+import unittest
+
+
+class FakeConnection:
+    """Соединение без базы: пул проверяет только состояние транзакции и закрытие"""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = 0
+        self.autocommit = True
+
+    def get_transaction_status(self):
+        from psycopg2 import extensions
+        return extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+@unittest.skipUnless(importlib.util.find_spec('psycopg2'), "psycopg2 не установлен")
+class ConnectionPoolTest(unittest.TestCase):
+    def make_pool(self, **options):
+        from src.Models.pool import ConnectionPool
+
+        self.connections = []
+
+        def connect():
+            connection = FakeConnection(len(self.connections))
+            self.connections.append(connection)
+            return connection
+
+        options.setdefault('reap_interval', 0)
+        pool = ConnectionPool(connect, **options)
+        pool.open()
+        self.addCleanup(pool.close_all)
+        return pool
+
+    def test_last_returned_connection_is_reused_first(self):
+        pool = self.make_pool(min_size=0, max_size=3)
+        first, second = pool.getconn(), pool.getconn()
+        pool.putconn(first)
+        pool.putconn(second)
+
+        self.assertIs(pool.getconn(), second)
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual(pool.stats()['created'], 2)
+
+    def test_getconn_times_out_when_pool_is_exhausted(self):
+        from src.Models.pool import PoolTimeoutError
+
+        pool = self.make_pool(min_size=1, max_size=1, timeout=0.05)
+        pool.getconn()
+
+        with self.assertRaises(PoolTimeoutError):
+            pool.getconn()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_waiting_getconn_receives_returned_connection(self):
+        pool = self.make_pool(min_size=1, max_size=1, timeout=5.0)
+        connection = pool.getconn()
+        timer = threading.Timer(0.05, pool.putconn, (connection,))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertIs(pool.getconn(), connection)
+        self.assertGreater(pool.stats()['max_wait'], 0.0)
+
+    def test_idle_connections_above_min_size_are_reaped(self):
+        pool = self.make_pool(min_size=1, max_size=3, max_idle=0.05)
+        connections = [pool.getconn() for _ in range(3)]
+        for connection in connections:
+            pool.putconn(connection)
+        time.sleep(0.1)
+
+        pool.reap_idle()
+
+        stats = pool.stats()
+        self.assertEqual((stats['size'], stats['idle']), (1, 1))
+        self.assertEqual(sum(1 for connection in self.connections if connection.closed), 2)
+
+    def test_background_reaper_closes_idle_connections_without_pool_calls(self):
+        pool = self.make_pool(min_size=0, max_size=2, max_idle=0.05, reap_interval=0.02)
+        connection = pool.getconn()
+        pool.putconn(connection)
+
+        deadline = time.monotonic() + 2.0
+        while not connection.closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import unittest
+
+from src.Models.seat_map import SEAT_FREE, SEAT_OCCUPIED, SEAT_UNKNOWN, SeatLayout, SeatOccupancy
+
+SEATS = [
+    ('10A', 'Economy'), ('2A', 'Business'), ('1A', 'Business'),
+    ('9C', 'Economy'), ('1C', 'Business'), ('9A', 'Economy'),
+]
+
+
+class SeatLayoutTest(unittest.TestCase):
+    def test_seats_are_ordered_by_row_then_letter(self):
+        layout = SeatLayout('SU9', SEATS)
+
+        self.assertEqual(layout.seat_numbers, ['1A', '1C', '2A', '9A', '9C', '10A'])
+        self.assertEqual(len(layout), 6)
+        self.assertEqual(layout.fare_masks, {'Business': 0b000111, 'Economy': 0b111000})
+        self.assertEqual(layout.fare_sizes, {'Business': 3, 'Economy': 3})
+
+
+class SeatOccupancyTest(unittest.TestCase):
+    def setUp(self):
+        self.occupancy = SeatOccupancy(1, SeatLayout('SU9', SEATS), ['1A', '9A'])
+
+    def test_status(self):
+        self.assertEqual(self.occupancy.status('1A'), SEAT_OCCUPIED)
+        self.assertEqual(self.occupancy.status('1C'), SEAT_FREE)
+        self.assertEqual(self.occupancy.status('50F'), SEAT_UNKNOWN)
+
+    def test_first_free_by_fare_conditions(self):
+        self.assertEqual(self.occupancy.first_free(), '1C')
+        self.assertEqual(self.occupancy.first_free('Economy'), '9C')
+        self.assertIsNone(self.occupancy.first_free('Comfort'))
+
+    def test_occupy_and_release_keep_counts(self):
+        self.assertTrue(self.occupancy.occupy('9C'))
+        self.assertTrue(self.occupancy.occupy('9C'))
+        self.assertFalse(self.occupancy.occupy('50F'))
+
+        self.assertEqual(self.occupancy.free_count(), 3)
+        self.assertEqual(self.occupancy.free_count('Economy'), 1)
+        self.assertEqual(self.occupancy.free_seats('Economy'), ['10A'])
+        self.assertEqual(self.occupancy.occupied_seats(), ['1A', '9A', '9C'])
+
+        self.occupancy.release('1A')
+        self.occupancy.release('1A')
+        self.occupancy.release('50F')
+        self.assertEqual(self.occupancy.free_count('Business'), 3)
+        self.assertEqual(self.occupancy.free_seats(), ['1A', '1C', '2A', '10A'])
+
+    def test_full_class_has_no_free_seat(self):
+        for seat_no in ('1C', '2A'):
+            self.occupancy.occupy(seat_no)
+
+        self.assertIsNone(self.occupancy.first_free('Business'))
+        self.assertEqual(self.occupancy.free_seats('Business'), [])
+        self.assertEqual(self.occupancy.free_count('Business'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,94 @@
+import unittest
+
+from src.View.tree_diff import KeyedRows
+
+
+class FakeTree:
+    """Treeview без окна: строки по порядку и журнал вызовов"""
+
+    def __init__(self):
+        self.rows = {}
+        self.order = []
+        self.calls = []
+        self._next_id = 0
+
+    def get_children(self, item=''):
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid=None, values=()):
+        if iid is None:
+            self._next_id += 1
+            iid = f'I{self._next_id:03}'
+        self.calls.append(('insert', iid))
+        self.rows[iid] = values
+        self.order.insert(len(self.order) if index == 'end' else index, iid)
+        return iid
+
+    def item(self, iid, values=None):
+        self.calls.append(('item', iid))
+        self.rows[iid] = values
+
+    def delete(self, *iids):
+        self.calls.append(('delete',) + iids)
+        for iid in iids:
+            del self.rows[iid]
+            self.order.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.calls.append(('move', iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def values(self):
+        return [self.rows[iid] for iid in self.order]
+
+
+class KeyedRowsTest(unittest.TestCase):
+    def setUp(self):
+        self.tree = FakeTree()
+        self.rows = KeyedRows(self.tree)
+        self.rows.apply([('a', (1,)), ('b', (2,)), ('c', (3,))])
+        self.tree.calls.clear()
+
+    def test_unchanged_rows_do_not_touch_tree(self):
+        result = self.rows.apply([('a', (1,)), ('b', (2,)), ('c', (3,))])
+
+        self.assertEqual(result.changes, 0)
+        self.assertEqual(self.tree.calls, [])
+
+    def test_only_differing_rows_are_updated(self):
+        result = self.rows.apply([('a', (1,)), ('c', (30,)), ('d', (4,))])
+
+        self.assertEqual((result.inserted, result.updated, result.deleted, result.moved), (1, 1, 1, 0))
+        self.assertEqual(self.tree.calls, [('delete', 'b'), ('item', 'c'), ('insert', 'd')])
+        self.assertEqual(self.tree.order, ['a', 'c', 'd'])
+        self.assertEqual(self.tree.values(), [(1,), (30,), (4,)])
+
+    def test_reordered_rows_are_moved(self):
+        result = self.rows.apply([('c', (3,)), ('a', (1,)), ('b', (2,))])
+
+        self.assertEqual(result.moved, 1)
+        self.assertEqual(result.updated, 0)
+        self.assertEqual(self.tree.order, ['c', 'a', 'b'])
+
+    def test_rows_without_unique_keys_replace_table(self):
+        result = self.rows.apply([(None, (5,)), (None, (5,))])
+
+        self.assertEqual((result.inserted, result.deleted), (2, 3))
+        self.assertEqual(self.tree.values(), [(5,), (5,)])
+
+        # После строк без ключей таблица снова заполняется по ключам
+        self.rows.apply([('a', (1,))])
+        self.assertEqual(self.tree.order, ['a'])
+
+    def test_set_changes_single_row(self):
+        self.rows.set('b', (20,))
+        self.rows.set('x', (0,))
+
+        self.assertEqual(self.tree.calls, [('item', 'b')])
+        self.assertEqual(self.rows.get('b'), (20,))
+        self.assertIsNone(self.rows.get('x'))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file